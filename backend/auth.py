@@ -0,0 +1,84 @@
+import os
+import threading
+from typing import Dict, Optional
+import jwt
+from fastapi import HTTPException, Request
+from pydantic import BaseModel
+from sqlmodel import Session, select
+from database import engine
+from models import Role, User
+
+SECRET_KEY = os.getenv("SECRET_KEY", "secret")
+ALGORITHM = "HS256"
+
+# Procesni keš role_id -> ime uloge. Uloga ima malo i rijetko se mijenjaju,
+# pa se keš puni jednim upitom i briše pri izmjeni uloga (invalidate_role_cache).
+_role_names: Dict[int, str] = {}
+_role_lock = threading.Lock()
+
+class AuthUser(BaseModel):
+    id: int
+    role_id: Optional[int] = None
+    role_name: str = ""
+
+    def has_role(self, *names: str) -> bool:
+        role = self.role_name.lower()
+        return any(name.lower() in role for name in names)
+
+def invalidate_role_cache() -> None:
+    with _role_lock:
+        _role_names.clear()
+
+def get_role_name(session: Session, role_id: Optional[int]) -> str:
+    """Vraća ime uloge iz keša; na promašaj učitava sve uloge jednim upitom"""
+    if role_id is None:
+        return ""
+    name = _role_names.get(role_id)
+    if name is not None:
+        return name
+    roles = session.exec(select(Role.id, Role.name)).all()
+    with _role_lock:
+        _role_names.clear()
+        _role_names.update({rid: rname for rid, rname in roles})
+    return _role_names.get(role_id, "")
+
+def _decode_token(request: Request) -> dict:
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Nedostaje token.")
+    token = auth_header.split()[1]
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token je istekao.")
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Neispravan token.")
+
+def get_current_user(request: Request) -> AuthUser:
+    """FastAPI dependency: korisnik i uloga iz verifikovanog tokena, bez upita na User/Role"""
+    payload = _decode_token(request)
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Neispravan token.")
+    role_id = payload.get("role_id")
+    name = _role_names.get(role_id) if role_id is not None else None
+    if name is None:
+        # Promašaj keša ili stari token bez role_id - jedini slučaj kada se ide u bazu
+        with Session(engine) as session:
+            if role_id is None:
+                user = session.get(User, user_id)
+                if not user:
+                    raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
+                role_id = user.role_id
+            name = get_role_name(session, role_id)
+    return AuthUser(id=user_id, role_id=role_id, role_name=name)
+
+def require_role(*names: str, detail: str = "Nemate dozvolu za pristup ovim podacima."):
+    """Kreira dependency koji propušta samo korisnike čija uloga sadrži neko od datih imena"""
+    def dependency(request: Request) -> AuthUser:
+        user = get_current_user(request)
+        if not user.has_role(*names):
+            raise HTTPException(status_code=403, detail=detail)
+        return user
+    return dependency
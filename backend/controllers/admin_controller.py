@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from fastapi.responses import FileResponse
 from sqlmodel import Session
-from database import engine
+from database import engine, get_pool_metrics
+from auth import AuthUser, require_role, get_current_user
 from services import admin_service, role_request_service, system_settings_service
+from services.issue_status_counter_service import reconcile_status_counters
 from schemas.admin_schema import UserRead, UserUpdate, UserStats
 from schemas.role_request_schema import RoleRequestCreate, RoleRequestUpdate, RoleRequestRead
 from schemas.system_settings_schema import SystemSettingsUpdate, SystemSettingsRead
@@ -10,29 +12,14 @@ from models.role_model import Role
 from models.role_request_model import RoleRequest
 from models.user_model import User
 from typing import List, Optional
-import jwt
 import os
 
 router = APIRouter()
 
-SECRET_KEY = os.getenv("SECRET_KEY", "secret")
-ALGORITHM = "HS256"
-
 def get_session():
     with Session(engine) as session:
         yield session
 
-def get_current_user_id(request: Request) -> int:
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Nedostaje token.")
-    token = auth_header.split()[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return int(payload["sub"])
-    except Exception:
-        raise HTTPException(status_code=401, detail="Neispravan token.")
-
 # ===== USER MANAGEMENT ENDPOINTS =====
 
 @router.get("/api/admin/users", response_model=List[UserRead])
@@ -40,25 +27,44 @@ def get_all_users(
     request: Request,
     session: Session = Depends(get_session),
     search: Optional[str] = Query(None),
-    role_id: Optional[int] = Query(None)
+    role_id: Optional[int] = Query(None),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu pristupiti ovim podacima."))
 ):
     """Dohvati sve korisnike (samo admin)"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         users = admin_service.get_all_users_service(session, user_id, search, role_id)
         return users
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Mora biti registrovan prije /api/admin/users/{user_id}, inače "stats" ide kao user_id
+@router.get("/api/admin/users/stats", response_model=UserStats)
+def get_user_stats(
+    request: Request,
+    interval: str = Query("day", pattern="^(day|week)$"),
+    days: int = Query(30, ge=1, le=366),
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu pristupiti ovim podacima."))
+):
+    """Dohvati statistike korisnika i registracije po danu/sedmici za zadnjih `days` dana (samo admin)"""
+    try:
+        admin_id = current_user.id
+        stats = admin_service.get_user_stats_service(session, admin_id, interval, days)
+        return stats
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/api/admin/users/{user_id}", response_model=UserRead)
 def get_user(
     user_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu pristupiti ovim podacima."))
 ):
     """Dohvati korisnika po ID (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         user = admin_service.get_user_by_id_service(session, user_id, admin_id)
         return user
     except Exception as e:
@@ -69,11 +75,12 @@ def update_user(
     user_id: int,
     user_data: UserUpdate,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu mijenjati korisnike."))
 ):
     """Ažuriraj korisnika (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         updated_user = admin_service.update_user_service(session, user_id, user_data, admin_id)
         return updated_user
     except Exception as e:
@@ -83,39 +90,28 @@ def update_user(
 def delete_user(
     user_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu brisati korisnike."))
 ):
     """Obriši korisnika (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         result = admin_service.delete_user_service(session, user_id, admin_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/api/admin/users/stats", response_model=UserStats)
-def get_user_stats(
-    request: Request,
-    session: Session = Depends(get_session)
-):
-    """Dohvati statistike korisnika (samo admin)"""
-    try:
-        admin_id = get_current_user_id(request)
-        stats = admin_service.get_user_stats_service(session, admin_id)
-        return stats
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
 # ===== ROLE MANAGEMENT ENDPOINTS =====
 
 @router.get("/api/admin/roles", response_model=List[Role])
 def get_all_roles(
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu pristupiti ovim podacima."))
 ):
     """Dohvati sve uloge (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         roles = admin_service.get_all_roles_service(session, admin_id)
         return roles
     except Exception as e:
@@ -125,11 +121,12 @@ def get_all_roles(
 def create_role(
     name: str,
     request: Request = None,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu kreirati uloge."))
 ):
     """Kreiraj novu ulogu (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         role = admin_service.create_role_service(session, name, admin_id)
         return role
     except Exception as e:
@@ -140,11 +137,12 @@ def update_role(
     role_id: int,
     name: Optional[str] = None,
     request: Request = None,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu mijenjati uloge."))
 ):
     """Ažuriraj ulogu (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         role = admin_service.update_role_service(session, role_id, name, admin_id)
         return role
     except Exception as e:
@@ -154,11 +152,12 @@ def update_role(
 def delete_role(
     role_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu brisati uloge."))
 ):
     """Obriši ulogu (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         result = admin_service.delete_role_service(session, role_id, admin_id)
         return result
     except Exception as e:
@@ -170,11 +169,12 @@ def delete_role(
 def create_role_request(
     request_data: RoleRequestCreate,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Kreiraj zahtjev za promjenu uloge"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         role_request = role_request_service.create_new_role_request(session, user_id, request_data)
         return role_request
     except Exception as e:
@@ -184,11 +184,12 @@ def create_role_request(
 def get_all_role_requests(
     request: Request,
     session: Session = Depends(get_session),
-    status: Optional[str] = Query(None)
+    status: Optional[str] = Query(None),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Dohvati sve zahtjeve za promjenu uloge (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         requests = role_request_service.get_all_role_requests(session, status)
         return requests
     except Exception as e:
@@ -199,11 +200,12 @@ def update_role_request(
     request_id: int,
     request_data: RoleRequestUpdate,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu odobravati zahtjeve."))
 ):
     """Ažuriraj status zahtjeva za promjenu uloge (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         updated_request = role_request_service.update_role_request(session, request_id, request_data, admin_id)
         return updated_request
     except Exception as e:
@@ -212,11 +214,12 @@ def update_role_request(
 @router.get("/api/role-requests/my", response_model=List[RoleRequestRead])
 def get_my_role_requests(
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Dohvati moje zahtjeve za promjenu uloge"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         requests = role_request_service.get_user_role_requests_service(session, user_id)
         return requests
     except Exception as e:
@@ -227,11 +230,12 @@ def get_my_role_requests(
 @router.get("/api/admin/settings", response_model=SystemSettingsRead)
 def get_system_settings(
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Dohvati sistemske postavke (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         settings = system_settings_service.get_settings(session)
         return settings
     except Exception as e:
@@ -241,26 +245,45 @@ def get_system_settings(
 def update_system_settings(
     settings_data: SystemSettingsUpdate,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu mijenjati sistemske postavke."))
 ):
     """Ažuriraj sistemske postavke (samo admin)"""
     try:
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         updated_settings = system_settings_service.update_settings(session, settings_data, admin_id)
         return updated_settings
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/api/admin/db-pool")
+def get_db_pool_metrics(
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu pristupiti ovim podacima."))
+):
+    """Stanje pool-a konekcija ovog procesa (checked-out/overflow) za dimenzionisanje workera (samo admin)"""
+    return get_pool_metrics()
+
+@router.post("/api/admin/issue-status-counters/rebuild")
+def rebuild_issue_status_counters(
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", detail="Samo administratori mogu pokrenuti ovu akciju."))
+):
+    """Ponovo računa brojače prijava po statusu iz izvornih tabela (samo admin)"""
+    if not reconcile_status_counters(session):
+        raise HTTPException(status_code=409, detail="Rekoncilijacija brojača je već u toku.")
+    return {"message": "Brojači statusa su ponovo izračunati."}
+
 @router.get("/api/admin/role-requests/{request_id}/cv")
 def get_role_request_cv(
     request_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Dohvati CV za role request (samo admin)"""
     try:
         # Provjeri admin prava
-        admin_id = get_current_user_id(request)
+        admin_id = current_user.id
         admin_user = session.get(User, admin_id)
         if not admin_user or not admin_user.role_id:
             raise HTTPException(status_code=403, detail="Nedovoljna prava")
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Request, HTTPException, UploadFile, File, Form
 from sqlmodel import Session
 from database import engine
+from auth import AuthUser, get_current_user
 from services.application_service import (
     submit_contractor_application, 
     submit_manager_application, 
@@ -13,6 +14,9 @@ from schemas.application_schema import (
     ApplicationStatus
 )
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -20,24 +24,6 @@ def get_session():
     with Session(engine) as session:
         yield session
 
-def get_current_user_id(request: Request) -> int:
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Nedostaje token.")
-    
-    token = auth_header.split(" ")[1]
-    try:
-        import jwt
-        import os
-        SECRET_KEY = os.getenv("SECRET_KEY", "secret")
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        user_id = int(payload.get("sub"))
-        return user_id
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token je istekao.")
-    except jwt.InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Neispravan token.")
-
 @router.post("/api/contractor-application", response_model=ApplicationResponse)
 async def submit_contractor_application_endpoint(
     request: Request,
@@ -45,11 +31,12 @@ async def submit_contractor_application_endpoint(
     motivation_letter: str = Form(...),
     reason_for_becoming_contractor: str = Form(...),
     accept_terms: str = Form(...),
-    experience_file: UploadFile = File(None)
+    experience_file: UploadFile = File(None),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Pošalji aplikaciju za izvođača"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         # Konvertuj accept_terms string u boolean
         accept_terms_bool = accept_terms.lower() == "true"
@@ -95,11 +82,12 @@ async def submit_manager_application_endpoint(
     building_management_plans: str = Form(...),
     accept_terms: str = Form(...),
     accept_role_change: str = Form(...),
-    experience_file: UploadFile = File(None)
+    experience_file: UploadFile = File(None),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Pošalji aplikaciju za upravnika"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         # Konvertuj stringove u boolean
         accept_terms_bool = accept_terms.lower() == "true"
@@ -148,17 +136,16 @@ async def submit_manager_application_endpoint(
 @router.get("/api/application-status", response_model=ApplicationStatus)
 def get_application_status_endpoint(
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Dohvati status aplikacije korisnika"""
     try:
-        user_id = get_current_user_id(request)
-        print(f"Getting application status for user_id: {user_id}")
+        user_id = current_user.id
         status = get_application_status(session, user_id)
-        print(f"Application status: {status}")
         return status
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in get_application_status_endpoint: {e}")
+        logger.exception("Greška u get_application_status_endpoint", extra={"user_id": user_id})
         raise HTTPException(status_code=500, detail=f"Greška pri dohvatanju statusa: {str(e)}")
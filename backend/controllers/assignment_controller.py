@@ -1,44 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Query
 from sqlmodel import Session
-from database import engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from database import engine, get_async_session
+from auth import AuthUser, require_role, get_current_user
 from services import assignment_service
 from schemas.assignment_schema import AssignmentUpdate, AssignmentReject
-from typing import List
-import jwt
-import os
+from typing import List, Optional
 
 router = APIRouter()
 
-SECRET_KEY = os.getenv("SECRET_KEY", "secret")
-ALGORITHM = "HS256"
-
 def get_session():
     with Session(engine) as session:
         yield session
 
-def get_current_user_id(request: Request) -> int:
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Nedostaje token.")
-    token = auth_header.split()[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return int(payload["sub"])
-    except Exception:
-        raise HTTPException(status_code=401, detail="Neispravan token.")
-
 @router.get("/api/contractor/assignments")
-def get_contractor_assignments(
+async def get_contractor_assignments(
     request: Request,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session),
+    status: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: Optional[int] = Query(None, ge=1, le=100),
+    current_user: AuthUser = Depends(get_current_user)
 ):
-    """Dohvati sve assignment-e za trenutnog izvođača"""
+    """Dohvati assignment-e za trenutnog izvođača (bez page_size vraća sve)"""
     try:
         # Dohvati user_id iz tokena
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
-        assignments = assignment_service.get_contractor_assignments(session, user_id)
-        return {"success": True, "data": assignments}
+        assignments = await session.run_sync(assignment_service.get_contractor_assignments, user_id, status, page, page_size)
+        response = {"success": True, "data": assignments}
+        if page_size is not None:
+            response["total"] = await session.run_sync(assignment_service.count_contractor_assignments, user_id, status)
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -47,11 +40,12 @@ def update_assignment_status(
     assignment_id: int,
     status_update: AssignmentUpdate,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu mijenjati status."))
 ):
     """Ažuriraj status assignment-a"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = assignment_service.update_assignment_status_service(
             session, assignment_id, user_id, status_update.status, status_update.notes
@@ -65,11 +59,12 @@ def reject_assignment(
     assignment_id: int,
     rejection: AssignmentReject,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu odbijati assignment-e."))
 ):
     """Odbij assignment"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = assignment_service.reject_assignment_service(
             session, assignment_id, user_id, rejection.rejection_reason
@@ -83,11 +78,12 @@ def update_assignment_cost(
     assignment_id: int,
     actual_cost: float = Form(...),
     request: Request = None,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu ažurirati troškove."))
 ):
     """Ažuriraj troškove assignment-a"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = assignment_service.update_assignment_cost_service(
             session, assignment_id, user_id, actual_cost
@@ -101,11 +97,12 @@ async def upload_assignment_image(
     assignment_id: int,
     file: UploadFile = File(...),
     request: Request = None,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu upload-ovati slike."))
 ):
     """Upload slike za assignment"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = assignment_service.upload_assignment_image(
             session, assignment_id, user_id, file
@@ -120,11 +117,12 @@ async def upload_assignment_document(
     file: UploadFile = File(...),
     document_type: str = Form(...),
     request: Request = None,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu upload-ovati dokumente."))
 ):
     """Upload dokumenta za assignment"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = assignment_service.upload_assignment_document(
             session, assignment_id, user_id, file, document_type
@@ -138,11 +136,12 @@ def update_issue_status_by_contractor(
     assignment_id: int,
     new_status: str,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu mijenjati status issue-a."))
 ):
     """Ažuriraj status issue-a od strane izvođača"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = assignment_service.update_issue_status_by_contractor_service(
             session, assignment_id, user_id, new_status
@@ -155,11 +154,12 @@ def update_issue_status_by_contractor(
 async def update_planned_data(
     assignment_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu ažurirati planirane podatke."))
 ):
     """Ažuriraj planirani datum i procjenu troškova"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         # Dohvati podatke iz request body-ja
         import json
@@ -183,11 +183,12 @@ async def update_planned_data(
 def get_planned_data(
     assignment_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu pristupiti planiranim podacima."))
 ):
     """Dohvati planirani datum i procjenu troškova"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = assignment_service.get_planned_data_service(
             session, assignment_id, user_id
@@ -203,11 +204,12 @@ async def upload_completion_data(
     images: List[UploadFile] = File(default=[]),
     warranty_pdf: UploadFile = File(default=None),
     request: Request = None,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu upload-ovati završne podatke."))
 ):
     """Upload završnih slika, bilješki i PDF-a za garanciju"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = await assignment_service.upload_completion_data_service(
             session, assignment_id, user_id, notes, images, warranty_pdf
@@ -220,11 +222,12 @@ async def upload_completion_data(
 def get_completion_data(
     assignment_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu pristupiti završnim podacima."))
 ):
     """Dohvati završne slike i bilješke"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = assignment_service.get_completion_data_service(
             session, assignment_id, user_id
@@ -237,11 +240,12 @@ def get_completion_data(
 async def update_cancellation_reason(
     assignment_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu ažurirati razlog otkazivanja."))
 ):
     """Ažuriraj razlog otkazivanja"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         # Dohvati podatke iz request body-ja
         import json
@@ -264,11 +268,12 @@ async def update_cancellation_reason(
 def get_cancellation_reason(
     assignment_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu pristupiti razlogu otkazivanja."))
 ):
     """Dohvati razlog otkazivanja"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = assignment_service.get_cancellation_reason_service(
             session, assignment_id, user_id
@@ -280,11 +285,12 @@ def get_cancellation_reason(
 @router.get("/api/contractor/completed-issues")
 def get_completed_issues(
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("izvođač", detail="Samo izvođači mogu pristupiti završenim issue-ima."))
 ):
     """Dohvati sve završene issue-e za izvođača"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         
         result = assignment_service.get_completed_issues_service(
             session, user_id
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, status, UploadFile, File, Form, Request, HTTPException, Query, Body
 from sqlmodel import Session, select
-from database import engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from database import engine, get_async_session
+from auth import AuthUser, require_role, get_current_user
 from services import issue_service
 from schemas.issue_schema import IssueCreate, IssueRead, IssueCategoryRead, IssueStatusUpdate, HistoryIssue, HistoryStats, HistoryFilterParams, IssueForManager, ContractorAssignmentRequest
 from models.issue_model import Issue
-import jwt
-import os
-from typing import List
+from typing import List, Optional
 from services import comment_service
 from schemas.comment_schema import CommentCreate, CommentRead
 from services import rating_service
@@ -14,24 +14,10 @@ from schemas.rating_schema import RatingCreate, RatingRead
 
 router = APIRouter()
 
-SECRET_KEY = os.getenv("SECRET_KEY", "secret")
-ALGORITHM = "HS256"
-
 def get_session():
     with Session(engine) as session:
         yield session
 
-def get_current_user_id(request: Request) -> int:
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Nedostaje token.")
-    token = auth_header.split()[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return int(payload["sub"])
-    except Exception:
-        raise HTTPException(status_code=401, detail="Neispravan token.")
-
 @router.post("/issues", response_model=IssueRead, status_code=status.HTTP_201_CREATED)
 def create_issue(
     request: Request,
@@ -41,8 +27,9 @@ def create_issue(
     location: str = Form(None),
     category_id: int = Form(...),
     images: List[UploadFile] = File([]),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    tenant_id = get_current_user_id(request)
+    tenant_id = current_user.id
     data = IssueCreate(title=title, description=description, location=location, category_id=category_id)
     issue = issue_service.create_new_issue(session, tenant_id, data, images)
     return issue
@@ -55,10 +42,11 @@ def get_categories(session: Session = Depends(get_session)):
 def get_issue_rejection_reason(
     issue_id: int,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Dohvati razlog otkazivanja issue-a"""
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     
     # Provjeri da li issue pripada korisniku
     issue = session.get(Issue, issue_id)
@@ -89,8 +77,9 @@ def get_my_issues(
     status: str = Query(None),
     category: str = Query(None),
     search: str = Query(None),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     filters = {"status": status, "category": category, "search": search}
     issues = issue_service.get_user_issues(session, user_id, filters)
     return issues
@@ -101,8 +90,9 @@ def update_issue_status(
     data: IssueStatusUpdate,
     request: Request,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     issue = issue_service.change_issue_status(session, user_id, issue_id, data.status)
     return issue
 
@@ -111,8 +101,9 @@ def delete_issue(
     issue_id: int,
     request: Request,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     issue_service.delete_issue(session, user_id, issue_id)
     return
 
@@ -122,14 +113,15 @@ def update_issue(
     data: IssueCreate = Body(...),
     request: Request = None,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     return issue_service.update_issue(session, user_id, issue_id, data)
 
 @router.get("/issue-history", response_model=dict)
-def get_issue_history(
+async def get_issue_history(
     request: Request,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     search: str = Query(None),
     category: str = Query(None),
     status: str = Query(None),
@@ -138,18 +130,22 @@ def get_issue_history(
     sort_by: str = Query("created_at_desc"),
     page: int = Query(1),
     page_size: int = Query(10),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    user_id = get_current_user_id(request)
+    # search na PostgreSQL-u traži riječi po početku ("stru" -> "struja"); ako nijedna prijava
+    # stanara nema takav pogodak, vraćaju se prijave koje sadrže unos bilo gdje ("ruja" -> "struja")
+    user_id = current_user.id
     filters = {"search": search, "category": category, "status": status, "date_from": date_from, "date_to": date_to, "sort_by": sort_by}
-    issues, total = issue_service.get_user_issue_history(session, user_id, filters, page, page_size)
+    issues, total = await session.run_sync(issue_service.get_user_issue_history, user_id, filters, page, page_size)
     return {"issues": issues, "total": total}
 
 @router.get("/issue-history/stats", response_model=HistoryStats, response_model_by_alias=True)
 def get_issue_history_stats(
     request: Request,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     return issue_service.get_user_issue_history_stats(session, user_id)
 
 @router.get("/issues/{issue_id}/comments", response_model=List[CommentRead])
@@ -157,22 +153,22 @@ def get_issue_comments(issue_id: int, session: Session = Depends(get_session)):
     return comment_service.get_issue_comments(session, issue_id)
 
 @router.post("/issues/{issue_id}/comments", response_model=CommentRead, status_code=status.HTTP_201_CREATED)
-def add_issue_comment(issue_id: int, data: CommentCreate, request: Request, session: Session = Depends(get_session)):
-    user_id = get_current_user_id(request)
+def add_issue_comment(issue_id: int, data: CommentCreate, request: Request, session: Session = Depends(get_session), current_user: AuthUser = Depends(get_current_user)):
+    user_id = current_user.id
     return comment_service.create_new_comment(session, user_id, issue_id, data)
 
 @router.get("/issues/{issue_id}/rating", response_model=RatingRead | None)
-def get_issue_rating(issue_id: int, request: Request, session: Session = Depends(get_session)):
-    user_id = get_current_user_id(request)
+def get_issue_rating(issue_id: int, request: Request, session: Session = Depends(get_session), current_user: AuthUser = Depends(get_current_user)):
+    user_id = current_user.id
     return rating_service.get_rating_for_issue_and_user(session, issue_id, user_id)
 
 @router.post("/issues/{issue_id}/rating", response_model=RatingRead)
-def add_or_update_issue_rating(issue_id: int, data: RatingCreate, request: Request, session: Session = Depends(get_session)):
-    user_id = get_current_user_id(request)
+def add_or_update_issue_rating(issue_id: int, data: RatingCreate, request: Request, session: Session = Depends(get_session), current_user: AuthUser = Depends(get_current_user)):
+    user_id = current_user.id
     return rating_service.create_or_update_rating(session, issue_id, user_id, data) 
 
 # Rute za upravnike
-@router.get("/manager/all-issues", response_model=List[dict])
+@router.get("/manager/all-issues", response_model=List[dict] | dict)
 def get_all_issues_for_manager(
     request: Request,
     session: Session = Depends(get_session),
@@ -184,8 +180,14 @@ def get_all_issues_for_manager(
     sort_by: str = Query("created_at_desc"),
     page: int = Query(1),
     page_size: int = Query(10),
+    cursor: str = Query(None),
+    current_user: AuthUser = Depends(require_role("upravnik", detail="Nemate dozvolu za pristup. Potrebna je uloga upravnika."))
 ):
-    user_id = get_current_user_id(request)
+    # Ako je proslijeđen cursor (prazan za prvu stranicu), koristi se keyset paginacija
+    # i odgovor je {"issues": [...], "next_cursor": ...}
+    # search: kao kod /issue-history - prefiks pretraga riječi, a podniz bilo gdje samo ako
+    # prefiks ne nađe ništa među prijavama sa traženim statusom
+    user_id = current_user.id
     filters = {
         "status": status,
         "category": category,
@@ -194,10 +196,10 @@ def get_all_issues_for_manager(
         "date_to": date_to,
         "sort_by": sort_by
     }
-    issues = issue_service.get_all_issues_for_manager_dict(session, user_id, filters, page, page_size)
+    issues = issue_service.get_all_issues_for_manager_dict(session, user_id, filters, page, page_size, cursor)
     return issues
 
-@router.get("/manager/other-issues", response_model=List[dict])
+@router.get("/manager/other-issues", response_model=List[dict] | dict)
 def get_other_issues_for_manager(
     request: Request,
     session: Session = Depends(get_session),
@@ -210,8 +212,10 @@ def get_other_issues_for_manager(
     sort_by: str = Query("created_at_desc"),
     page: int = Query(1),
     page_size: int = Query(10),
+    cursor: str = Query(None),
+    current_user: AuthUser = Depends(require_role("upravnik", detail="Samo upravnici mogu pristupiti ovim podacima."))
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     filters = {
         "category": category,
         "search": search,
@@ -221,16 +225,18 @@ def get_other_issues_for_manager(
         "contractor": contractor,
         "sort_by": sort_by
     }
-    issues = issue_service.get_other_issues_for_manager(session, user_id, filters, page, page_size)
+    issues = issue_service.get_other_issues_for_manager(session, user_id, filters, page, page_size, cursor)
     return issues
 
 @router.get("/manager/contractors", response_model=List[dict])
 def get_available_contractors(
     request: Request,
     session: Session = Depends(get_session),
+    sort_by: Optional[str] = Query(None),
+    current_user: AuthUser = Depends(get_current_user),
 ):
-    user_id = get_current_user_id(request)
-    contractors = issue_service.get_available_contractors(session, user_id)
+    user_id = current_user.id
+    contractors = issue_service.get_available_contractors(session, user_id, sort_by)
     return contractors
 
 @router.post("/manager/issues/{issue_id}/assign", response_model=dict)
@@ -239,8 +245,9 @@ def assign_contractor_to_issue(
     data: ContractorAssignmentRequest,
     request: Request = None,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("upravnik", detail="Samo upravnici mogu dodijeliti izvođače."))
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     result = issue_service.assign_contractor_to_issue(session, user_id, issue_id, data.contractor_id)
     return result
 
@@ -250,8 +257,9 @@ def update_issue_status_manager(
     status: str = Body(...),
     request: Request = None,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("upravnik", detail="Samo upravnici mogu mijenjati status prijava."))
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     result = issue_service.update_issue_status_manager(session, user_id, issue_id, status)
     return result
 
@@ -267,8 +275,9 @@ def get_all_issues_for_manager_complete(
     sort_by: str = Query("created_at_desc"),
     page: int = Query(1),
     page_size: int = Query(10),
+    current_user: AuthUser = Depends(require_role("upravnik", detail="Samo upravnici mogu pristupiti ovim podacima."))
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     filters = {
         "status": status,
         "category": category,
@@ -284,8 +293,9 @@ def get_all_issues_for_manager_complete(
 def get_all_tenants_for_manager(
     request: Request,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("upravnik", detail="Samo upravnici mogu pristupiti ovim podacima."))
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     tenants = issue_service.get_all_tenants_for_manager(session, user_id)
     return tenants
 
@@ -295,8 +305,9 @@ def create_admin_note(
     session: Session = Depends(get_session),
     tenant_id: int = Body(...),
     note: str = Body(...),
+    current_user: AuthUser = Depends(require_role("upravnik", detail="Samo upravnici mogu slati napomene."))
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     result = issue_service.create_admin_note(session, user_id, tenant_id, note)
     return result
 
@@ -305,8 +316,9 @@ def get_issue_admin_notes(
     issue_id: int,
     request: Request,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("upravnik", detail="Samo upravnici mogu pristupiti napomenama."))
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     notes = issue_service.get_issue_notes(session, user_id, issue_id)
     return notes
 
@@ -315,9 +327,10 @@ def get_issue_notes_for_tenant(
     issue_id: int,
     request: Request,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     """Dohvata napomene upravnika za određeni issue - dostupno stanarima"""
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     notes = issue_service.get_issue_notes_for_tenant(session, user_id, issue_id)
     return notes
 
@@ -327,8 +340,9 @@ def create_issue_note(
     request: Request,
     session: Session = Depends(get_session),
     note_data: dict = Body(...),
+    current_user: AuthUser = Depends(require_role("upravnik", detail="Samo upravnici mogu slati napomene."))
 ):
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     note = note_data.get("note", "")
     
     if not note:
@@ -345,10 +359,11 @@ def get_issue_completion_data(
     issue_id: int,
     request: Request,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     """Dohvati completion podatke za završeni issue (za stanare)"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         result = issue_service.get_issue_completion_data_for_tenant(session, user_id, issue_id)
         return {"success": True, "data": result}
     except Exception as e:
@@ -359,10 +374,11 @@ def get_issue_rejection_reason(
     issue_id: int,
     request: Request,
     session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     """Dohvati razlog za odbijanje issue-a (za stanare)"""
     try:
-        user_id = get_current_user_id(request)
+        user_id = current_user.id
         result = issue_service.get_issue_rejection_reason_for_tenant(session, user_id, issue_id)
         return {"success": True, "data": result}
     except Exception as e:
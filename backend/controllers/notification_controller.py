@@ -1,45 +1,92 @@
-from fastapi import APIRouter, Depends, status, Request, HTTPException
+from fastapi import APIRouter, Depends, status, Request, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
-from database import engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from database import engine, get_async_session
+from auth import AuthUser, get_current_user, SECRET_KEY, ALGORITHM
 from services import notification_service
-from schemas.notification_schema import NotificationCreate, NotificationRead
-from typing import List
+from schemas.notification_schema import NotificationCreate, NotificationRead, MarkAllReadResponse
+from notification_broker import broker, user_channel
+from typing import List, Optional
+import asyncio
+import json
 import jwt
-import os
 
 router = APIRouter()
 
-SECRET_KEY = os.getenv("SECRET_KEY", "secret")
-ALGORITHM = "HS256"
+# Komentar-linija koja drži SSE konekciju otvorenom kroz proxy-je
+STREAM_HEARTBEAT_SECONDS = 15
 
 def get_session():
     with Session(engine) as session:
         yield session
 
-def get_current_user_id(request: Request) -> int:
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Nedostaje token.")
-    token = auth_header.split()[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return int(payload["sub"])
-    except Exception:
-        raise HTTPException(status_code=401, detail="Neispravan token.")
-
 @router.get("/notifications", response_model=List[NotificationRead])
-def get_notifications(request: Request, session: Session = Depends(get_session)):
-    user_id = get_current_user_id(request)
-    return notification_service.get_user_notifications(session, user_id)
+async def get_notifications(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    before_id: Optional[int] = Query(None),
+    unread_only: bool = Query(False),
+    current_user: AuthUser = Depends(get_current_user)
+):
+    user_id = current_user.id
+    return await session.run_sync(notification_service.get_user_notifications, user_id, limit, before_id, unread_only)
+
+@router.get("/notifications/unread-count")
+async def get_unread_count(request: Request, session: AsyncSession = Depends(get_async_session), current_user: AuthUser = Depends(get_current_user)):
+    user_id = current_user.id
+    return await session.run_sync(notification_service.get_unread_count, user_id)
+
+@router.get("/notifications/stream")
+async def stream_notifications(request: Request, token: Optional[str] = Query(None)):
+    """SSE stream novih notifikacija i assignment notifikacija za trenutnog korisnika.
+
+    EventSource u browseru ne može slati Authorization header, pa se token može
+    proslijediti i kao ?token=...
+    """
+    if token and not request.headers.get("Authorization"):
+        try:
+            user_id = int(jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["sub"])
+        except Exception:
+            raise HTTPException(status_code=401, detail="Neispravan token.")
+    else:
+        user_id = get_current_user(request).id
+
+    channel = user_channel(user_id)
+
+    async def events():
+        # Pretplata tek kad stream krene: ako klijent ode prije prvog chunk-a,
+        # generator se nikad ne pokrene pa nema reda koji bi ostao registrovan
+        queue = None
+        try:
+            queue = broker.subscribe(channel)
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message['data'], ensure_ascii=False)}\n\n"
+        finally:
+            if queue is not None:
+                broker.unsubscribe(channel, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.patch("/notifications/{notification_id}/read", response_model=NotificationRead)
-def mark_as_read(notification_id: int, request: Request, session: Session = Depends(get_session)):
-    user_id = get_current_user_id(request)
+def mark_as_read(notification_id: int, request: Request, session: Session = Depends(get_session), current_user: AuthUser = Depends(get_current_user)):
+    user_id = current_user.id
     return notification_service.mark_notification_read(session, notification_id, user_id)
 
-@router.patch("/notifications/read-all", response_model=List[NotificationRead])
-def mark_all_as_read(request: Request, session: Session = Depends(get_session)):
-    user_id = get_current_user_id(request)
+@router.patch("/notifications/read-all", response_model=MarkAllReadResponse)
+def mark_all_as_read(request: Request, session: Session = Depends(get_session), current_user: AuthUser = Depends(get_current_user)):
+    user_id = current_user.id
     return notification_service.mark_all_read(session, user_id)
 
 @router.post("/notifications", response_model=NotificationRead, status_code=status.HTTP_201_CREATED)
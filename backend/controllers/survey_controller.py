@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Request, Depends, HTTPException
+from fastapi import APIRouter, Request, Depends, Query
 from sqlmodel import Session
 from database import engine
+from auth import AuthUser, require_role, get_current_user
 from services.survey_service import (
     create_survey_service,
     get_user_surveys_service,
@@ -8,9 +9,8 @@ from services.survey_service import (
     get_survey_stats_service
 )
 from schemas.survey_schema import SurveyCreate, SurveyRead, SurveyResponse
-from typing import List
-import jwt
-import os
+from typing import List, Optional
+from datetime import date
 
 router = APIRouter()
 
@@ -18,56 +18,45 @@ def get_session():
     with Session(engine) as session:
         yield session
 
-def get_current_user_id(request: Request) -> int:
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Nedostaje token.")
-    
-    token = auth_header.split(" ")[1]
-    try:
-        payload = jwt.decode(token, os.getenv("SECRET_KEY"), algorithms=["HS256"])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Neispravan token.")
-        return int(user_id)
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token je istekao.")
-    except jwt.JWTError:
-        raise HTTPException(status_code=401, detail="Neispravan token.")
-
 @router.post("/surveys", response_model=SurveyResponse, status_code=201)
 def create_survey_endpoint(
     survey_data: SurveyCreate,
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("stanar", "izvođač", detail="Samo stanari i izvođači mogu slati prijave nezadovoljstva."))
 ):
     """Kreira novu survey prijavu"""
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     return create_survey_service(session, user_id, survey_data)
 
 @router.get("/surveys/my", response_model=List[SurveyRead])
 def get_my_surveys(
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     """Dohvaća sve survey prijave trenutnog korisnika"""
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     return get_user_surveys_service(session, user_id)
 
 @router.get("/surveys/all")
 def get_all_surveys_endpoint(
     request: Request,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", "upravnik", detail="Nemate dozvolu za pristup ovim podacima."))
 ):
     """Dohvaća sve survey prijave (samo za admin/manager)"""
-    user_id = get_current_user_id(request)
+    user_id = current_user.id
     return get_all_surveys_service(session, user_id)
 
 @router.get("/surveys/stats")
 def get_survey_stats_endpoint(
     request: Request,
-    session: Session = Depends(get_session)
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    session: Session = Depends(get_session),
+    current_user: AuthUser = Depends(require_role("admin", "upravnik", detail="Nemate dozvolu za pristup ovim podacima."))
 ):
-    """Dohvaća statistike survey prijava (samo za admin/manager)"""
-    user_id = get_current_user_id(request)
-    return get_survey_stats_service(session, user_id)
+    """Dohvaća statistike survey prijava (samo za admin/manager), opciono za period date_from - date_to"""
+    user_id = current_user.id
+    return get_survey_stats_service(session, user_id, date_from, date_to)
@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Optional, Tuple, TypeVar
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Dijeljeni keš za globalne brojače dashboard-a (isti za sve upravnike).
+# Unos živi DASHBOARD_CACHE_TTL_SECONDS (default 30, 0 isključuje keš), a poništava se
+# odmah nakon commit-a transakcije koja je promijenila brojače (mark_dashboard_stale).
+# Backend se bira sa DASHBOARD_CACHE_URL:
+#   - prazno (default): in-process, dovoljno za jedan uvicorn worker
+#   - redis://...: Redis, dijele ga svi workeri (zahtijeva paket redis)
+#
+# Ključevi nose generaciju; poništavanje je povećanje generacije. Vrijednost izračunata
+# prije commit-a upisuje se pod staru generaciju i više se ne čita.
+
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "30"))
+
+_STALE_KEY = "dashboard_cache_stale"
+
+T = TypeVar("T")
+
+class InProcessCache:
+    """Keš u memoriji procesa; poništavanje vide samo zahtjevi u istom procesu"""
+
+    def __init__(self, ttl: float):
+        self._values: TTLCache = TTLCache(maxsize=64, ttl=ttl)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def get(self, key: str):
+        with self._lock:
+            return self._values.get(key)
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._values[key] = value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._values.clear()
+
+class RedisCache:
+    """Keš u Redis-u; vrijednosti i generaciju dijele svi workeri"""
+
+    PREFIX = "fixtrack:dashboard:"
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("DASHBOARD_CACHE_URL pokazuje na Redis, ali paket 'redis' nije instaliran.")
+        self._client = redis.Redis.from_url(url)
+        self._ttl = max(int(ttl), 1)
+
+    def generation(self) -> int:
+        return int(self._client.get(self.PREFIX + "generation") or 0)
+
+    def get(self, key: str):
+        raw = self._client.get(self.PREFIX + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value) -> None:
+        self._client.set(self.PREFIX + key, json.dumps(value, default=str), ex=self._ttl)
+
+    def invalidate(self) -> None:
+        # Stari ključevi ističu sami (TTL)
+        self._client.incr(self.PREFIX + "generation")
+
+_backend = None
+_backend_lock = threading.Lock()
+# Serijalizuje računanje, pa istovremeni zahtjevi nakon isteka računaju agregate samo jednom po procesu
+_compute_lock = threading.Lock()
+
+def _get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            url = os.getenv("DASHBOARD_CACHE_URL", "")
+            _backend = RedisCache(url, DASHBOARD_CACHE_TTL) if url.startswith("redis") else InProcessCache(DASHBOARD_CACHE_TTL)
+        return _backend
+
+def _lookup(key: str) -> Tuple[Optional[int], Any]:
+    """(generacija, vrijednost); (None, None) ako keš nije dostupan"""
+    try:
+        backend = _get_backend()
+        generation = backend.generation()
+        return generation, backend.get(f"{generation}:{key}")
+    except Exception:
+        logger.exception("Keš dashboard-a nije dostupan", extra={"key": key})
+        return None, None
+
+def _store(generation: Optional[int], key: str, value) -> None:
+    if generation is None:
+        return
+    try:
+        _get_backend().set(f"{generation}:{key}", value)
+    except Exception:
+        logger.exception("Upis u keš dashboard-a nije uspio", extra={"key": key})
+
+def get_or_compute(key: str, compute: Callable[[], T]) -> T:
+    """Vrijednost iz keša ili compute(); nedostupan keš ne ruši zahtjev (računa se direktno)"""
+    if DASHBOARD_CACHE_TTL <= 0:
+        return compute()
+    generation, value = _lookup(key)
+    if value is not None:
+        return value
+    with _compute_lock:
+        generation, value = _lookup(key)
+        if value is not None:
+            return value
+        value = compute()
+        _store(generation, key, value)
+        return value
+
+def invalidate_dashboard_cache() -> None:
+    try:
+        _get_backend().invalidate()
+    except Exception:
+        # Vrijednost u kešu ostaje najduže DASHBOARD_CACHE_TTL sekundi
+        logger.exception("Poništavanje keša dashboard-a nije uspjelo")
+
+def mark_dashboard_stale(session: Session) -> None:
+    """Označava da transakcija mijenja brojače; keš se poništava tek nakon uspješnog commit-a"""
+    session.info[_STALE_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_STALE_KEY, False):
+        invalidate_dashboard_cache()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_STALE_KEY, None)
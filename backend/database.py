@@ -1,9 +1,110 @@
 import os
+from typing import AsyncGenerator, Optional
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from dotenv import load_dotenv
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL, echo=True)
\ No newline at end of file
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+# Logovanje svakog SQL upita samo kada se eksplicitno uključi (DB_ECHO=true)
+DB_ECHO = _env_bool("DB_ECHO", False)
+
+# Podešavanja pool-a konekcija. Svaki worker proces ima dva pool-a: sync (DB_POOL_*)
+# i async (ASYNC_DB_POOL_*, samo ako proces dobije async zahtjev). Maksimalan broj
+# konekcija po procesu je zbir oba pool-a (MAX_CONNECTIONS_PER_PROCESS), a
+# (broj workera * taj zbir) mora ostati ispod Postgres max_connections.
+POOL_SETTINGS = {
+    "pool_size": _env_int("DB_POOL_SIZE", 5),
+    "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+    "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+    # Recikliranje prije nego što server/proxy zatvori neaktivnu konekciju
+    "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+    # Provjera konekcije pri preuzimanju iz pool-a (preživi restart baze)
+    "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+}
+
+# Async pool služi samo portovanim read endpoint-ima, pa je po defaultu manji
+ASYNC_POOL_SETTINGS = dict(
+    POOL_SETTINGS,
+    pool_size=_env_int("ASYNC_DB_POOL_SIZE", 5),
+    max_overflow=_env_int("ASYNC_DB_MAX_OVERFLOW", 5),
+)
+
+def _max_connections(settings: dict) -> int:
+    return settings["pool_size"] + settings["max_overflow"]
+
+MAX_CONNECTIONS_PER_PROCESS = _max_connections(POOL_SETTINGS) + _max_connections(ASYNC_POOL_SETTINGS)
+
+def _engine_kwargs(url: str, settings: dict) -> dict:
+    # SQLite (lokalni rad) koristi vlastiti pool bez ovih parametara
+    if url.startswith("sqlite"):
+        return {}
+    return dict(settings)
+
+engine = create_engine(DATABASE_URL, echo=DB_ECHO, **_engine_kwargs(DATABASE_URL, POOL_SETTINGS))
+
+# Async engine (asyncpg) za I/O-bound endpoint-e; kreira se tek pri prvom async zahtjevu
+_async_engine: Optional[AsyncEngine] = None
+
+def _async_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(_async_url(DATABASE_URL), echo=DB_ECHO, **_engine_kwargs(DATABASE_URL, ASYNC_POOL_SETTINGS))
+    return _async_engine
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency za async endpoint-e.
+
+    Postojeći (sync) servisi se pozivaju kroz session.run_sync(servis, ...), tako da
+    čekanje na bazu ne zauzima worker iz threadpool-a. Servis mora vratiti gotove
+    podatke (dict/schema) jer lazy loading nakon run_sync nije moguć.
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+def _pool_metrics(pool, settings: dict) -> dict:
+    metrics = {"pool_class": type(pool).__name__, "status": pool.status()}
+    # QueuePool (PostgreSQL) ima brojače; ostali pool-ovi ih nemaju
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            metrics[name] = counter()
+    if "size" in metrics:
+        metrics["max_overflow"] = settings["max_overflow"]
+        metrics["max_connections"] = _max_connections(settings)
+    return metrics
+
+def get_pool_metrics() -> dict:
+    """Trenutno stanje pool-a konekcija za ovaj proces (sync engine i, ako postoji, async engine).
+
+    max_connections je limit pojedinog pool-a; max_connections_per_process je zbir
+    oba pool-a i njega treba množiti brojem workera.
+    """
+    metrics = _pool_metrics(engine.pool, POOL_SETTINGS)
+    if _async_engine is not None:
+        metrics["async"] = _pool_metrics(_async_engine.pool, ASYNC_POOL_SETTINGS)
+    if "max_connections" in metrics:
+        metrics["max_connections_per_process"] = MAX_CONNECTIONS_PER_PROCESS
+    return metrics
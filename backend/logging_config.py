@@ -0,0 +1,69 @@
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Optional
+
+# Atributi koje LogRecord ima uvijek; sve ostalo je došlo kroz extra={...}
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+class JsonFormatter(logging.Formatter):
+    """Jedan JSON objekat po liniji: vrijeme, nivo, logger, poruka i polja iz extra"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def _parse_levels(spec: str) -> dict:
+    """'repositories=DEBUG,services.issue_service=WARNING' -> {ime_loggera: nivo}"""
+    levels = {}
+    for part in spec.split(","):
+        name, _, level = part.strip().partition("=")
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def setup_logging() -> None:
+    """Konfiguriše logovanje za aplikaciju.
+
+    LOG_LEVEL postavlja globalni nivo (default INFO), LOG_LEVELS nivoe po modulu
+    (npr. "repositories.issue_repository=DEBUG"). Zapisi idu kroz QueueHandler, a
+    ispis na stdout radi pozadinski QueueListener, pa request ne čeka na I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    for name, level in _parse_levels(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener.start()
+
+def shutdown_logging() -> None:
+    """Ispisuje zapise koji su ostali u redu i zaustavlja listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -8,6 +8,15 @@ from starlette.middleware.cors import CORSMiddleware
 from controllers import user_controller, issue_controller, notification_controller, assignment_controller, assignment_notification_controller, admin_controller, application_controller, dashboard_controller, survey_controller
 # Import all models to ensure they are registered with SQLModel
 from models import *
+from logging_config import setup_logging, shutdown_logging
+from notification_broker import broker
+from services.auto_assignment_service import auto_assignment_loop, auto_assignment_interval
+from services.background_job_service import job_worker_loop, job_worker_interval
+from services.issue_status_counter_service import status_counter_reconcile_loop, status_counter_reconcile_interval
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def create_db_and_tables():
@@ -17,11 +26,27 @@ def create_db_and_tables():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
   create_db_and_tables()
+  broker.start()
+  # Automatska dodjela radi samo kada je uključena u sistemskim postavkama
+  auto_assignment_task = asyncio.create_task(auto_assignment_loop(engine)) if auto_assignment_interval() > 0 else None
+  # Worker za red poslova (notifikacije, email); isključuje se sa JOB_WORKER_INTERVAL_SECONDS=0
+  # kada poslove obrađuje zaseban proces
+  job_worker_task = asyncio.create_task(job_worker_loop(engine)) if job_worker_interval() > 0 else None
+  reconcile_task = asyncio.create_task(status_counter_reconcile_loop(engine)) if status_counter_reconcile_interval() > 0 else None
   yield
-  print("Gašenje aplikacije")
+  if auto_assignment_task:
+    auto_assignment_task.cancel()
+  if job_worker_task:
+    job_worker_task.cancel()
+  if reconcile_task:
+    reconcile_task.cancel()
+  broker.stop()
+  logger.info("Gašenje aplikacije")
+  shutdown_logging()
 
 
 def start_application():
+  setup_logging()
   app = FastAPI(lifespan=lifespan)
 
   origins = ["*"]
@@ -0,0 +1,35 @@
+-- Historija promjena statusa prijava + materijalizovani completed_at na issue-u.
+-- Pokrenuti nad postojećom bazom (npr. psql -d fixtrack -f migrations/001_issue_status_history.sql).
+-- Nove baze dobijaju tabelu i kolonu kroz SQLModel.metadata.create_all.
+
+BEGIN;
+
+ALTER TABLE public.issue ADD COLUMN IF NOT EXISTS completed_at timestamp without time zone;
+
+CREATE INDEX IF NOT EXISTS ix_issue_completed_at ON public.issue USING btree (completed_at);
+
+CREATE TABLE IF NOT EXISTS public.issuestatushistory (
+    id SERIAL PRIMARY KEY,
+    issue_id integer NOT NULL REFERENCES public.issue(id),
+    old_status character varying(50),
+    new_status character varying(50) NOT NULL,
+    changed_by_id integer REFERENCES public."user"(id),
+    changed_at timestamp without time zone NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_issuestatushistory_issue_id ON public.issuestatushistory USING btree (issue_id);
+
+-- Postojeće završene prijave: najbolja procjena je posljednja izmjena završenog assignment-a
+UPDATE public.issue i
+SET completed_at = a.updated_at
+FROM (
+    SELECT issue_id, max(updated_at) AS updated_at
+    FROM public.assignment
+    WHERE status = 'Završeno'
+    GROUP BY issue_id
+) a
+WHERE a.issue_id = i.id
+  AND i.status = 'Završeno'
+  AND i.completed_at IS NULL;
+
+COMMIT;
@@ -0,0 +1,22 @@
+-- Indeksi za najčešće filtere i sortiranja (dashboard, historija, upravnički redovi,
+-- notifikacije, assignment-i izvođača). Odgovaraju indeksima deklarisanim na modelima.
+-- Pokrenuti nad postojećom bazom (npr. psql -d fixtrack -f migrations/002_hot_path_indexes.sql).
+-- Na velikim tabelama bez zastoja: izvršiti naredbe pojedinačno sa CREATE INDEX CONCURRENTLY (van transakcije).
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS ix_issue_created_at ON public.issue USING btree (created_at);
+CREATE INDEX IF NOT EXISTS ix_issue_tenant_id_created_at ON public.issue USING btree (tenant_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_issue_status_created_at ON public.issue USING btree (status, created_at);
+
+CREATE INDEX IF NOT EXISTS ix_assignment_issue_id ON public.assignment USING btree (issue_id);
+CREATE INDEX IF NOT EXISTS ix_assignment_contractor_id_status ON public.assignment USING btree (contractor_id, status);
+
+CREATE INDEX IF NOT EXISTS ix_notification_user_id_created_at ON public.notification USING btree (user_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_assignmentnotification_contractor_id_created_at ON public.assignmentnotification USING btree (contractor_id, created_at);
+
+CREATE INDEX IF NOT EXISTS ix_comment_issue_id ON public.comment USING btree (issue_id);
+CREATE INDEX IF NOT EXISTS ix_rating_issue_id_tenant_id ON public.rating USING btree (issue_id, tenant_id);
+CREATE INDEX IF NOT EXISTS ix_survey_tenant_id ON public.survey USING btree (tenant_id);
+
+COMMIT;
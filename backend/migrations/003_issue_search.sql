@@ -0,0 +1,12 @@
+-- Full-text pretraga prijava (naslov, opis, lokacija).
+-- Izraz indeksa mora biti identičan izrazu iz repositories/issue_search_repository.search_document,
+-- inače planer neće koristiti indeks.
+-- Pokrenuti nad postojećom bazom (npr. psql -d fixtrack -f migrations/003_issue_search.sql).
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS ix_issue_search_document ON public.issue USING gin (
+    to_tsvector('simple'::regconfig, coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || coalesce(location, ''))
+);
+
+COMMIT;
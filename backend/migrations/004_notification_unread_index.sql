@@ -0,0 +1,8 @@
+-- Parcijalni indeks nad nepročitanim notifikacijama (GET /api/notifications/unread-count).
+-- Pokrenuti nad postojećom bazom (npr. psql -d fixtrack -f migrations/004_notification_unread_index.sql).
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS ix_notification_user_id_unread ON public.notification USING btree (user_id) WHERE is_read = false;
+
+COMMIT;
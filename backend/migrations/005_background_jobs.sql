@@ -0,0 +1,22 @@
+-- Red pozadinskih poslova (notifikacije, email) koje obrađuje job worker.
+-- Pokrenuti nad postojećom bazom (npr. psql -d fixtrack -f migrations/005_background_jobs.sql).
+-- Nove baze dobijaju tabelu kroz SQLModel.metadata.create_all.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.backgroundjob (
+    id SERIAL PRIMARY KEY,
+    job_type character varying(50) NOT NULL,
+    payload text NOT NULL,
+    status character varying(20) NOT NULL,
+    attempts integer NOT NULL,
+    last_error text,
+    run_after timestamp without time zone NOT NULL,
+    created_at timestamp without time zone NOT NULL,
+    updated_at timestamp without time zone NOT NULL
+);
+
+-- Parcijalni indeks: worker pretražuje samo poslove koji čekaju ili su u obradi
+CREATE INDEX IF NOT EXISTS ix_backgroundjob_pending_run_after ON public.backgroundjob USING btree (run_after) WHERE status IN ('pending', 'running');
+
+COMMIT;
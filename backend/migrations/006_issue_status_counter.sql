@@ -0,0 +1,31 @@
+-- Materijalizovani brojači prijava po statusu (global / stanar / izvođač) za dashboard-e.
+-- Pokrenuti nad postojećom bazom (npr. psql -d fixtrack -f migrations/006_issue_status_counter.sql).
+-- Nove baze dobijaju tabelu kroz SQLModel.metadata.create_all; aplikacija pri pokretanju
+-- i periodično radi rekoncilijaciju (STATUS_COUNTER_RECONCILE_INTERVAL_SECONDS).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.issue_status_counter (
+    scope character varying(20) NOT NULL,
+    scope_id integer NOT NULL,
+    status character varying(50) NOT NULL,
+    count integer NOT NULL,
+    PRIMARY KEY (scope, scope_id, status)
+);
+
+-- Početno punjenje iz postojećih podataka
+DELETE FROM public.issue_status_counter;
+
+INSERT INTO public.issue_status_counter (scope, scope_id, status, count)
+SELECT 'global', 0, status, count(*) FROM public.issue GROUP BY status;
+
+INSERT INTO public.issue_status_counter (scope, scope_id, status, count)
+SELECT 'tenant', tenant_id, status, count(*) FROM public.issue GROUP BY tenant_id, status;
+
+INSERT INTO public.issue_status_counter (scope, scope_id, status, count)
+SELECT 'contractor', a.contractor_id, i.status, count(*)
+FROM public.assignment a
+JOIN public.issue i ON i.id = a.issue_id
+GROUP BY a.contractor_id, i.status;
+
+COMMIT;
@@ -0,0 +1,15 @@
+-- Trigram indeks za ILIKE fallback pretrage prijava (podniz bilo gdje u tekstu).
+-- Izraz indeksa mora biti identičan izrazu iz repositories/issue_search_repository.search_text,
+-- inače planer neće koristiti indeks.
+-- Pokrenuti nad postojećom bazom (npr. psql -d fixtrack -f migrations/007_issue_search_trgm.sql);
+-- CREATE EXTENSION zahtijeva korisnika sa pravom kreiranja ekstenzija.
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_issue_search_trgm ON public.issue USING gin (
+    (coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || coalesce(location, '')) gin_trgm_ops
+);
+
+COMMIT;
@@ -2,6 +2,7 @@ from .role_model import Role
 from .user_model import User
 from .issue_category_model import IssueCategory
 from .issue_model import Issue
+from .issue_status_history_model import IssueStatusHistory
 from .issue_image_model import IssueImage
 from .comment_model import Comment
 from .notification_model import Notification
@@ -14,4 +15,6 @@ from .survey_model import Survey
 from .admin_note_model import AdminNote
 from .notes_model import Notes
 from .role_request_model import RoleRequest
-from .system_settings_model import SystemSettings 
\ No newline at end of file
+from .system_settings_model import SystemSettings
+from .background_job_model import BackgroundJob
+from .issue_status_counter_model import IssueStatusCounter
@@ -1,10 +1,16 @@
 from datetime import datetime
 from typing import Optional, List
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 
 class Assignment(SQLModel, table=True):
+    __table_args__ = (
+        # Assignment-i izvođača filtrirani po statusu
+        Index("ix_assignment_contractor_id_status", "contractor_id", "status"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    issue_id: int = Field(foreign_key="issue.id")
+    issue_id: int = Field(foreign_key="issue.id", index=True)
     contractor_id: int = Field(foreign_key="user.id")
     status: str = Field(default="Primljeno", max_length=50)
     estimated_cost: Optional[float] = None
@@ -1,8 +1,13 @@
 from datetime import datetime
 from typing import Optional
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 
 class AssignmentNotification(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_assignmentnotification_contractor_id_created_at", "contractor_id", "created_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     contractor_id: int = Field(foreign_key="user.id")
     assignment_id: int = Field(foreign_key="assignment.id")
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, Index, Text, text
+
+class BackgroundJob(SQLModel, table=True):
+    __table_args__ = (
+        # Worker traži samo poslove na čekanju, po vremenu izvršavanja
+        Index(
+            "ix_backgroundjob_pending_run_after", "run_after",
+            postgresql_where=text("status IN ('pending', 'running')"),
+            sqlite_where=text("status IN ('pending', 'running')")
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_type: str = Field(max_length=50)
+    payload: str = Field(sa_column=Column(Text, nullable=False))  # JSON
+    status: str = Field(default="pending", max_length=20)  # pending, running, failed
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = Field(default=None, sa_column=Column(Text))
+    run_after: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
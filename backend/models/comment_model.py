@@ -4,7 +4,7 @@ from sqlmodel import SQLModel, Field, Relationship
 
 class Comment(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    issue_id: int = Field(foreign_key="issue.id")
+    issue_id: int = Field(foreign_key="issue.id", index=True)
     user_id: int = Field(foreign_key="user.id")
     content: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
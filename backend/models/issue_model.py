@@ -1,8 +1,16 @@
 from datetime import datetime
 from typing import Optional, List
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 
 class Issue(SQLModel, table=True):
+    __table_args__ = (
+        # Historija i dashboard stanara: filter po tenant_id, sortiranje po created_at
+        Index("ix_issue_tenant_id_created_at", "tenant_id", "created_at"),
+        # Upravnički redovi: filter po statusu, sortiranje po created_at
+        Index("ix_issue_status_created_at", "status", "created_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     tenant_id: int = Field(foreign_key="user.id")
     category_id: int = Field(foreign_key="issuecategory.id")
@@ -10,7 +18,8 @@ class Issue(SQLModel, table=True):
     description: Optional[str] = None
     location: Optional[str] = None
     status: str = Field(default="Primljeno", max_length=50)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    completed_at: Optional[datetime] = Field(default=None, index=True)
 
     tenant: Optional["User"] = Relationship()
     category: Optional["IssueCategory"] = Relationship(back_populates="issues")
@@ -19,4 +28,5 @@ class Issue(SQLModel, table=True):
     notes: List["Notes"] = Relationship(back_populates="issue")
     ratings: List["Rating"] = Relationship(back_populates="issue")
     assignments: List["Assignment"] = Relationship(back_populates="issue") 
-    notifications: List["Notification"] = Relationship(back_populates="issue") 
\ No newline at end of file
+    notifications: List["Notification"] = Relationship(back_populates="issue")
+    status_history: List["IssueStatusHistory"] = Relationship(back_populates="issue") 
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlmodel import SQLModel, Field
+
+class IssueStatusCounter(SQLModel, table=True):
+    """Materijalizovani broj prijava po statusu, održava se pri svakoj promjeni.
+
+    scope je "global" (scope_id = 0), "tenant" (scope_id = stanar) ili
+    "contractor" (scope_id = izvođač; broji assignment-e po statusu prijave).
+    """
+    __tablename__ = "issue_status_counter"
+
+    scope: str = Field(primary_key=True, max_length=20)
+    scope_id: int = Field(primary_key=True)
+    status: str = Field(primary_key=True, max_length=50)
+    count: int = Field(default=0)
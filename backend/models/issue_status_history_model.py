@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field, Relationship
+
+class IssueStatusHistory(SQLModel, table=True):
+    # Append-only log promjena statusa prijave
+    id: Optional[int] = Field(default=None, primary_key=True)
+    issue_id: int = Field(foreign_key="issue.id", index=True)
+    old_status: Optional[str] = Field(default=None, max_length=50)
+    new_status: str = Field(max_length=50)
+    changed_by_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    changed_at: datetime = Field(default_factory=datetime.utcnow)
+
+    issue: Optional["Issue"] = Relationship(back_populates="status_history")
+    changed_by: Optional["User"] = Relationship()
@@ -1,8 +1,19 @@
 from datetime import datetime
 from typing import Optional
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, text
 
 class Notification(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_notification_user_id_created_at", "user_id", "created_at"),
+        # Parcijalni indeks samo nad nepročitanim - brojač za badge je index-only scan
+        Index(
+            "ix_notification_user_id_unread", "user_id",
+            postgresql_where=text("is_read = false"),
+            sqlite_where=text("is_read = 0")
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     issue_id: Optional[int] = Field(default=None, foreign_key="issue.id")
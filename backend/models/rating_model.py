@@ -1,8 +1,13 @@
 from datetime import datetime
 from typing import Optional
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 
 class Rating(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_rating_issue_id_tenant_id", "issue_id", "tenant_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     issue_id: int = Field(foreign_key="issue.id")
     tenant_id: int = Field(foreign_key="user.id")
@@ -4,7 +4,7 @@ from sqlmodel import SQLModel, Field, Relationship
 
 class Survey(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    tenant_id: int = Field(foreign_key="user.id")
+    tenant_id: int = Field(foreign_key="user.id", index=True)
     issue_id: Optional[int] = Field(default=None, foreign_key="issue.id")  # Optional jer može biti generalna prijava
     satisfaction_level: str = Field(max_length=50)  # vrlo_zadovoljan, zadovoljan, neutralan, nezadovoljan, vrlo_nezadovoljan
     issue_category: str = Field(max_length=50)  # voda, struja, grijanje, lift, sigurnost, čistoća, komunikacija, ostalo
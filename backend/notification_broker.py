@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pub/sub za real-time notifikacije (SSE stream /api/notifications/stream).
+# Servisi objavljuju poruku na kanal korisnika nakon commit-a, a otvoreni streamovi
+# tog korisnika je primaju. Backend se bira sa NOTIFICATION_BROKER_URL:
+#   - prazno (default): in-process, dovoljno za jedan uvicorn worker
+#   - redis://...: Redis pub/sub, dijele ga svi workeri (zahtijeva paket redis)
+
+Deliver = Callable[[str, dict], None]
+
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+class InProcessBackend:
+    """Poruke se isporučuju direktno pretplatnicima u istom procesu"""
+
+    def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    def publish(self, channel: str, message: dict) -> None:
+        self._deliver(channel, message)
+
+    def stop(self) -> None:
+        pass
+
+class RedisBackend:
+    """Poruke idu kroz Redis; svaki worker ima thread koji ih prosljeđuje lokalnim pretplatnicima"""
+
+    PREFIX = "fixtrack:notifications:"
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("NOTIFICATION_BROKER_URL pokazuje na Redis, ali paket 'redis' nije instaliran.")
+        self._client = redis.Redis.from_url(url)
+        self._pubsub = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, deliver: Deliver) -> None:
+        def on_message(raw: dict) -> None:
+            channel = raw["channel"].decode()[len(self.PREFIX):]
+            deliver(channel, json.loads(raw["data"]))
+
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.psubscribe(**{self.PREFIX + "*": on_message})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publish(self, channel: str, message: dict) -> None:
+        self._client.publish(self.PREFIX + channel, json.dumps(message, default=str))
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+class NotificationBroker:
+    # Poruke za spore klijente se odbacuju kada im je red pun (klijent ionako može
+    # dohvatiti propušteno preko GET /api/notifications)
+    QUEUE_SIZE = 100
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> None:
+        if self._started:
+            return
+        if self._backend is None:
+            url = os.getenv("NOTIFICATION_BROKER_URL", "")
+            self._backend = RedisBackend(url) if url.startswith("redis") else InProcessBackend()
+        self._backend.start(self._deliver)
+        self._started = True
+
+    def stop(self) -> None:
+        if self._started:
+            self._backend.stop()
+            self._started = False
+
+    def publish(self, channel: str, message: dict) -> None:
+        """Objavljuje poruku; poziva se iz sync koda, greška brokera ne ruši zahtjev"""
+        try:
+            self.start()
+            self._backend.publish(channel, message)
+        except Exception:
+            logger.exception("Objava notifikacije nije uspjela", extra={"channel": channel})
+
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        """Registruje red za kanal; mora se pozvati iz event loop-a koji će čitati red"""
+        self.start()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(channel, set())
+            for entry in [entry for entry in subscribers if entry[1] is queue]:
+                subscribers.discard(entry)
+            if not subscribers:
+                self._subscribers.pop(channel, None)
+
+    def _deliver(self, channel: str, message: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            # Objava može doći iz threadpool-a ili Redis thread-a, pa se red puni kroz loop
+            try:
+                loop.call_soon_threadsafe(self._put, queue, message)
+            except RuntimeError:
+                # Loop pretplatnika je zatvoren (gašenje workera)
+                self.unsubscribe(channel, queue)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, message: dict) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("Red notifikacija je pun, poruka odbačena")
+
+broker = NotificationBroker()
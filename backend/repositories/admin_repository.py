@@ -2,8 +2,8 @@ from sqlmodel import Session, select, func
 from sqlalchemy.orm import selectinload
 from models.user_model import User
 from models.role_model import Role
-from typing import List, Optional, Dict
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Tuple
+from datetime import datetime, timedelta, date
 
 def get_all_users(session: Session, search: Optional[str] = None, role_id: Optional[int] = None) -> List[User]:
     statement = select(User).options(selectinload(User.role))
@@ -41,28 +41,53 @@ def delete_user(session: Session, user_id: int) -> bool:
     return False
 
 def get_user_stats(session: Session) -> Dict:
-    # Total users
-    total_users = session.exec(select(func.count(User.id))).first()
-    
-    # Users by role
-    users_by_role = {}
-    roles = session.exec(select(Role)).all()
-    for role in roles:
-        count = session.exec(select(func.count(User.id)).where(User.role_id == role.id)).first()
-        users_by_role[role.name] = count
-    
+    """Broj korisnika po ulozi jednim GROUP BY upitom (uloge bez korisnika imaju 0)"""
     # Recent registrations (last 30 days)
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    recent_registrations = session.exec(
-        select(func.count(User.id)).where(User.created_at >= thirty_days_ago)
-    ).first()
+    rows = session.exec(
+        select(
+            Role.name,
+            func.count(User.id),
+            func.count(User.id).filter(User.created_at >= thirty_days_ago)
+        )
+        .outerjoin(User, User.role_id == Role.id)
+        .group_by(Role.id, Role.name)
+    ).all()
     
+    # role_id je obavezan, pa je zbir po ulogama ukupan broj korisnika
     return {
-        "total_users": total_users,
-        "users_by_role": users_by_role,
-        "recent_registrations": recent_registrations
+        "total_users": sum(count for _, count, _ in rows),
+        "users_by_role": {name: count for name, count, _ in rows},
+        "recent_registrations": sum(recent for _, _, recent in rows)
     }
 
+def _registration_bucket(session: Session, interval: str):
+    """Izraz za početak dana/sedmice (sedmica počinje ponedjeljkom, kao date_trunc)"""
+    if session.get_bind().dialect.name == "postgresql":
+        return func.date_trunc(interval, User.created_at)
+    if interval == "week":
+        return func.date(User.created_at, "weekday 0", "-6 days")
+    return func.date(User.created_at)
+
+def get_registration_counts(session: Session, since: datetime, interval: str = "day") -> List[Tuple[date, int]]:
+    """Broj registracija po danu/sedmici od datuma since, grupisano u bazi"""
+    bucket = _registration_bucket(session, interval).label("period")
+    rows = session.exec(
+        select(bucket, func.count(User.id))
+        .where(User.created_at >= since)
+        .group_by(bucket)
+        .order_by(bucket)
+    ).all()
+    result = []
+    for period, count in rows:
+        # PostgreSQL vraća timestamp, SQLite tekst 'YYYY-MM-DD'
+        if isinstance(period, datetime):
+            period = period.date()
+        elif isinstance(period, str):
+            period = date.fromisoformat(period)
+        result.append((period, count))
+    return result
+
 def get_all_roles(session: Session) -> List[Role]:
     return session.exec(select(Role).order_by(Role.name)).all()
 
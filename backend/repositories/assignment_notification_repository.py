@@ -1,4 +1,4 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
 from models.assignment_notification_model import AssignmentNotification
 from typing import List
 
@@ -25,16 +25,17 @@ def mark_assignment_notification_as_read(session: Session, notification_id: int,
         session.refresh(notification)
     return notification
 
-def mark_all_assignment_notifications_as_read(session: Session, contractor_id: int) -> List[AssignmentNotification]:
-    statement = select(AssignmentNotification).where(
-        AssignmentNotification.contractor_id == contractor_id,
-        AssignmentNotification.is_read == False
+def mark_all_assignment_notifications_as_read(session: Session, contractor_id: int) -> List[int]:
+    """Označava sve nepročitane notifikacije jednim UPDATE ... RETURNING id; vraća ID-eve"""
+    statement = (
+        update(AssignmentNotification)
+        .where(
+            AssignmentNotification.contractor_id == contractor_id,
+            AssignmentNotification.is_read == False
+        )
+        .values(is_read=True)
+        .returning(AssignmentNotification.id)
     )
-    notifications = session.exec(statement).all()
-    for notification in notifications:
-        notification.is_read = True
-        session.add(notification)
+    ids = list(session.exec(statement).scalars())
     session.commit()
-    for notification in notifications:
-        session.refresh(notification)
-    return notifications
+    return ids
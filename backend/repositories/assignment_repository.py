@@ -1,9 +1,11 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, func
+from sqlalchemy.orm import selectinload
 from models.assignment_model import Assignment
 from models.assignment_image_model import AssignmentImage
 from models.assignment_document_model import AssignmentDocument
 from models.issue_model import Issue
 from models.user_model import User
+from models.role_model import Role
 from typing import List, Optional
 from datetime import datetime
 
@@ -13,8 +15,63 @@ def create_assignment(session: Session, assignment: Assignment) -> Assignment:
     session.refresh(assignment)
     return assignment
 
-def get_assignments_for_contractor(session: Session, contractor_id: int) -> List[Assignment]:
-    statement = select(Assignment).where(Assignment.contractor_id == contractor_id)
+def _contractor_assignments_filter(statement, contractor_id: int, status: Optional[str] = None):
+    statement = statement.where(Assignment.contractor_id == contractor_id)
+    if status:
+        statement = statement.where(Assignment.status == status)
+    return statement
+
+def get_assignments_for_contractor(
+    session: Session,
+    contractor_id: int,
+    status: Optional[str] = None,
+    page: int = 1,
+    page_size: Optional[int] = None
+) -> List[Assignment]:
+    """Assignment-i izvođača sa issue-om, kategorijom, slikama i stanarom (fiksan broj upita)"""
+    statement = select(Assignment).options(
+        selectinload(Assignment.issue).selectinload(Issue.category),
+        selectinload(Assignment.issue).selectinload(Issue.images),
+        selectinload(Assignment.issue).selectinload(Issue.tenant)
+    )
+    statement = _contractor_assignments_filter(statement, contractor_id, status)
+    statement = statement.order_by(Assignment.created_at.desc(), Assignment.id.desc())
+    if page_size is not None:
+        statement = statement.offset((page - 1) * page_size).limit(page_size)
+    return list(session.exec(statement))
+
+def count_assignments_for_contractor(session: Session, contractor_id: int, status: Optional[str] = None) -> int:
+    statement = _contractor_assignments_filter(select(func.count(Assignment.id)), contractor_id, status)
+    return session.exec(statement).first() or 0
+
+# Statusi assignment-a koji se računaju kao trenutno opterećenje izvođača
+ACTIVE_ASSIGNMENT_STATUSES = ["Primljeno", "Na lokaciji", "Popravka u toku"]
+
+def get_contractors_with_active_counts(
+    session: Session,
+    sort_by: Optional[str] = None,
+    statuses: Optional[List[str]] = None
+) -> List[tuple]:
+    """Svi izvođači sa brojem aktivnih assignment-a, jednim upitom (LEFT JOIN + GROUP BY).
+
+    sort_by: "load_asc" / "load_desc" sortira po opterećenju, inače po ID-u izvođača.
+    statuses: statusi koji se broje (default ACTIVE_ASSIGNMENT_STATUSES).
+    """
+    active_statuses = statuses if statuses is not None else ACTIVE_ASSIGNMENT_STATUSES
+    active_count = func.count(Assignment.id).label("active_assignments_count")
+    statement = (
+        select(User, active_count)
+        .join(Role, Role.id == User.role_id)
+        .outerjoin(Assignment, (Assignment.contractor_id == User.id) & Assignment.status.in_(active_statuses))
+        .where(Role.name.ilike("%izvođač%"))
+        .group_by(User.id)
+    )
+    if sort_by == "load_asc":
+        statement = statement.order_by(active_count.asc(), User.id.asc())
+    elif sort_by == "load_desc":
+        statement = statement.order_by(active_count.desc(), User.id.asc())
+    else:
+        statement = statement.order_by(User.id.asc())
     return list(session.exec(statement))
 
 def get_assignment_by_id(session: Session, assignment_id: int) -> Optional[Assignment]:
@@ -0,0 +1,61 @@
+from sqlmodel import Session, select, delete, or_, and_
+from models import BackgroundJob
+from datetime import datetime, timedelta
+from typing import List
+import json
+
+# Posao u statusu "running" čiji worker nije javio rezultat u ovom roku (pad procesa)
+# ponovo postaje dostupan drugim workerima
+RUNNING_LEASE = timedelta(minutes=5)
+MAX_ATTEMPTS = 5
+
+def enqueue_job(session: Session, job_type: str, payload: dict) -> BackgroundJob:
+    """Dodaje posao u sesiju bez commit-a - upisuje se u istoj transakciji kao i promjena koja ga je izazvala"""
+    job = BackgroundJob(job_type=job_type, payload=json.dumps(payload, default=str))
+    session.add(job)
+    return job
+
+def claim_due_jobs(session: Session, limit: int) -> List[BackgroundJob]:
+    """Preuzima do limit poslova spremnih za izvršavanje (FOR UPDATE SKIP LOCKED, pa više workera ne uzima isti posao)"""
+    now = datetime.utcnow()
+    statement = (
+        select(BackgroundJob)
+        .where(or_(
+            and_(BackgroundJob.status == "pending", BackgroundJob.run_after <= now),
+            and_(BackgroundJob.status == "running", BackgroundJob.updated_at < now - RUNNING_LEASE)
+        ))
+        .order_by(BackgroundJob.run_after.asc(), BackgroundJob.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    jobs = list(session.exec(statement))
+    for job in jobs:
+        job.status = "running"
+        job.attempts += 1
+        job.updated_at = now
+        session.add(job)
+    session.commit()
+    return jobs
+
+def complete_job(session: Session, job_id: int) -> None:
+    """Briše uspješno obrađen posao bez commit-a - commit-uje se zajedno sa efektima posla.
+
+    U tabeli ostaju samo poslovi na čekanju i neuspjeli.
+    """
+    session.exec(delete(BackgroundJob).where(BackgroundJob.id == job_id))
+
+def fail_job(session: Session, job_id: int, error: str) -> None:
+    """Vraća posao u red sa eksponencijalnim odgađanjem; nakon MAX_ATTEMPTS ostaje kao failed"""
+    job = session.get(BackgroundJob, job_id)
+    if not job:
+        return
+    now = datetime.utcnow()
+    job.last_error = error
+    job.updated_at = now
+    if job.attempts >= MAX_ATTEMPTS:
+        job.status = "failed"
+    else:
+        job.status = "pending"
+        job.run_after = now + timedelta(seconds=2 ** job.attempts)
+    session.add(job)
+    session.commit()
@@ -1,6 +1,6 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, func
 from models import Comment, User
-from typing import List
+from typing import List, Dict
 
 def create_comment(session: Session, comment: Comment) -> Comment:
     session.add(comment)
@@ -10,4 +10,15 @@ def create_comment(session: Session, comment: Comment) -> Comment:
 
 def get_comments_for_issue(session: Session, issue_id: int) -> List[Comment]:
     statement = select(Comment).where(Comment.issue_id == issue_id).order_by(Comment.created_at.asc())
-    return list(session.exec(statement)) 
\ No newline at end of file
+    return list(session.exec(statement)) 
+
+def count_comments_for_issues(session: Session, issue_ids: List[int], user_id: int) -> Dict[int, int]:
+    """Broj komentara korisnika po issue-u, jednim GROUP BY upitom"""
+    if not issue_ids:
+        return {}
+    statement = (
+        select(Comment.issue_id, func.count(Comment.id))
+        .where(Comment.issue_id.in_(issue_ids), Comment.user_id == user_id)
+        .group_by(Comment.issue_id)
+    )
+    return {issue_id: count for issue_id, count in session.exec(statement)}
@@ -1,108 +1,65 @@
-from sqlmodel import Session, select, func, and_, or_, alias
+from sqlmodel import Session, select, func, alias
+from sqlalchemy import extract
+from sqlalchemy.orm import aliased
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
-from models import Issue, User, Assignment, Rating, Role, IssueCategory
+from models import Issue, User, Assignment, Rating, Role
+from repositories.issue_status_counter_repository import get_status_counts, GLOBAL_SCOPE, TENANT_SCOPE, CONTRACTOR_SCOPE
+
+TENANT_IN_PROGRESS_STATUSES = ["Primljeno", "Dodijeljeno", "U toku", "Na lokaciji", "Čeka dijelove"]
 
 def get_tenant_dashboard_stats(session: Session, user_id: int) -> Dict:
     """Dohvaća statistike za tenant dashboard"""
     
-    # Ukupno prijava korisnika
-    total_issues = session.exec(
-        select(func.count(Issue.id)).where(Issue.tenant_id == user_id)
-    ).first() or 0
-    
+    # Ukupno, u toku i završene iz materijalizovanih brojača stanara (lookup po primarnom ključu)
+    counts = get_status_counts(session, TENANT_SCOPE, user_id)
+    total_issues = sum(counts.values())
     # Prijave u toku (sve osim završenih i odbačenih)
-    in_progress = session.exec(
-        select(func.count(Issue.id)).where(
-            and_(
-                Issue.tenant_id == user_id,
-                or_(
-                    Issue.status == "Primljeno",
-                    Issue.status == "Dodijeljeno", 
-                    Issue.status == "U toku",
-                    Issue.status == "Na lokaciji",
-                    Issue.status == "Čeka dijelove"
-                )
-            )
-        )
-    ).first() or 0
-    
-    # Završene prijave
-    completed = session.exec(
-        select(func.count(Issue.id)).where(
-            and_(
-                Issue.tenant_id == user_id,
-                Issue.status == "Završeno"
-            )
-        )
-    ).first() or 0
-    
-    # Hitne prijave (visok prioritet)
-    urgent = session.exec(
-        select(func.count(Issue.id)).where(
-            and_(
-                Issue.tenant_id == user_id,
-                Issue.status == "Završeno"  # Fallback jer Issue model nema priority polje
-            )
-        )
-    ).first() or 0
+    in_progress = sum(counts.get(status, 0) for status in TENANT_IN_PROGRESS_STATUSES)
+    completed = counts.get("Završeno", 0)
     
     # Mjesečni cilj (završene prijave ovaj mjesec)
     current_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    monthly_completed = session.exec(
-        select(func.count(Issue.id)).where(
-            and_(
-                Issue.tenant_id == user_id,
-                Issue.status == "Završeno",
-                Issue.created_at >= current_month
-            )
-        )
-    ).first() or 0
+    
+    # Prosječna ocjena zadovoljstva kao podupit, da sve ide u jednom round-tripu
+    avg_rating = (
+        select(func.avg(Rating.score))
+        .where(Rating.tenant_id == user_id)
+        .scalar_subquery()
+    )
+    
+    # Agregat ostaje samo za mjesečni broj i prosjeke, i to samo nad završenim prijavama
+    row = session.exec(
+        select(
+            func.count(Issue.id).filter(Issue.created_at >= current_month),
+            # Prosječno vrijeme rješavanja (sekunde) iz materijalizovanog completed_at
+            func.avg(extract("epoch", Issue.completed_at) - extract("epoch", Issue.created_at)).filter(
+                Issue.completed_at.isnot(None)
+            ),
+            avg_rating
+        ).where(Issue.tenant_id == user_id, Issue.status == "Završeno")
+    ).one()
+    
+    monthly_completed, avg_resolution_seconds, satisfaction_rating = row
+    
+    # Hitne prijave (visok prioritet) - fallback jer Issue model nema priority polje
+    urgent = completed
     
     # Mjesečni cilj je 10 prijava (može se konfigurirati)
     monthly_goal = 10
     monthly_goal_progress = (monthly_completed / monthly_goal * 100) if monthly_goal > 0 else 0
     
     # Prosječno vrijeme rješavanja (u danima)
-    avg_resolution_time = 0
-    if completed > 0:
-        # Dohvati sve završene prijave sa vremenom rješavanja
-        completed_issues = session.exec(
-            select(Issue).where(
-                and_(
-                    Issue.tenant_id == user_id,
-                    Issue.status == "Završeno",
-                    Issue.created_at.isnot(None)
-                )
-            )
-        ).all()
-        
-        if completed_issues:
-            total_days = 0
-            for issue in completed_issues:
-                if issue.created_at:
-                    days = (datetime.utcnow() - issue.created_at).days
-                    total_days += days
-            avg_resolution_time = total_days / len(completed_issues)
-    
-    # Prosječna ocjena zadovoljstva
-    satisfaction_rating = 0
-    ratings = session.exec(
-        select(Rating).where(Rating.tenant_id == user_id)
-    ).all()
-    
-    if ratings:
-        total_rating = sum(rating.score for rating in ratings)
-        satisfaction_rating = total_rating / len(ratings)
+    avg_resolution_time = float(avg_resolution_seconds) / 86400 if avg_resolution_seconds is not None else 0
     
     return {
-        "total_issues": total_issues,
-        "in_progress": in_progress,
-        "completed": completed,
-        "urgent": urgent,
+        "total_issues": total_issues or 0,
+        "in_progress": in_progress or 0,
+        "completed": completed or 0,
+        "urgent": urgent or 0,
         "monthly_goal_progress": round(monthly_goal_progress, 1),
         "average_resolution_time": round(avg_resolution_time, 1),
-        "satisfaction_rating": round(satisfaction_rating, 1)
+        "satisfaction_rating": round(float(satisfaction_rating or 0), 1)
     }
 
 def get_tenant_recent_issues(session: Session, user_id: int, limit: int = 3) -> List[Dict]:
@@ -131,71 +88,53 @@ def get_tenant_recent_issues(session: Session, user_id: int, limit: int = 3) ->
     return recent_issues
 
 def get_manager_dashboard_stats(session: Session, user_id: int) -> Dict:
-    """Dohvaća statistike za manager dashboard"""
-    
-    # Ukupno prijava za sve vrijeme
-    total_issues = session.exec(
-        select(func.count(Issue.id))
-    ).first() or 0
-    
-    # Prijave koje čekaju dodjelu
-    pending_assignment = session.exec(
-        select(func.count(Issue.id)).where(Issue.status == "Primljeno")
-    ).first() or 0
+    """Dohvaća statistike za manager dashboard (globalne, iste za sve upravnike)"""
     
-    # Prijave u toku (samo status "Popravka u toku")
-    in_progress = session.exec(
-        select(func.count(Issue.id)).where(Issue.status == "Popravka u toku")
-    ).first() or 0
-    
-    # Ukupno završene prijave
-    completed_total = session.exec(
-        select(func.count(Issue.id)).where(Issue.status == "Završeno")
-    ).first() or 0
+    # Materijalizovani brojači (issue_status_counter) umjesto prebrojavanja tabele
+    counts = get_status_counts(session, GLOBAL_SCOPE)
     
     return {
-        "total_issues": total_issues,
-        "pending_assignment": pending_assignment,
-        "in_progress": in_progress,
-        "completed_total": completed_total
+        # Ukupno prijava za sve vrijeme
+        "total_issues": sum(counts.values()),
+        # Prijave koje čekaju dodjelu
+        "pending_assignment": counts.get("Primljeno", 0),
+        # Prijave u toku (samo status "Popravka u toku")
+        "in_progress": counts.get("Popravka u toku", 0),
+        # Ukupno završene prijave
+        "completed_total": counts.get("Završeno", 0)
     }
 
 def get_manager_recent_issues(session: Session, limit: int = 4) -> List[Dict]:
-    """Dohvaća nedavne prijave za manager dashboard"""
-    
-    # Pojednostavljen pristup - dohvati samo Issue objekte sa relationships
-    issues = session.exec(
-        select(Issue)
-        .order_by(Issue.created_at.desc())
+    """Dohvaća nedavne prijave za manager dashboard jednim upitom, bez obzira na limit"""
+    
+    tenant = aliased(User)
+    # Izvođač iz prvog assignment-a prijave kao korelisani podupit (bez umnožavanja redova)
+    contractor_name = (
+        select(User.full_name)
+        .join(Assignment, Assignment.contractor_id == User.id)
+        .where(Assignment.issue_id == Issue.id)
+        .order_by(Assignment.id)
+        .limit(1)
+        .correlate(Issue)
+        .scalar_subquery()
+    )
+    rows = session.exec(
+        select(Issue, tenant.full_name, contractor_name)
+        .outerjoin(tenant, tenant.id == Issue.tenant_id)
+        .order_by(Issue.created_at.desc(), Issue.id.desc())
         .limit(limit)
     ).all()
     
     recent_issues = []
-    for issue in issues:
-        # Dohvati tenant informacije
-        tenant = session.get(User, issue.tenant_id)
-        
-        # Dohvati category informacije
-        category = session.get(IssueCategory, issue.category_id)
-        
-        # Dohvati assignment informacije
-        assignment = session.exec(
-            select(Assignment).where(Assignment.issue_id == issue.id)
-        ).first()
-        
-        # Dohvati contractor informacije ako postoji assignment
-        contractor = None
-        if assignment:
-            contractor = session.get(User, assignment.contractor_id)
-        
+    for issue, tenant_name, assigned_to in rows:
         recent_issues.append({
             "id": issue.id,
             "title": issue.title,
             "description": issue.description or "",
             "location": issue.location or "",
             "status": issue.status,
-            "tenant": tenant.full_name if tenant else "Nepoznato",
-            "assigned_to": contractor.full_name if contractor else None,
+            "tenant": tenant_name or "Nepoznato",
+            "assigned_to": assigned_to,
             "created_at": issue.created_at.isoformat()
         })
     
@@ -204,55 +143,18 @@ def get_manager_recent_issues(session: Session, limit: int = 4) -> List[Dict]:
 def get_contractor_dashboard_stats(session: Session, user_id: int) -> Dict:
     """Dohvaća statistike za contractor dashboard"""
     
-    # Dodijeljene prijave
-    assigned_issues = session.exec(
-        select(func.count(Assignment.id)).where(Assignment.contractor_id == user_id)
-    ).first() or 0
-    
-    # Prijave na lokaciji
-    on_location = session.exec(
-        select(func.count(Assignment.id))
-        .join(Issue, Issue.id == Assignment.issue_id)
-        .where(
-            and_(
-                Assignment.contractor_id == user_id,
-                Issue.status == "Na lokaciji"
-            )
-        )
-    ).first() or 0
-    
-    # Prijave u toku
-    in_progress = session.exec(
-        select(func.count(Assignment.id))
-        .join(Issue, Issue.id == Assignment.issue_id)
-        .where(
-            and_(
-                Assignment.contractor_id == user_id,
-                or_(
-                    Issue.status == "Popravka u toku",
-                    Issue.status == "Čeka dijelove"
-                )
-            )
-        )
-    ).first() or 0
-    
-    # Ukupno završene prijave
-    completed_total = session.exec(
-        select(func.count(Assignment.id))
-        .join(Issue, Issue.id == Assignment.issue_id)
-        .where(
-            and_(
-                Assignment.contractor_id == user_id,
-                Issue.status == "Završeno"
-            )
-        )
-    ).first() or 0
+    # Brojači izvođača broje njegove assignment-e po statusu prijave
+    counts = get_status_counts(session, CONTRACTOR_SCOPE, user_id)
     
     return {
-        "assigned_issues": assigned_issues,
-        "on_location": on_location,
-        "in_progress": in_progress,
-        "completed_total": completed_total
+        # Dodijeljene prijave
+        "assigned_issues": sum(counts.values()),
+        # Prijave na lokaciji
+        "on_location": counts.get("Na lokaciji", 0),
+        # Prijave u toku
+        "in_progress": counts.get("Popravka u toku", 0) + counts.get("Čeka dijelove", 0),
+        # Ukupno završene prijave
+        "completed_total": counts.get("Završeno", 0)
     }
 
 def get_contractor_assigned_issues(session: Session, user_id: int, limit: int = 3) -> List[Dict]:
@@ -1,8 +1,17 @@
-from sqlmodel import Session, select, delete, func
+from sqlmodel import Session, select, delete, func, and_, or_
+from sqlalchemy import extract, insert
 from sqlalchemy.orm import selectinload
-from models import Issue, IssueImage, IssueCategory, Comment, Rating, Assignment, Survey, AssignmentImage, AssignmentDocument, User
+from models import Issue, IssueImage, IssueCategory, Comment, Rating, Assignment, Survey, AssignmentImage, AssignmentDocument, User, IssueStatusHistory
+from repositories.issue_search_repository import apply_issue_search, issue_search_rank
 from typing import List, Optional, Dict
+from datetime import datetime
 from schemas.issue_schema import HistoryStats
+from repositories.issue_status_counter_repository import adjust_status_counters
+import base64
+import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 def create_issue(session: Session, issue: Issue) -> Issue:
     session.add(issue)
@@ -10,11 +19,11 @@ def create_issue(session: Session, issue: Issue) -> Issue:
     session.refresh(issue)
     return issue
 
-def add_issue_image(session: Session, image: IssueImage) -> IssueImage:
-    session.add(image)
-    session.commit()
-    session.refresh(image)
-    return image
+def add_issue_images(session: Session, issue_id: int, image_urls: List[str]) -> None:
+    """Jedan bulk INSERT za sve slike prijave; commit radi pozivalac (ista transakcija kao i prijava)"""
+    if not image_urls:
+        return
+    session.execute(insert(IssueImage), [{"issue_id": issue_id, "image_url": url} for url in image_urls])
 
 def get_issue_categories(session: Session) -> List[IssueCategory]:
     statement = select(IssueCategory)
@@ -26,26 +35,14 @@ def get_issues_for_user(session: Session, user_id: int, filters: Dict = {}) -> L
         statement = statement.where(Issue.status == filters["status"])
     if filters.get("category"):
         statement = statement.join(Issue.category).where(IssueCategory.name == filters["category"])
-    if filters.get("search"):
-        search = f"%{filters['search']}%"
-        statement = statement.where(
-            (Issue.title.ilike(search)) |
-            (Issue.description.ilike(search)) |
-            (Issue.location.ilike(search))
-        )
+    statement = apply_issue_search(session, statement, filters.get("search"))
+    # Kod pretrage najrelevantniji rezultati idu prvi
+    rank = issue_search_rank(session, filters.get("search"))
+    if rank is not None:
+        statement = statement.order_by(rank.desc(), Issue.created_at.desc())
     
     return list(session.exec(statement))
 
-def update_issue_status(session: Session, issue_id: int, new_status: str) -> Issue:
-    issue = session.get(Issue, issue_id)
-    if not issue:
-        return None
-    issue.status = new_status
-    session.add(issue)
-    session.commit()
-    session.refresh(issue)
-    return issue
-
 def update_issue(session: Session, issue: Issue, **kwargs) -> Issue:
     for key, value in kwargs.items():
         setattr(issue, key, value)
@@ -63,15 +60,37 @@ def delete_issue(session: Session, issue: Issue) -> None:
     session.exec(delete(Rating).where(Rating.issue_id == issue.id))
     # Delete related surveys
     session.exec(delete(Survey).where(Survey.issue_id == issue.id))
+    # Delete status history
+    session.exec(delete(IssueStatusHistory).where(IssueStatusHistory.issue_id == issue.id))
     # Delete related assignments and their images/documents
     assignments = list(session.exec(select(Assignment).where(Assignment.issue_id == issue.id)))
     for assignment in assignments:
         session.exec(delete(AssignmentImage).where(AssignmentImage.assignment_id == assignment.id))
         session.exec(delete(AssignmentDocument).where(AssignmentDocument.assignment_id == assignment.id))
         session.delete(assignment)
+    adjust_status_counters(session, issue.tenant_id, [a.contractor_id for a in assignments], issue.status, None)
     session.delete(issue)
     session.commit()
 
+def _apply_history_filters(session: Session, statement, filters: dict):
+    """Primjenjuje filtere historije prijava na dati statement (koristi se i za count i za stranicu)"""
+    statement = apply_issue_search(session, statement, filters.get("search"))
+    if filters.get("category"):
+        statement = statement.join(Issue.category).where(IssueCategory.name == filters["category"])
+    if filters.get("status"):
+        statement = statement.where(Issue.status == filters["status"])
+    if filters.get("date_from"):
+        statement = statement.where(Issue.created_at >= filters["date_from"])
+    if filters.get("date_to"):
+        statement = statement.where(Issue.created_at <= filters["date_to"])
+    return statement
+
+def count_user_issue_history(session: Session, user_id: int, filters: dict) -> int:
+    """Broji prijave korisnika sa istim filterima kao historija, bez učitavanja redova"""
+    statement = select(func.count(Issue.id)).where(Issue.tenant_id == user_id)
+    statement = _apply_history_filters(session, statement, filters)
+    return session.exec(statement).first() or 0
+
 def get_user_issue_history(
     session: Session,
     user_id: int,
@@ -79,122 +98,82 @@ def get_user_issue_history(
     page: int = 1,
     page_size: int = 10
 ):
-    from sqlalchemy.orm import selectinload
-    
+    # Ukupan broj se računa u bazi (SELECT count(*)), a dohvata se samo tražena stranica
+    total = count_user_issue_history(session, user_id, filters)
+
     statement = select(Issue).options(
         selectinload(Issue.category),
         selectinload(Issue.assignments).selectinload(Assignment.contractor)
     ).where(Issue.tenant_id == user_id)
-    
-    if filters.get("search"):
-        search = f"%{filters['search']}%"
-        statement = statement.where(
-            (Issue.title.ilike(search)) |
-            (Issue.description.ilike(search)) |
-            (Issue.location.ilike(search))
-        )
-    if filters.get("category"):
-        statement = statement.join(Issue.category).where(IssueCategory.name == filters["category"])
-    if filters.get("status"):
-        statement = statement.where(Issue.status == filters["status"])
-    if filters.get("date_from"):
-        statement = statement.where(Issue.created_at >= filters["date_from"])
-    if filters.get("date_to"):
-        statement = statement.where(Issue.created_at <= filters["date_to"])
-    # Sorting
+    statement = _apply_history_filters(session, statement, filters)
+
+    # Sorting (Issue.id kao tie-breaker da bi stranice bile stabilne)
     sort_by = filters.get("sort_by", "created_at_desc")
-    if sort_by == "created_at_asc":
-        statement = statement.order_by(Issue.created_at.asc())
-    elif sort_by == "created_at_desc":
-        statement = statement.order_by(Issue.created_at.desc())
+    rank = issue_search_rank(session, filters.get("search")) if sort_by == "relevance" else None
+    if rank is not None:
+        statement = statement.order_by(rank.desc(), Issue.created_at.desc(), Issue.id.desc())
+    elif sort_by == "created_at_asc":
+        statement = statement.order_by(Issue.created_at.asc(), Issue.id.asc())
     elif sort_by == "status_created_desc":
         # Sortiraj po statusu (Završeno prvi), pa po datumu
         statement = statement.order_by(
             Issue.status.desc(),  # Završeno će biti prvi
-            Issue.created_at.desc()
+            Issue.created_at.desc(),
+            Issue.id.desc()
         )
     else:
-        # Default sortiranje
-        statement = statement.order_by(Issue.created_at.desc())
-    # Get all issues for total count
-    all_issues = session.exec(statement).all()
-    total = len(all_issues)
-    
-    # Debug logging
-    print(f"DEBUG REPO: User {user_id} has {total} total issues")
-    print(f"DEBUG REPO: Page {page}, page_size {page_size}")
-    print(f"DEBUG REPO: Issues IDs: {[issue.id for issue in all_issues]}")
-    print(f"DEBUG REPO: Issues statuses: {[issue.status for issue in all_issues]}")
-    print(f"DEBUG REPO: Filters applied: {filters}")
-    
-    # Specifičan debug za "Završeno" status
-    completed_issues = [issue for issue in all_issues if issue.status == "Završeno"]
-    print(f"DEBUG REPO: Found {len(completed_issues)} issues with 'Završeno' status")
-    for issue in completed_issues:
-        print(f"DEBUG REPO: Completed issue - ID: {issue.id}, Title: {issue.title}, Status: {issue.status}")
-    
+        # Default sortiranje (created_at_desc)
+        statement = statement.order_by(Issue.created_at.desc(), Issue.id.desc())
+
     # Pagination
-    issues = all_issues[(page-1)*page_size:page*page_size]
-    print(f"DEBUG REPO: Returning {len(issues)} issues for this page")
-    print(f"DEBUG REPO: Returning issues statuses: {[issue.status for issue in issues]}")
-    
-    # Provjeri da li su "Završeno" issue-i u paginaciji
-    completed_in_page = [issue for issue in issues if issue.status == "Završeno"]
-    print(f"DEBUG REPO: Completed issues in current page: {len(completed_in_page)}")
-    
+    offset = (page - 1) * page_size
+    statement = statement.offset(offset).limit(page_size)
+    issues = list(session.exec(statement))
+
+    logger.debug(
+        "Historija prijava dohvaćena",
+        extra={"user_id": user_id, "page": page, "page_size": page_size, "total": total, "returned": len(issues)}
+    )
+
     return issues, total
 
 def get_user_issue_history_stats(session: Session, user_id: int):
-    from models import Rating
-    from sqlalchemy import func
+    is_completed = Issue.status == "Završeno"
     
-    # Broj ukupnih prijava
-    total_issues = session.exec(select(func.count(Issue.id)).where(Issue.tenant_id == user_id)).first() or 0
-    
-    # Broj prijava po statusu
-    completed_issues = session.exec(
-        select(func.count(Issue.id)).where(Issue.tenant_id == user_id, Issue.status == "Završeno")
-    ).first() or 0
-    
-    rejected_issues = session.exec(
-        select(func.count(Issue.id)).where(Issue.tenant_id == user_id, Issue.status == "Otkazano")
-    ).first() or 0
+    # Prosječna ocjena (podupit, ide u istom upitu)
+    avg_rating = (
+        select(func.avg(Rating.score))
+        .where(Rating.tenant_id == user_id)
+        .scalar_subquery()
+    )
     
-    in_progress_issues = session.exec(
-        select(func.count(Issue.id)).where(
-            Issue.tenant_id == user_id, 
-            Issue.status.in_(["Dodijeljeno izvođaču", "Na lokaciji", "Popravka u toku", "Čeka dijelove"])
-        )
-    ).first() or 0
+    # Svi brojači u jednom agregatnom upitu
+    total_issues, completed_issues, rejected_issues, in_progress_issues, avg_resolution_seconds, avg_rating = session.exec(
+        select(
+            func.count(Issue.id),
+            func.count(Issue.id).filter(is_completed),
+            func.count(Issue.id).filter(Issue.status == "Otkazano"),
+            func.count(Issue.id).filter(
+                Issue.status.in_(["Dodijeljeno izvođaču", "Na lokaciji", "Popravka u toku", "Čeka dijelove"])
+            ),
+            # Prosječno vrijeme rješavanja (sekunde) iz materijalizovanog completed_at
+            func.avg(extract("epoch", Issue.completed_at) - extract("epoch", Issue.created_at)).filter(
+                and_(is_completed, Issue.completed_at.isnot(None))
+            ),
+            avg_rating
+        ).where(Issue.tenant_id == user_id)
+    ).one()
     
     # Prosječno vrijeme rješavanja (dani)
-    resolved_issues = session.exec(
-        select(Issue)
-        .where(Issue.tenant_id == user_id, Issue.status == "Završeno")
-    ).all()
-    
-    avg_resolution_time = 0
-    if resolved_issues:
-        total_days = 0
-        for issue in resolved_issues:
-            # Ovdje bi trebalo dodati logiku za računanje vremena rješavanja
-            # Za sada koristimo fiksnu vrijednost
-            total_days += 3  # Pretpostavljam prosječno 3 dana
-        avg_resolution_time = total_days / len(resolved_issues)
-    
-    # Prosječna ocjena
-    avg_rating = session.exec(
-        select(func.avg(Rating.score))
-        .where(Rating.tenant_id == user_id)
-    ).first() or 0
+    avg_resolution_time = float(avg_resolution_seconds) / 86400 if avg_resolution_seconds is not None else 0
     
     return {
-        "totalIssues": total_issues,
-        "completedIssues": completed_issues,
-        "rejectedIssues": rejected_issues,
-        "inProgressIssues": in_progress_issues,
+        "totalIssues": total_issues or 0,
+        "completedIssues": completed_issues or 0,
+        "rejectedIssues": rejected_issues or 0,
+        "inProgressIssues": in_progress_issues or 0,
         "averageResolutionTime": round(avg_resolution_time, 1),
-        "averageRating": round(avg_rating, 2) if avg_rating else 0
+        "averageRating": round(float(avg_rating), 2) if avg_rating else 0
     }
 
 def get_issues_for_manager(session: Session, filters: dict, page: int = 1, page_size: int = 10):
@@ -202,13 +181,7 @@ def get_issues_for_manager(session: Session, filters: dict, page: int = 1, page_
     statement = select(Issue.id).where(Issue.status == "Primljeno")
     
     # Dodaj filtere
-    if filters.get("search"):
-        search = f"%{filters['search']}%"
-        statement = statement.where(
-            (Issue.title.ilike(search)) |
-            (Issue.description.ilike(search)) |
-            (Issue.location.ilike(search))
-        )
+    statement = apply_issue_search(session, statement, filters.get("search"))
     
     if filters.get("category"):
         statement = statement.join(Issue.category).where(IssueCategory.name == filters["category"])
@@ -262,7 +235,81 @@ def get_issues_for_manager(session: Session, filters: dict, page: int = 1, page_
     
     return issues 
 
-def get_issues_for_manager_simple(session: Session, filters: dict, page: int = 1, page_size: int = 10):
+# Keyset (cursor) paginacija za upravničke liste - ključ je (created_at, id) ili (title, id)
+MANAGER_SORT_KEYS = {
+    "created_at_asc": ("created_at", False),
+    "created_at_desc": ("created_at", True),
+    "title_asc": ("title", False),
+    "title_desc": ("title", True),
+}
+
+def encode_manager_cursor(sort_by: str, last_issue) -> str:
+    """Kreira neprozirni cursor iz posljednjeg issue-a na stranici (ORM objekat ili dict)"""
+    if sort_by not in MANAGER_SORT_KEYS:
+        sort_by = "created_at_desc"
+    column, _ = MANAGER_SORT_KEYS[sort_by]
+    get = last_issue.get if isinstance(last_issue, dict) else lambda key: getattr(last_issue, key)
+    value = get(column)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"s": sort_by, "v": value, "id": get("id")}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def decode_manager_cursor(cursor: str, sort_by: str) -> Optional[Dict]:
+    """Dekodira cursor; prazan cursor znači prvu stranicu. Baca ValueError za neispravan cursor."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        column, _ = MANAGER_SORT_KEYS[payload["s"]]
+        value = datetime.fromisoformat(payload["v"]) if column == "created_at" else str(payload["v"])
+        last_id = int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Neispravan cursor.")
+    if payload["s"] != (sort_by if sort_by in MANAGER_SORT_KEYS else "created_at_desc"):
+        raise ValueError("Cursor ne odgovara odabranom sortiranju.")
+    return {"value": value, "id": last_id}
+
+def _apply_manager_order(session: Session, statement, filters: dict, page: int, page_size: int, cursor: Optional[str] = None):
+    """Dodaje sortiranje i paginaciju; sa cursorom koristi keyset umjesto OFFSET-a"""
+    sort_by = filters.get("sort_by", "created_at_desc")
+    rank = issue_search_rank(session, filters.get("search")) if sort_by == "relevance" else None
+    if cursor is None and rank is not None:
+        # Rangiranje po relevantnosti podržava samo OFFSET paginaciju
+        statement = statement.order_by(rank.desc(), Issue.created_at.desc(), Issue.id.desc())
+        return statement.offset((page - 1) * page_size).limit(page_size)
+    if cursor is None and sort_by not in MANAGER_SORT_KEYS:
+        # Nepoznat sort bez cursora - zadrži staro ponašanje (bez sortiranja)
+        return statement.offset((page - 1) * page_size).limit(page_size)
+
+    column_name, descending = MANAGER_SORT_KEYS.get(sort_by, MANAGER_SORT_KEYS["created_at_desc"])
+    column = getattr(Issue, column_name)
+    if descending:
+        statement = statement.order_by(column.desc(), Issue.id.desc())
+    else:
+        statement = statement.order_by(column.asc(), Issue.id.asc())
+
+    if cursor is None:
+        # Pagination
+        offset = (page - 1) * page_size
+        return statement.offset(offset).limit(page_size)
+
+    last = decode_manager_cursor(cursor, sort_by)
+    if last:
+        if descending:
+            statement = statement.where(or_(
+                column < last["value"],
+                and_(column == last["value"], Issue.id < last["id"])
+            ))
+        else:
+            statement = statement.where(or_(
+                column > last["value"],
+                and_(column == last["value"], Issue.id > last["id"])
+            ))
+    return statement.limit(page_size)
+
+def get_issues_for_manager_simple(session: Session, filters: dict, page: int = 1, page_size: int = 10, cursor: Optional[str] = None):
     """Jednostavnija verzija koja direktno dohvata sve podatke"""
     statement = select(Issue).where(Issue.status == "Primljeno")
     
@@ -274,13 +321,7 @@ def get_issues_for_manager_simple(session: Session, filters: dict, page: int = 1
     )
     
     # Dodaj filtere
-    if filters.get("search"):
-        search = f"%{filters['search']}%"
-        statement = statement.where(
-            (Issue.title.ilike(search)) |
-            (Issue.description.ilike(search)) |
-            (Issue.location.ilike(search))
-        )
+    statement = apply_issue_search(session, statement, filters.get("search"))
     
     
     if filters.get("category"):
@@ -292,29 +333,15 @@ def get_issues_for_manager_simple(session: Session, filters: dict, page: int = 1
     if filters.get("date_to"):
         statement = statement.where(Issue.created_at <= filters["date_to"])
     
-    # Sorting
-    sort_by = filters.get("sort_by", "created_at_desc")
-    if sort_by == "created_at_asc":
-        statement = statement.order_by(Issue.created_at.asc())
-    elif sort_by == "created_at_desc":
-        statement = statement.order_by(Issue.created_at.desc())
-    elif sort_by == "title_asc":
-        statement = statement.order_by(Issue.title.asc())
-    elif sort_by == "title_desc":
-        statement = statement.order_by(Issue.title.desc())
-    
-    # Pagination
-    offset = (page - 1) * page_size
-    statement = statement.offset(offset).limit(page_size)
+    # Sorting i paginacija (OFFSET ili keyset cursor)
+    statement = _apply_manager_order(session, statement, filters, page, page_size, cursor)
     
     issues = list(session.exec(statement))
     
     return issues
 
-def get_issues_for_manager_complete(session: Session, filters: dict, page: int = 1, page_size: int = 10):
+def get_issues_for_manager_complete(session: Session, filters: dict, page: int = 1, page_size: int = 10, cursor: Optional[str] = None):
     """Dohvata sve issue-e koji NISU statusa 'Primljeno'"""
-    print(f"DEBUG: get_issues_for_manager_complete called with filters: {filters}, page: {page}, page_size: {page_size}")
-
     statement = select(Issue)
 
     # Dodaj relacije
@@ -331,13 +358,7 @@ def get_issues_for_manager_complete(session: Session, filters: dict, page: int =
     if filters.get("status") and filters["status"] != "all":
         statement = statement.where(Issue.status == filters["status"])
 
-    if filters.get("search"):
-        search = f"%{filters['search']}%"
-        statement = statement.where(
-            (Issue.title.ilike(search)) |
-            (Issue.description.ilike(search)) |
-            (Issue.location.ilike(search))
-        )
+    statement = apply_issue_search(session, statement, filters.get("search"))
 
     if filters.get("address"):
         address = f"%{filters['address']}%"
@@ -357,29 +378,13 @@ def get_issues_for_manager_complete(session: Session, filters: dict, page: int =
     if filters.get("date_to"):
         statement = statement.where(Issue.created_at <= filters["date_to"])
 
-    # Sorting
-    sort_by = filters.get("sort_by", "created_at_desc")
-    if sort_by == "created_at_asc":
-        statement = statement.order_by(Issue.created_at.asc())
-    elif sort_by == "created_at_desc":
-        statement = statement.order_by(Issue.created_at.desc())
-    elif sort_by == "title_asc":
-        statement = statement.order_by(Issue.title.asc())
-    elif sort_by == "title_desc":
-        statement = statement.order_by(Issue.title.desc())
-
-    # Pagination
-    offset = (page - 1) * page_size
-    statement = statement.offset(offset).limit(page_size)
-    print(f"DEBUG: SQL offset: {offset}, limit: {page_size}")
-
-    print(f"DEBUG: Final SQL statement: {statement}")
+    # Sorting i paginacija (OFFSET ili keyset cursor)
+    statement = _apply_manager_order(session, statement, filters, page, page_size, cursor)
 
     issues = list(session.exec(statement))
-    print(f"DEBUG: Repository returned {len(issues)} issues")
-
-    # Debug: ispiši prvih nekoliko issue-a
-    for i, issue in enumerate(issues[:3]):
-        print(f"DEBUG: Repository Issue {i+1}: ID={issue.id}, Status={issue.status}, Title={issue.title}")
+    logger.debug(
+        "Upravnički red prijava dohvaćen",
+        extra={"filters": filters, "page": page, "page_size": page_size, "cursor": cursor, "returned": len(issues)}
+    )
 
     return issues
\ No newline at end of file
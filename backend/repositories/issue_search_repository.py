@@ -0,0 +1,81 @@
+from sqlmodel import Session, select, func, case
+from sqlalchemy import literal_column
+from models import Issue
+from typing import Optional
+import re
+
+# Pretraga prijava po naslovu, opisu i lokaciji.
+# Na PostgreSQL-u se koristi full-text pretraga nad izrazom koji pokriva GIN indeks
+# ix_issue_search_document (migrations/003_issue_search.sql), sa rangiranjem (ts_rank).
+# Full-text pronalazi samo početke riječi ("stru" -> "struja", ali ne "ruja"); ako u
+# pretraživanoj listi nema nijednog takvog pogotka, koristi se ILIKE nad istim tekstom
+# (podniz bilo gdje, npr. dio broja stana), koji pokriva trigram indeks
+# ix_issue_search_trgm (migrations/007_issue_search_trgm.sql).
+# Na ostalim bazama (SQLite u lokalnom radu) ostaje ILIKE nad sva tri polja.
+
+# Konfiguracija 'simple' ne radi stemming - tekst je na bosanskom, a engleski
+# stemmer bi kvario riječi. Konstante se renderuju kao literali da bi izraz
+# u upitu bio identičan izrazu u indeksu bez obzira na drajver.
+SEARCH_CONFIG = literal_column("'simple'")
+
+def is_postgres(session: Session) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+def search_text():
+    """title/description/location spojeni u jedan tekst (mora odgovarati izrazima indeksa iz migracija)"""
+    empty = literal_column("''")
+    space = literal_column("' '")
+    return (
+        func.coalesce(Issue.title, empty).op("||")(space)
+        .op("||")(func.coalesce(Issue.description, empty)).op("||")(space)
+        .op("||")(func.coalesce(Issue.location, empty))
+    )
+
+def search_document():
+    """tsvector izraz nad title/description/location (ix_issue_search_document)"""
+    return func.to_tsvector(SEARCH_CONFIG, search_text())
+
+def build_tsquery(search: str) -> Optional[str]:
+    """Pretvara korisnički unos u prefiks tsquery ('kvar vod' -> 'kvar:* & vod:*')"""
+    terms = re.findall(r"\w+", search.lower())
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+def _ilike_condition(search: str):
+    pattern = f"%{search}%"
+    return (
+        (Issue.title.ilike(pattern)) |
+        (Issue.description.ilike(pattern)) |
+        (Issue.location.ilike(pattern))
+    )
+
+def apply_issue_search(session: Session, statement, search: Optional[str]):
+    """Dodaje uslov pretrage na statement; prazan unos ne mijenja upit.
+
+    Na PostgreSQL-u jedan EXISTS upit (GIN indeks) provjerava da li full-text nalazi
+    išta među prijavama statement-a (filteri dodani prije pretrage); ako ne nalazi,
+    pretraga je ILIKE podniz nad search_text() (trigram indeks).
+    """
+    if not search:
+        return statement
+    if not is_postgres(session):
+        return statement.where(_ilike_condition(search))
+    tsquery = build_tsquery(search)
+    if tsquery is not None:
+        match = search_document().op("@@")(func.to_tsquery(SEARCH_CONFIG, tsquery))
+        if session.exec(select(statement.where(match).exists())).first():
+            return statement.where(match)
+    return statement.where(search_text().ilike(f"%{search}%"))
+
+def issue_search_rank(session: Session, search: Optional[str]):
+    """Izraz za rangiranje rezultata pretrage (veće = relevantnije); None bez pretrage"""
+    if not search:
+        return None
+    # Pogodak u naslovu je relevantniji od pogotka u opisu/lokaciji
+    title_hit = case((Issue.title.ilike(f"%{search}%"), 1), else_=0)
+    tsquery = build_tsquery(search) if is_postgres(session) else None
+    if tsquery is None:
+        return title_hit
+    # Kod ILIKE fallback-a je ts_rank 0 za sve redove, pa redoslijed određuje title_hit
+    return func.ts_rank(search_document(), func.to_tsquery(SEARCH_CONFIG, tsquery)) + title_hit
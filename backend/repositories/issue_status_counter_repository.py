@@ -0,0 +1,114 @@
+from sqlmodel import Session, select, delete, func, literal
+from sqlalchemy import insert, text
+from sqlalchemy.dialects import postgresql, sqlite
+from models import IssueStatusCounter, Issue, Assignment
+from typing import Dict, Iterable, List, Optional, Tuple
+from dashboard_cache import mark_dashboard_stale
+
+# Brojači se mijenjaju atomskim upsert-om (count = count + delta) u transakciji
+# pozivaoca, pa su uvijek usklađeni sa commit-ovanim statusima prijava.
+# rebuild_status_counters ih ponovo računa iz issue/assignment tabela.
+
+GLOBAL_SCOPE = "global"
+TENANT_SCOPE = "tenant"
+CONTRACTOR_SCOPE = "contractor"
+
+# Ključ za pg_try_advisory_xact_lock - samo jedna rekoncilijacija istovremeno
+REBUILD_LOCK_KEY = 7_402_311
+
+CounterKey = Tuple[str, int, str]
+
+def _apply_deltas(session: Session, deltas: Dict[CounterKey, int]) -> None:
+    """Sve promjene jednim INSERT ... ON CONFLICT, sa ključevima u sortiranom redoslijedu.
+
+    Redovi se zaključavaju redom kojim su navedeni, pa uvijek isti poredak sprječava
+    deadlock između suprotnih prelaza (A->B i B->A) na globalnim redovima.
+    """
+    rows = [
+        {"scope": scope, "scope_id": scope_id, "status": status, "count": delta}
+        for (scope, scope_id, status), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+    if any(row["scope"] == GLOBAL_SCOPE for row in rows):
+        # Globalni brojači su u kešu dashboard-a upravnika; poništava se nakon commit-a
+        mark_dashboard_stale(session)
+    dialect = session.get_bind().dialect.name
+    dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    statement = dialect_insert(IssueStatusCounter).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["scope", "scope_id", "status"],
+        set_={"count": IssueStatusCounter.count + statement.excluded.count}
+    )
+    session.execute(statement)
+
+def adjust_status_counters(
+    session: Session,
+    tenant_id: int,
+    contractor_ids: Iterable[int],
+    old_status: Optional[str],
+    new_status: Optional[str],
+    added_contractor_ids: Iterable[int] = ()
+) -> None:
+    """Prebacuje jednu prijavu iz old_status u new_status (None = prijava nastaje/nestaje); bez commit-a.
+
+    added_contractor_ids su izvođači čiji se assignment dodaje u istoj transakciji;
+    oni dobijaju samo +1 za new_status.
+    """
+    deltas: Dict[CounterKey, int] = {}
+    if old_status != new_status:
+        scopes = [(GLOBAL_SCOPE, 0), (TENANT_SCOPE, tenant_id)] + [(CONTRACTOR_SCOPE, contractor_id) for contractor_id in contractor_ids]
+        for scope, scope_id in scopes:
+            if old_status is not None:
+                deltas[(scope, scope_id, old_status)] = deltas.get((scope, scope_id, old_status), 0) - 1
+            if new_status is not None:
+                deltas[(scope, scope_id, new_status)] = deltas.get((scope, scope_id, new_status), 0) + 1
+    if new_status is not None:
+        for contractor_id in added_contractor_ids:
+            key = (CONTRACTOR_SCOPE, contractor_id, new_status)
+            deltas[key] = deltas.get(key, 0) + 1
+    _apply_deltas(session, deltas)
+
+def get_issue_contractor_ids(session: Session, issue_id: int) -> List[int]:
+    return list(session.exec(select(Assignment.contractor_id).where(Assignment.issue_id == issue_id)))
+
+def get_status_counts(session: Session, scope: str, scope_id: int = 0) -> Dict[str, int]:
+    """Svi brojači jednog scope-a (range scan po primarnom ključu)"""
+    statement = select(IssueStatusCounter.status, IssueStatusCounter.count).where(
+        IssueStatusCounter.scope == scope,
+        IssueStatusCounter.scope_id == scope_id
+    )
+    return {status: count for status, count in session.exec(statement)}
+
+def rebuild_status_counters(session: Session) -> bool:
+    """Briše i ponovo računa sve brojače iz izvornih tabela, u jednoj transakciji.
+
+    Na PostgreSQL-u vraća False (bez izmjena) ako rekoncilijacija već radi u drugom
+    procesu. Tabela se zaključava za pisanje, pa upsert-i iz istovremenih promjena
+    statusa čekaju kraj rekoncilijacije i primjenjuju se na nove vrijednosti.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        acquired = session.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": REBUILD_LOCK_KEY}).scalar()
+        if not acquired:
+            session.rollback()
+            return False
+        session.execute(text("LOCK TABLE issue_status_counter IN EXCLUSIVE MODE"))
+    columns = ["scope", "scope_id", "status", "count"]
+    session.exec(delete(IssueStatusCounter))
+    session.execute(insert(IssueStatusCounter).from_select(columns, (
+        select(literal(GLOBAL_SCOPE), literal(0), Issue.status, func.count(Issue.id))
+        .group_by(Issue.status)
+    )))
+    session.execute(insert(IssueStatusCounter).from_select(columns, (
+        select(literal(TENANT_SCOPE), Issue.tenant_id, Issue.status, func.count(Issue.id))
+        .group_by(Issue.tenant_id, Issue.status)
+    )))
+    session.execute(insert(IssueStatusCounter).from_select(columns, (
+        select(literal(CONTRACTOR_SCOPE), Assignment.contractor_id, Issue.status, func.count(Assignment.id))
+        .join(Issue, Issue.id == Assignment.issue_id)
+        .group_by(Assignment.contractor_id, Issue.status)
+    )))
+    mark_dashboard_stale(session)
+    session.commit()
+    return True
@@ -0,0 +1,45 @@
+from sqlmodel import Session, select
+from models import Issue, IssueStatusHistory
+from typing import List, Optional
+from datetime import datetime
+from repositories.issue_status_counter_repository import adjust_status_counters, get_issue_contractor_ids
+
+def record_status_change(
+    session: Session,
+    issue: Issue,
+    new_status: str,
+    changed_by_id: Optional[int] = None,
+    added_contractor_id: Optional[int] = None
+) -> Optional[IssueStatusHistory]:
+    """Mijenja status issue-a i upisuje promjenu u historiju.
+
+    Ne radi commit - pozivalac commit-uje zajedno sa ostalim izmjenama (ista transakcija).
+    added_contractor_id je izvođač čiji assignment pozivalac dodaje nakon ovog poziva.
+    """
+    old_status = issue.status
+    added = [added_contractor_id] if added_contractor_id is not None else []
+    if old_status == new_status:
+        if added:
+            adjust_status_counters(session, issue.tenant_id, [], new_status, new_status, added)
+        return None
+    issue.status = new_status
+    # completed_at se materijalizuje na issue-u da bi vrijeme rješavanja bilo jeftin agregat
+    if new_status == "Završeno":
+        issue.completed_at = datetime.utcnow()
+    else:
+        issue.completed_at = None
+    entry = IssueStatusHistory(
+        issue_id=issue.id,
+        old_status=old_status,
+        new_status=new_status,
+        changed_by_id=changed_by_id
+    )
+    session.add(issue)
+    session.add(entry)
+    # Materijalizovani brojači po statusu se mijenjaju u istoj transakciji
+    adjust_status_counters(session, issue.tenant_id, get_issue_contractor_ids(session, issue.id), old_status, new_status, added)
+    return entry
+
+def get_status_history_for_issue(session: Session, issue_id: int) -> List[IssueStatusHistory]:
+    statement = select(IssueStatusHistory).where(IssueStatusHistory.issue_id == issue_id).order_by(IssueStatusHistory.changed_at.asc())
+    return list(session.exec(statement))
@@ -1,6 +1,6 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update, and_, or_, func
 from models import Notification, Issue
-from typing import List
+from typing import List, Optional, Tuple
 
 def create_notification(session: Session, notification: Notification) -> Notification:
     session.add(notification)
@@ -8,10 +8,40 @@ def create_notification(session: Session, notification: Notification) -> Notific
     session.refresh(notification)
     return notification
 
-def get_notifications_for_user(session: Session, user_id: int) -> List[Notification]:
-    statement = select(Notification).where(Notification.user_id == user_id).order_by(Notification.created_at.desc())
+def get_notifications_for_user(
+    session: Session,
+    user_id: int,
+    limit: Optional[int] = None,
+    before_id: Optional[int] = None,
+    unread_only: bool = False
+) -> List[Tuple[Notification, Optional[str]]]:
+    """Notifikacije korisnika zajedno sa naslovom prijave, jednim upitom (LEFT JOIN na issue)"""
+    statement = (
+        select(Notification, Issue.title)
+        .outerjoin(Issue, Issue.id == Notification.issue_id)
+        .where(Notification.user_id == user_id)
+    )
+    if unread_only:
+        statement = statement.where(Notification.is_read == False)
+    if before_id is not None:
+        # Keyset paginacija: samo notifikacije starije od notifikacije before_id
+        anchor = select(Notification.created_at).where(Notification.id == before_id).scalar_subquery()
+        statement = statement.where(or_(
+            Notification.created_at < anchor,
+            and_(Notification.created_at == anchor, Notification.id < before_id)
+        ))
+    statement = statement.order_by(Notification.created_at.desc(), Notification.id.desc())
+    if limit is not None:
+        statement = statement.limit(limit)
     return list(session.exec(statement))
 
+def count_unread_notifications(session: Session, user_id: int) -> int:
+    # Uslov odgovara parcijalnom indeksu ix_notification_user_id_unread
+    statement = select(func.count()).select_from(Notification).where(
+        Notification.user_id == user_id, Notification.is_read == False
+    )
+    return session.exec(statement).first() or 0
+
 def mark_notification_as_read(session: Session, notification_id: int, user_id: int) -> Notification:
     notification = session.get(Notification, notification_id)
     if not notification or notification.user_id != user_id:
@@ -22,11 +52,14 @@ def mark_notification_as_read(session: Session, notification_id: int, user_id: i
     session.refresh(notification)
     return notification
 
-def mark_all_notifications_as_read(session: Session, user_id: int):
-    statement = select(Notification).where(Notification.user_id == user_id, Notification.is_read == False)
-    notifications = list(session.exec(statement))
-    for notification in notifications:
-        notification.is_read = True
-        session.add(notification)
+def mark_all_notifications_as_read(session: Session, user_id: int) -> List[int]:
+    """Označava sve nepročitane notifikacije jednim UPDATE ... RETURNING id; vraća ID-eve"""
+    statement = (
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read == False)
+        .values(is_read=True)
+        .returning(Notification.id)
+    )
+    ids = list(session.exec(statement).scalars())
     session.commit()
-    return notifications 
\ No newline at end of file
+    return ids
@@ -1,6 +1,6 @@
 from sqlmodel import Session, select
 from models import Rating
-from typing import Optional
+from typing import Optional, List, Dict
 
 def create_or_update_rating(session: Session, issue_id: int, tenant_id: int, score: int, comment: Optional[str] = None) -> Rating:
     statement = select(Rating).where(Rating.issue_id == issue_id, Rating.tenant_id == tenant_id)
@@ -17,4 +17,11 @@ def create_or_update_rating(session: Session, issue_id: int, tenant_id: int, sco
 
 def get_rating_for_issue_and_user(session: Session, issue_id: int, tenant_id: int) -> Optional[Rating]:
     statement = select(Rating).where(Rating.issue_id == issue_id, Rating.tenant_id == tenant_id)
-    return session.exec(statement).first() 
\ No newline at end of file
+    return session.exec(statement).first()
+
+def get_ratings_for_issues(session: Session, issue_ids: List[int], tenant_id: int) -> Dict[int, int]:
+    """Ocjene stanara za više issue-a odjednom (jedan IN upit)"""
+    if not issue_ids:
+        return {}
+    statement = select(Rating.issue_id, Rating.score).where(Rating.issue_id.in_(issue_ids), Rating.tenant_id == tenant_id)
+    return {issue_id: score for issue_id, score in session.exec(statement)}
@@ -1,6 +1,7 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, func
 from models import Survey, User
 from typing import List, Optional
+from datetime import datetime
 
 def create_survey(session: Session, survey_data: dict) -> Survey:
     """Kreira novu survey prijavu"""
@@ -24,35 +25,40 @@ def get_survey_by_id(session: Session, survey_id: int) -> Optional[Survey]:
     """Dohvaća survey po ID-u"""
     return session.get(Survey, survey_id)
 
-def get_survey_stats(session: Session) -> dict:
-    """Dohvaća statistike survey prijava"""
-    from sqlmodel import func
-    
-    # Ukupno prijava
-    total_surveys = session.exec(select(func.count(Survey.id))).first() or 0
-    
-    # Po nivoima zadovoljstva
-    satisfaction_stats = {}
-    satisfaction_levels = ["vrlo_zadovoljan", "zadovoljan", "neutralan", "nezadovoljan", "vrlo_nezadovoljan"]
-    
-    for level in satisfaction_levels:
-        count = session.exec(
-            select(func.count(Survey.id)).where(Survey.satisfaction_level == level)
-        ).first() or 0
-        satisfaction_stats[level] = count
-    
-    # Po kategorijama
-    category_stats = {}
-    categories = ["voda", "struja", "grijanje", "lift", "sigurnost", "čistoća", "komunikacija", "ostalo"]
+# Poznate vrijednosti iz forme; uvijek su u odgovoru (i sa 0), a vrijednosti van
+# ovih lista se prikazuju dodatno umjesto da se ignorišu
+SATISFACTION_LEVELS = ["vrlo_zadovoljan", "zadovoljan", "neutralan", "nezadovoljan", "vrlo_nezadovoljan"]
+SURVEY_CATEGORIES = ["voda", "struja", "grijanje", "lift", "sigurnost", "čistoća", "komunikacija", "ostalo"]
+
+def get_survey_stats(session: Session, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None) -> dict:
+    """Dohvaća statistike survey prijava jednim GROUP BY upitom (kategorija x nivo zadovoljstva).
+
+    date_from je uključiv, date_to isključiv. Ukupni brojevi po nivou i po kategoriji
+    su zbirovi unakrsne tabele, pa je cijena ista bez obzira na broj vrijednosti.
+    """
+    statement = (
+        select(Survey.issue_category, Survey.satisfaction_level, func.count(Survey.id))
+        .group_by(Survey.issue_category, Survey.satisfaction_level)
+    )
+    if date_from is not None:
+        statement = statement.where(Survey.created_at >= date_from)
+    if date_to is not None:
+        statement = statement.where(Survey.created_at < date_to)
     
-    for category in categories:
-        count = session.exec(
-            select(func.count(Survey.id)).where(Survey.issue_category == category)
-        ).first() or 0
-        category_stats[category] = count
+    satisfaction_stats = {level: 0 for level in SATISFACTION_LEVELS}
+    category_stats = {category: 0 for category in SURVEY_CATEGORIES}
+    crosstab = {}
+    total_surveys = 0
+    for category, level, count in session.exec(statement):
+        total_surveys += count
+        satisfaction_stats[level] = satisfaction_stats.get(level, 0) + count
+        category_stats[category] = category_stats.get(category, 0) + count
+        crosstab.setdefault(category, {level: 0 for level in SATISFACTION_LEVELS})
+        crosstab[category][level] = crosstab[category].get(level, 0) + count
     
     return {
         "total_surveys": total_surveys,
         "satisfaction_stats": satisfaction_stats,
-        "category_stats": category_stats
+        "category_stats": category_stats,
+        "category_satisfaction": crosstab
     }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, date
 from typing import Optional, List
 
 class UserRead(BaseModel):
@@ -22,8 +22,13 @@ class UserUpdate(BaseModel):
     address: Optional[str] = None
     role_id: Optional[int] = None
 
+class RegistrationBucket(BaseModel):
+    period: date  # Početak dana/sedmice
+    count: int
+
 class UserStats(BaseModel):
     total_users: int
     active_users: int
     users_by_role: dict
     recent_registrations: int
+    registrations: List[RegistrationBucket] = []
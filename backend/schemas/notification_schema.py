@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 class NotificationCreate(BaseModel):
@@ -21,4 +21,8 @@ class NotificationRead(BaseModel):
     issue_title: Optional[str] = None
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+class MarkAllReadResponse(BaseModel):
+    count: int
+    ids: List[int]
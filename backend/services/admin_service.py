@@ -2,23 +2,16 @@ from sqlmodel import Session, select
 from models.user_model import User
 from models.role_model import Role
 from repositories.admin_repository import (
-    get_all_users, get_user_by_id, update_user, delete_user, get_user_stats,
+    get_all_users, get_user_by_id, update_user, delete_user, get_user_stats, get_registration_counts,
     get_all_roles, create_role, update_role, delete_role
 )
-from schemas.admin_schema import UserRead, UserUpdate, UserStats
+from schemas.admin_schema import UserRead, UserUpdate, UserStats, RegistrationBucket
 from fastapi import HTTPException
+from auth import invalidate_role_cache
 from typing import List, Optional
+from datetime import datetime, timedelta
 
 def get_all_users_service(session: Session, admin_id: int, search: Optional[str] = None, role_id: Optional[int] = None) -> List[UserRead]:
-    # Provjera da li je korisnik admin
-    admin_user = session.get(User, admin_id)
-    if not admin_user:
-        raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
-    
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu pristupiti ovim podacima.")
-    
     users = get_all_users(session, search, role_id)
     result = []
     
@@ -37,15 +30,6 @@ def get_all_users_service(session: Session, admin_id: int, search: Optional[str]
     return result
 
 def get_user_by_id_service(session: Session, user_id: int, admin_id: int) -> UserRead:
-    # Provjera da li je korisnik admin
-    admin_user = session.get(User, admin_id)
-    if not admin_user:
-        raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
-    
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu pristupiti ovim podacima.")
-    
     user = get_user_by_id(session, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
@@ -62,15 +46,6 @@ def get_user_by_id_service(session: Session, user_id: int, admin_id: int) -> Use
     )
 
 def update_user_service(session: Session, user_id: int, data: UserUpdate, admin_id: int) -> UserRead:
-    # Provjera da li je korisnik admin
-    admin_user = session.get(User, admin_id)
-    if not admin_user:
-        raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
-    
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu mijenjati korisnike.")
-    
     # Provjera da li korisnik postoji
     user = get_user_by_id(session, user_id)
     if not user:
@@ -100,15 +75,6 @@ def update_user_service(session: Session, user_id: int, data: UserUpdate, admin_
     )
 
 def delete_user_service(session: Session, user_id: int, admin_id: int) -> dict:
-    # Provjera da li je korisnik admin
-    admin_user = session.get(User, admin_id)
-    if not admin_user:
-        raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
-    
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu brisati korisnike.")
-    
     # Provjera da li korisnik postoji
     user = get_user_by_id(session, user_id)
     if not user:
@@ -125,64 +91,44 @@ def delete_user_service(session: Session, user_id: int, admin_id: int) -> dict:
     
     return {"message": "Korisnik je uspješno obrisan."}
 
-def get_user_stats_service(session: Session, admin_id: int) -> UserStats:
-    # Provjera da li je korisnik admin
-    admin_user = session.get(User, admin_id)
-    if not admin_user:
-        raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
-    
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu pristupiti ovim podacima.")
-    
+def get_user_stats_service(session: Session, admin_id: int, interval: str = "day", days: int = 30) -> UserStats:
     stats = get_user_stats(session)
     
+    # Vremenska serija registracija; periodi bez registracija se dopunjavaju nulama
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=days - 1)
+    if interval == "week":
+        start -= timedelta(days=start.weekday())
+    counts = dict(get_registration_counts(session, datetime.combine(start, datetime.min.time()), interval))
+    step = timedelta(weeks=1) if interval == "week" else timedelta(days=1)
+    registrations = []
+    period = start
+    while period <= today:
+        registrations.append(RegistrationBucket(period=period, count=counts.get(period, 0)))
+        period += step
+    
     return UserStats(
         total_users=stats["total_users"],
         active_users=stats["total_users"],  # Za sada svi su aktivni
         users_by_role=stats["users_by_role"],
-        recent_registrations=stats["recent_registrations"]
+        recent_registrations=stats["recent_registrations"],
+        registrations=registrations
     )
 
 def get_all_roles_service(session: Session, admin_id: int) -> List[Role]:
-    # Provjera da li je korisnik admin
-    admin_user = session.get(User, admin_id)
-    if not admin_user:
-        raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
-    
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu pristupiti ovim podacima.")
-    
     return get_all_roles(session)
 
 def create_role_service(session: Session, name: str, admin_id: int) -> Role:
-    # Provjera da li je korisnik admin
-    admin_user = session.get(User, admin_id)
-    if not admin_user:
-        raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
-    
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu kreirati uloge.")
-    
     # Provjera da li uloga već postoji
     existing_role = session.exec(select(Role).where(Role.name == name)).first()
     if existing_role:
         raise HTTPException(status_code=400, detail="Uloga sa tim imenom već postoji.")
     
-    return create_role(session, name)
+    role = create_role(session, name)
+    invalidate_role_cache()
+    return role
 
 def update_role_service(session: Session, role_id: int, name: Optional[str], admin_id: int) -> Role:
-    # Provjera da li je korisnik admin
-    admin_user = session.get(User, admin_id)
-    if not admin_user:
-        raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
-    
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu mijenjati uloge.")
-    
     # Provjera da li uloga postoji
     role = session.get(Role, role_id)
     if not role:
@@ -194,18 +140,16 @@ def update_role_service(session: Session, role_id: int, name: Optional[str], adm
         if existing_role:
             raise HTTPException(status_code=400, detail="Uloga sa tim imenom već postoji.")
     
-    return update_role(session, role_id, name)
+    role = update_role(session, role_id, name)
+    invalidate_role_cache()
+    return role
 
 def delete_role_service(session: Session, role_id: int, admin_id: int) -> dict:
-    # Provjera da li je korisnik admin
+    # Uloga admina se provjerava u kontroleru; korisnik treba zbog provjere vlastite uloge ispod
     admin_user = session.get(User, admin_id)
     if not admin_user:
         raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
     
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu brisati uloge.")
-    
     # Provjera da li uloga postoji
     role = session.get(Role, role_id)
     if not role:
@@ -220,4 +164,5 @@ def delete_role_service(session: Session, role_id: int, admin_id: int) -> dict:
     if not success:
         raise HTTPException(status_code=400, detail="Ne možete obrisati ulogu koja je dodijeljena korisnicima.")
     
+    invalidate_role_cache()
     return {"message": "Uloga je uspješno obrisana."}
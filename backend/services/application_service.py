@@ -10,6 +10,9 @@ from typing import Optional
 import os
 import shutil
 from fastapi import UploadFile
+import logging
+
+logger = logging.getLogger(__name__)
 
 def save_application_file(upload_file: UploadFile, user_id: int, application_type: str) -> str:
     """Spremi fajl aplikacije u media folder"""
@@ -223,8 +226,8 @@ def get_application_status(session: Session, user_id: int) -> ApplicationStatus:
             application_type=None,
             status=None
         )
-    except Exception as e:
-        print(f"Error in get_application_status: {e}")
+    except Exception:
+        logger.exception("Greška pri dohvatanju statusa aplikacije", extra={"user_id": user_id})
         # Vrati default status ako dođe do greške
         return ApplicationStatus(
             has_pending_application=False,
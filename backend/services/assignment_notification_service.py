@@ -9,9 +9,11 @@ from repositories.assignment_notification_repository import (
 )
 from fastapi import HTTPException, status
 from schemas.assignment_notification_schema import AssignmentNotificationCreate, AssignmentNotificationRead
+from schemas.notification_schema import MarkAllReadResponse
+from notification_broker import broker, user_channel
 
-def create_new_assignment_notification(session: Session, data: AssignmentNotificationCreate) -> AssignmentNotification:
-    notification = AssignmentNotification(
+def _new_assignment_notification(data: AssignmentNotificationCreate) -> AssignmentNotification:
+    return AssignmentNotification(
         contractor_id=data.contractor_id,
         assignment_id=data.assignment_id,
         issue_id=data.issue_id,
@@ -19,7 +21,51 @@ def create_new_assignment_notification(session: Session, data: AssignmentNotific
         assigned_by=data.assigned_by,
         message=data.message,
     )
-    return create_assignment_notification(session, notification)
+
+def create_new_assignment_notification(session: Session, data: AssignmentNotificationCreate) -> AssignmentNotification:
+    notification = create_assignment_notification(session, _new_assignment_notification(data))
+    publish_assignment_notification(session, notification)
+    return notification
+
+def stage_assignment_notification(session: Session, data: AssignmentNotificationCreate) -> AssignmentNotification:
+    """Dodaje notifikaciju u sesiju bez commit-a; publish_assignment_notification se zove nakon commit-a"""
+    notification = _new_assignment_notification(data)
+    session.add(notification)
+    session.flush()
+    return notification
+
+def publish_assignment_notification(session: Session, notification: AssignmentNotification) -> None:
+    # Push otvorenim streamovima izvođača (nakon commit-a)
+    issue = session.get(Issue, notification.issue_id)
+    if issue:
+        broker.publish(user_channel(notification.contractor_id), {
+            "type": "assignment_notification",
+            "data": _to_assignment_notification_read(session, notification, issue).model_dump(mode="json")
+        })
+
+def _to_assignment_notification_read(session: Session, n: AssignmentNotification, issue: Issue) -> AssignmentNotificationRead:
+    # Dohvati kategoriju
+    category = None
+    if issue.category_id:
+        category_obj = session.get(IssueCategory, issue.category_id)
+        if category_obj:
+            category = category_obj.name.lower()
+
+    return AssignmentNotificationRead(
+        id=n.id,
+        assignmentId=n.assignment_id,
+        issueId=n.issue_id,
+        issueTitle=issue.title,
+        issueDescription=issue.description,
+        issueLocation=issue.location,
+        category=category,
+        priority="srednji",  # Default priority
+        assignedBy=n.assigned_by,
+        assignedAt=n.created_at.isoformat(),
+        isRead=n.is_read,
+        type=n.notification_type,
+        message=n.message
+    )
 
 def get_contractor_assignment_notifications(session: Session, contractor_id: int):
     notifications = get_assignment_notifications_for_contractor(session, contractor_id)
@@ -31,28 +77,7 @@ def get_contractor_assignment_notifications(session: Session, contractor_id: int
         if not issue:
             continue
             
-        # Dohvati kategoriju
-        category = None
-        if issue.category_id:
-            category_obj = session.get(IssueCategory, issue.category_id)
-            if category_obj:
-                category = category_obj.name.lower()
-        
-        result.append(AssignmentNotificationRead(
-            id=n.id,
-            assignmentId=n.assignment_id,
-            issueId=n.issue_id,
-            issueTitle=issue.title,
-            issueDescription=issue.description,
-            issueLocation=issue.location,
-            category=category,
-            priority="srednji",  # Default priority
-            assignedBy=n.assigned_by,
-            assignedAt=n.created_at.isoformat(),
-            isRead=n.is_read,
-            type=n.notification_type,
-            message=n.message
-        ))
+        result.append(_to_assignment_notification_read(session, n, issue))
     
     return result
 
@@ -62,5 +87,6 @@ def mark_assignment_notification_read(session: Session, notification_id: int, co
         raise HTTPException(status_code=404, detail="Notifikacija nije pronađena ili nemate dozvolu.")
     return notification
 
-def mark_all_assignment_notifications_read(session: Session, contractor_id: int):
-    return mark_all_assignment_notifications_as_read(session, contractor_id)
+def mark_all_assignment_notifications_read(session: Session, contractor_id: int) -> MarkAllReadResponse:
+    ids = mark_all_assignment_notifications_as_read(session, contractor_id)
+    return MarkAllReadResponse(count=len(ids), ids=ids)
@@ -1,16 +1,15 @@
-from sqlmodel import Session, select
+from sqlmodel import Session
 from sqlalchemy.orm import selectinload
 from models.assignment_model import Assignment
 from models.assignment_image_model import AssignmentImage
 from models.assignment_document_model import AssignmentDocument
 from models.issue_model import Issue
-from models.user_model import User
-from models.role_model import Role
+from repositories.issue_status_history_repository import record_status_change
 from repositories.assignment_repository import (
     create_assignment, get_assignments_for_contractor, get_assignment_by_id,
     update_assignment_status, update_assignment_cost, reject_assignment,
     add_assignment_image, add_assignment_document, get_assignment_images,
-    get_assignment_documents, get_assignments_by_status
+    get_assignment_documents, get_assignments_by_status, count_assignments_for_contractor
 )
 from fastapi import HTTPException, UploadFile
 from typing import List, Optional
@@ -18,83 +17,70 @@ import os
 import shutil
 from datetime import datetime
 
-def get_contractor_assignments(session: Session, contractor_id: int) -> List[dict]:
-    """Dohvati sve assignment-e za određenog izvođača"""
-    
-    # Dohvati sve assignment-e za izvođača
-    assignments = session.exec(
-        select(Assignment).where(Assignment.contractor_id == contractor_id)
-    ).all()
+def get_contractor_assignments(
+    session: Session,
+    contractor_id: int,
+    status: Optional[str] = None,
+    page: int = 1,
+    page_size: Optional[int] = None
+) -> List[dict]:
+    """Dohvati assignment-e za određenog izvođača (opciono po statusu i po stranicama)"""
+    
+    # Issue, kategorija, slike i stanar se učitavaju zajedno sa assignment-ima (selectinload)
+    assignments = get_assignments_for_contractor(session, contractor_id, status, page, page_size)
     
     result = []
     for assignment in assignments:
-        # Dohvati issue sa svim relacijama
-        issue_statement = select(Issue).where(Issue.id == assignment.issue_id).options(
-            selectinload(Issue.category),
-            selectinload(Issue.images)
-        )
-        issue = session.exec(issue_statement).first()
-        
+        issue = assignment.issue
         if not issue:
             continue
-            
-        # Dohvati tenant
-        tenant = session.get(User, issue.tenant_id) if issue and issue.tenant_id else None
+        tenant = issue.tenant
         
-        try:
-            assignment_dict = {
-                "id": assignment.id,
-                "issue_id": assignment.issue_id,
-                "contractor_id": assignment.contractor_id,
-                "status": assignment.status,
-                "estimated_cost": assignment.estimated_cost,
-                "actual_cost": assignment.actual_cost,
-                "planned_date": assignment.planned_date,
-                "rejection_reason": assignment.rejection_reason,
-                "notes": assignment.notes,
-                "created_at": assignment.created_at,
-                "updated_at": assignment.updated_at,
-                "issue": {
-                    "id": issue.id,
-                    "title": issue.title,
-                    "description": issue.description,
-                    "location": issue.location,
-                    "status": issue.status,
-                    "created_at": issue.created_at,
-                    "category": {
-                        "id": issue.category.id,
-                        "name": issue.category.name
-                    } if issue.category else None,
-                    "images": [
-                        {"id": img.id, "image_url": img.image_url} 
-                        for img in issue.images
-                    ] if issue.images else [],
-                    "tenant": {
-                        "id": tenant.id,
-                        "full_name": tenant.full_name,
-                        "email": tenant.email,
-                        "phone": tenant.phone,
-                        "address": tenant.address
-                    } if tenant else None
-                } if issue else None
+        assignment_dict = {
+            "id": assignment.id,
+            "issue_id": assignment.issue_id,
+            "contractor_id": assignment.contractor_id,
+            "status": assignment.status,
+            "estimated_cost": assignment.estimated_cost,
+            "actual_cost": assignment.actual_cost,
+            "planned_date": assignment.planned_date,
+            "rejection_reason": assignment.rejection_reason,
+            "notes": assignment.notes,
+            "created_at": assignment.created_at,
+            "updated_at": assignment.updated_at,
+            "issue": {
+                "id": issue.id,
+                "title": issue.title,
+                "description": issue.description,
+                "location": issue.location,
+                "status": issue.status,
+                "created_at": issue.created_at,
+                "category": {
+                    "id": issue.category.id,
+                    "name": issue.category.name
+                } if issue.category else None,
+                "images": [
+                    {"id": img.id, "image_url": img.image_url} 
+                    for img in issue.images
+                ] if issue.images else [],
+                "tenant": {
+                    "id": tenant.id,
+                    "full_name": tenant.full_name,
+                    "email": tenant.email,
+                    "phone": tenant.phone,
+                    "address": tenant.address
+                } if tenant else None
             }
-            result.append(assignment_dict)
-        except Exception as e:
-            continue
+        }
+        result.append(assignment_dict)
     
     return result
 
+def count_contractor_assignments(session: Session, contractor_id: int, status: Optional[str] = None) -> int:
+    return count_assignments_for_contractor(session, contractor_id, status)
+
 def update_assignment_status_service(session: Session, assignment_id: int, contractor_id: int, status: str, notes: Optional[str] = None) -> dict:
     """Ažuriraj status assignment-a"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu mijenjati status.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -111,14 +97,14 @@ def update_assignment_status_service(session: Session, assignment_id: int, contr
     # Ažuriraj i issue status na osnovu assignment statusa
     issue = session.get(Issue, assignment.issue_id)
     if issue:
-        if status == "Popravka u toku":
-            issue.status = "Popravka u toku"
-        elif status == "Čeka dijelove":
-            issue.status = "Čeka dijelove"
-        elif status == "Završeno":
-            issue.status = "Završeno"
-        elif status == "Odbijeno":
-            issue.status = "Otkazano"
+        issue_status = {
+            "Popravka u toku": "Popravka u toku",
+            "Čeka dijelove": "Čeka dijelove",
+            "Završeno": "Završeno",
+            "Odbijeno": "Otkazano",
+        }.get(status)
+        if issue_status:
+            record_status_change(session, issue, issue_status, contractor_id)
         session.commit()
     
     return {
@@ -129,15 +115,6 @@ def update_assignment_status_service(session: Session, assignment_id: int, contr
 
 def reject_assignment_service(session: Session, assignment_id: int, contractor_id: int, rejection_reason: str) -> dict:
     """Odbij assignment"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu odbijati assignment-e.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -154,15 +131,6 @@ def reject_assignment_service(session: Session, assignment_id: int, contractor_i
 
 def update_assignment_cost_service(session: Session, assignment_id: int, contractor_id: int, actual_cost: float) -> dict:
     """Ažuriraj troškove assignment-a"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu ažurirati troškove.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -179,15 +147,6 @@ def update_assignment_cost_service(session: Session, assignment_id: int, contrac
 
 def upload_assignment_image(session: Session, assignment_id: int, contractor_id: int, file: UploadFile) -> dict:
     """Upload slike za assignment"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu upload-ovati slike.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -214,15 +173,6 @@ def upload_assignment_image(session: Session, assignment_id: int, contractor_id:
 
 def upload_assignment_document(session: Session, assignment_id: int, contractor_id: int, file: UploadFile, document_type: str) -> dict:
     """Upload dokumenta za assignment"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu upload-ovati dokumente.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -250,15 +200,6 @@ def upload_assignment_document(session: Session, assignment_id: int, contractor_
 
 def update_issue_status_by_contractor_service(session: Session, assignment_id: int, contractor_id: int, new_status: str) -> dict:
     """Ažuriraj status issue-a od strane izvođača"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu mijenjati status issue-a.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -276,21 +217,21 @@ def update_issue_status_by_contractor_service(session: Session, assignment_id: i
     
     # Ažuriraj status issue-a
     old_status = issue.status
-    issue.status = new_status
-    session.commit()
-    session.refresh(issue)
+    record_status_change(session, issue, new_status, contractor_id)
     
-    # Kreiraj notifikaciju za stanara
-    from services import notification_service
+    # Kreiraj notifikaciju za stanara (red poslova, ista transakcija)
+    from services.background_job_service import enqueue_notification
     from schemas.notification_schema import NotificationCreate
     
-    notification_service.create_new_notification(session, NotificationCreate(
+    enqueue_notification(session, NotificationCreate(
         user_id=issue.tenant_id,
         issue_id=issue.id,
         old_status=old_status,
         new_status=new_status,
         changed_by="Izvođač"
     ))
+    session.commit()
+    session.refresh(issue)
     
     return {
         "message": "Status issue-a je uspješno promijenjen.",
@@ -301,15 +242,6 @@ def update_issue_status_by_contractor_service(session: Session, assignment_id: i
 
 def update_planned_data_service(session: Session, assignment_id: int, contractor_id: int, planned_date: str, estimated_cost: float) -> dict:
     """Ažuriraj planirani datum i procjenu troškova"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu ažurirati planirane podatke.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -331,15 +263,6 @@ def update_planned_data_service(session: Session, assignment_id: int, contractor
 
 def get_planned_data_service(session: Session, assignment_id: int, contractor_id: int) -> dict:
     """Dohvati planirani datum i procjenu troškova"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu pristupiti planiranim podacima.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -352,15 +275,6 @@ def get_planned_data_service(session: Session, assignment_id: int, contractor_id
 
 async def upload_completion_data_service(session: Session, assignment_id: int, contractor_id: int, notes: str, images: List[UploadFile], warranty_pdf: UploadFile = None) -> dict:
     """Upload završnih slika, bilješki i PDF-a za garanciju"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu upload-ovati završne podatke.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -409,15 +323,6 @@ async def upload_completion_data_service(session: Session, assignment_id: int, c
 
 def get_completion_data_service(session: Session, assignment_id: int, contractor_id: int) -> dict:
     """Dohvati završne slike i bilješke"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu pristupiti završnim podacima.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -450,15 +355,6 @@ def get_completion_data_service(session: Session, assignment_id: int, contractor
 
 def update_cancellation_reason_service(session: Session, assignment_id: int, contractor_id: int, cancellation_reason: str) -> dict:
     """Ažuriraj razlog otkazivanja"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu ažurirati razlog otkazivanja.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -477,15 +373,6 @@ def update_cancellation_reason_service(session: Session, assignment_id: int, con
 
 def get_cancellation_reason_service(session: Session, assignment_id: int, contractor_id: int) -> dict:
     """Dohvati razlog otkazivanja"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu pristupiti razlogu otkazivanja.")
-    
     # Provjera da li assignment pripada ovom izvođaču
     assignment = session.get(Assignment, assignment_id)
     if not assignment or assignment.contractor_id != contractor_id:
@@ -497,15 +384,6 @@ def get_cancellation_reason_service(session: Session, assignment_id: int, contra
 
 def get_completed_issues_service(session: Session, contractor_id: int) -> list:
     """Dohvati sve završene issue-e za izvođača"""
-    # Provjera da li je korisnik izvođač
-    user = session.get(User, contractor_id)
-    if not user or not hasattr(user, 'role_id'):
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or not hasattr(role, 'name') or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu pristupiti završenim issue-ima.")
-    
     # Dohvati sve assignments za ovog izvođača sa statusom "Završeno"
     assignments = session.query(Assignment).options(
         selectinload(Assignment.issue).selectinload(Issue.category),
@@ -557,7 +435,7 @@ def get_completed_issues_service(session: Session, contractor_id: int) -> list:
                 "priority": "srednji",  # Default priority, može se dodati u Issue model
                 "tenant": tenant_data,
                 "location": getattr(assignment.issue, 'location', ''),
-                "completed_at": getattr(assignment.issue, 'created_at', assignment.created_at).isoformat(),
+                "completed_at": (assignment.issue.completed_at or getattr(assignment.issue, 'created_at', assignment.created_at)).isoformat(),
                 "notes": [assignment.notes] if getattr(assignment, 'notes', None) else [],
                 "images": images,
                 "warranty_pdf": warranty_document
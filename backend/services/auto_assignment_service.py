@@ -0,0 +1,161 @@
+from sqlmodel import Session, select, func
+from sqlalchemy.orm import selectinload
+from models import Issue, Assignment
+from repositories.assignment_repository import get_contractors_with_active_counts, ACTIVE_ASSIGNMENT_STATUSES
+from repositories.system_settings_repository import get_system_settings
+from services.issue_service import create_assignment_for_issue, MAX_ACTIVE_ASSIGNMENTS
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+# Automatska dodjela prijava izvođačima (SystemSettings.auto_assignment).
+# Prijave u statusu "Primljeno" bez assignment-a obrađuju se po redu prijema, u
+# serijama. Za svaku se bira izvođač sa najvećim skorom:
+#   skor = LOCATION_WEIGHT * (ista lokacija)
+#        + CATEGORY_WEIGHT * min(završeni zadaci u kategoriji, CATEGORY_HISTORY_CAP)
+#        - LOAD_WEIGHT * trenutni broj aktivnih zadataka
+# Izjednačenja se rješavaju manjim opterećenjem pa manjim ID-em, pa je rezultat
+# deterministički za isto stanje baze.
+
+LOCATION_WEIGHT = 3.0
+CATEGORY_WEIGHT = 1.0
+CATEGORY_HISTORY_CAP = 3
+LOAD_WEIGHT = 2.0
+
+# Opterećenje uključuje i tek dodijeljene zadatke i one koji čekaju dijelove,
+# inače bi cijela serija otišla istom izvođaču
+LOAD_STATUSES = ACTIVE_ASSIGNMENT_STATUSES + ["Dodijeljeno", "Čeka dijelove"]
+
+AUTO_ASSIGNED_BY = "Automatska dodjela"
+AUTO_CHANGED_BY = "Sistem"
+
+@dataclass
+class ContractorCandidate:
+    id: int
+    active_count: int
+    location_tokens: Set[str]
+    category_history: Dict[int, int] = field(default_factory=dict)
+
+def location_tokens(*texts: Optional[str]) -> Set[str]:
+    """Riječi adrese (bez brojeva i kratkih riječi) za poređenje lokacija"""
+    tokens = set()
+    for text in texts:
+        if text:
+            tokens.update(word for word in re.findall(r"[^\W\d_]+", text.lower()) if len(word) >= 3)
+    return tokens
+
+def score_candidate(candidate: ContractorCandidate, category_id: int, issue_tokens: Set[str]) -> float:
+    location_match = 1 if candidate.location_tokens & issue_tokens else 0
+    experience = min(candidate.category_history.get(category_id, 0), CATEGORY_HISTORY_CAP)
+    return LOCATION_WEIGHT * location_match + CATEGORY_WEIGHT * experience - LOAD_WEIGHT * candidate.active_count
+
+def pick_contractor(candidates: List[ContractorCandidate], category_id: int, issue_tokens: Set[str]) -> Optional[ContractorCandidate]:
+    """Najbolji izvođač koji nije popunjen; None ako su svi na MAX_ACTIVE_ASSIGNMENTS"""
+    available = [c for c in candidates if c.active_count < MAX_ACTIVE_ASSIGNMENTS]
+    if not available:
+        return None
+    return min(
+        available,
+        key=lambda c: (-score_candidate(c, category_id, issue_tokens), c.active_count, c.id)
+    )
+
+def _pending_issue_ids(session: Session, batch_size: int) -> List[int]:
+    statement = (
+        select(Issue.id)
+        .outerjoin(Assignment, Assignment.issue_id == Issue.id)
+        .where(Issue.status == "Primljeno", Assignment.id.is_(None))
+        .order_by(Issue.created_at.asc(), Issue.id.asc())
+        .limit(batch_size)
+    )
+    return list(session.exec(statement))
+
+def _load_candidates(session: Session) -> List[ContractorCandidate]:
+    candidates = [
+        ContractorCandidate(id=contractor.id, active_count=active_count, location_tokens=location_tokens(contractor.address))
+        for contractor, active_count in get_contractors_with_active_counts(session, statuses=LOAD_STATUSES)
+    ]
+    if not candidates:
+        return candidates
+    # Historija po kategorijama za sve izvođače jednim grupisanim upitom
+    statement = (
+        select(Assignment.contractor_id, Issue.category_id, func.count(Assignment.id))
+        .join(Issue, Issue.id == Assignment.issue_id)
+        .where(Assignment.status == "Završeno")
+        .group_by(Assignment.contractor_id, Issue.category_id)
+    )
+    by_id = {candidate.id: candidate for candidate in candidates}
+    for contractor_id, category_id, completed in session.exec(statement):
+        if contractor_id in by_id:
+            by_id[contractor_id].category_history[category_id] = completed
+    return candidates
+
+def run_auto_assignment(session: Session, batch_size: int = 50) -> List[Tuple[int, int]]:
+    """Jedan prolaz automatske dodjele; vraća listu (issue_id, contractor_id).
+
+    Ne radi ništa ako je auto_assignment isključen u sistemskim postavkama.
+    """
+    settings = get_system_settings(session)
+    if not settings or not settings.auto_assignment:
+        return []
+
+    issue_ids = _pending_issue_ids(session, batch_size)
+    if not issue_ids:
+        return []
+    candidates = _load_candidates(session)
+
+    assigned = []
+    for issue_id in issue_ids:
+        # Zaključaj prijavu; ako je drugi worker već obrađuje (ili je dodijeljena), preskoči
+        issue = session.exec(
+            select(Issue)
+            .options(selectinload(Issue.tenant))
+            .where(Issue.id == issue_id, Issue.status == "Primljeno")
+            .with_for_update(skip_locked=True, of=Issue)
+        ).first()
+        if not issue:
+            continue
+        issue_tokens = location_tokens(issue.location, issue.tenant.address if issue.tenant else None)
+        candidate = pick_contractor(candidates, issue.category_id, issue_tokens)
+        if candidate is None:
+            # Svi izvođači su popunjeni - ostatak serije čeka sljedeći prolaz
+            session.rollback()
+            break
+        create_assignment_for_issue(
+            session, issue, candidate.id,
+            assigned_by=AUTO_ASSIGNED_BY,
+            changed_by_label=AUTO_CHANGED_BY
+        )
+        # Opterećenje se ažurira lokalno da bi se serija rasporedila po izvođačima
+        candidate.active_count += 1
+        assigned.append((issue_id, candidate.id))
+
+    if assigned:
+        logger.info("Automatska dodjela završena", extra={"assigned": len(assigned), "batch": len(issue_ids)})
+    return assigned
+
+def auto_assignment_interval() -> float:
+    """Razmak između prolaza u sekundama; 0 isključuje pozadinski zadatak u ovom procesu"""
+    return float(os.getenv("AUTO_ASSIGNMENT_INTERVAL_SECONDS", "10"))
+
+async def auto_assignment_loop(engine, interval_seconds: Optional[float] = None, batch_size: Optional[int] = None) -> None:
+    """Pozadinski zadatak: periodično pokreće run_auto_assignment u threadpool-u"""
+    interval = interval_seconds or auto_assignment_interval()
+    size = batch_size or int(os.getenv("AUTO_ASSIGNMENT_BATCH_SIZE", "50"))
+
+    def run_once():
+        with Session(engine) as session:
+            return run_auto_assignment(session, size)
+
+    while True:
+        try:
+            await asyncio.to_thread(run_once)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Automatska dodjela nije uspjela")
+        await asyncio.sleep(interval)
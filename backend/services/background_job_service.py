@@ -0,0 +1,135 @@
+from sqlmodel import Session
+from models import BackgroundJob, User
+from repositories.background_job_repository import enqueue_job, claim_due_jobs, complete_job, fail_job
+from repositories.system_settings_repository import get_system_settings
+from schemas.notification_schema import NotificationCreate
+from schemas.assignment_notification_schema import AssignmentNotificationCreate
+from services.notification_service import stage_notification, publish_notification
+from services.assignment_notification_service import stage_assignment_notification, publish_assignment_notification
+from email.message import EmailMessage
+from typing import Callable, Dict, Optional
+import asyncio
+import json
+import logging
+import os
+import smtplib
+
+logger = logging.getLogger(__name__)
+
+# Red pozadinskih poslova (tabela backgroundjob).
+# Endpoint-i upisuju posao u istoj transakciji kao i promjenu (npr. promjenu statusa),
+# pa se notifikacija ne gubi ako proces padne nakon commit-a, a odgovor ne čeka na
+# kreiranje notifikacija, push i slanje emaila. Poslove izvršava job_worker_loop.
+#
+# Handler ne radi commit: efekti posla i brisanje posla idu u jednu transakciju
+# (process_jobs), pa ponovljeni posao nakon pada ne pravi duplikate. Handler može
+# vratiti funkciju koja se izvršava tek nakon commit-a (push na SSE).
+
+NOTIFICATION_JOB = "notification"
+ASSIGNMENT_NOTIFICATION_JOB = "assignment_notification"
+EMAIL_JOB = "email"
+
+def enqueue_notification(session: Session, data: NotificationCreate) -> BackgroundJob:
+    return enqueue_job(session, NOTIFICATION_JOB, data.model_dump())
+
+def enqueue_assignment_notification(session: Session, data: AssignmentNotificationCreate) -> BackgroundJob:
+    return enqueue_job(session, ASSIGNMENT_NOTIFICATION_JOB, data.model_dump())
+
+def _email_enabled(session: Session) -> bool:
+    settings = get_system_settings(session)
+    return bool(settings and settings.email_notifications)
+
+AfterCommit = Optional[Callable[[], None]]
+
+def _handle_notification(session: Session, payload: dict) -> AfterCommit:
+    data = NotificationCreate(**payload)
+    notification = stage_notification(session, data)
+    if _email_enabled(session):
+        if data.new_status:
+            body = f"Status prijave je promijenjen: {data.old_status or '-'} -> {data.new_status} ({data.changed_by})."
+        else:
+            body = f"Imate novu obavijest ({data.changed_by})."
+        enqueue_job(session, EMAIL_JOB, {"user_id": data.user_id, "subject": "FixTrack obavijest", "body": body})
+    return lambda: publish_notification(session, notification)
+
+def _handle_assignment_notification(session: Session, payload: dict) -> AfterCommit:
+    notification = stage_assignment_notification(session, AssignmentNotificationCreate(**payload))
+    return lambda: publish_assignment_notification(session, notification)
+
+def _handle_email(session: Session, payload: dict) -> AfterCommit:
+    # Postavka se provjerava i pri slanju - isključivanje zaustavlja i poslove koji već čekaju
+    if not _email_enabled(session):
+        return None
+    user = session.get(User, payload["user_id"])
+    if not user:
+        return None
+    host = os.getenv("SMTP_HOST")
+    if not host:
+        logger.info("SMTP nije konfigurisan, email preskočen", extra={"user_id": user.id})
+        return None
+    message = EmailMessage()
+    message["From"] = os.getenv("SMTP_FROM", "noreply@fixtrack.local")
+    message["To"] = user.email
+    message["Subject"] = payload["subject"]
+    message.set_content(payload["body"])
+    with smtplib.SMTP(host, int(os.getenv("SMTP_PORT", "587")), timeout=30) as smtp:
+        if os.getenv("SMTP_USER"):
+            smtp.starttls()
+            smtp.login(os.getenv("SMTP_USER"), os.getenv("SMTP_PASSWORD", ""))
+        smtp.send_message(message)
+    return None
+
+JOB_HANDLERS: Dict[str, Callable[[Session, dict], AfterCommit]] = {
+    NOTIFICATION_JOB: _handle_notification,
+    ASSIGNMENT_NOTIFICATION_JOB: _handle_assignment_notification,
+    EMAIL_JOB: _handle_email,
+}
+
+def process_jobs(session: Session, limit: int = 50) -> int:
+    """Izvršava jednu seriju poslova; vraća broj preuzetih poslova"""
+    jobs = [(job.id, job.job_type, job.payload) for job in claim_due_jobs(session, limit)]
+    for job_id, job_type, payload in jobs:
+        handler = JOB_HANDLERS.get(job_type)
+        try:
+            if handler is None:
+                raise ValueError(f"Nepoznat tip posla: {job_type}")
+            after_commit = handler(session, json.loads(payload))
+            complete_job(session, job_id)
+            # Jedan commit po poslu: efekti posla + brisanje posla
+            session.commit()
+        except Exception as exc:
+            session.rollback()
+            logger.exception("Pozadinski posao nije uspio", extra={"job_id": job_id, "job_type": job_type})
+            fail_job(session, job_id, str(exc))
+            continue
+        if after_commit:
+            # Posao je već commit-ovan; greška pri push-u se samo loguje
+            try:
+                after_commit()
+            except Exception:
+                logger.exception("Push nakon posla nije uspio", extra={"job_id": job_id, "job_type": job_type})
+    return len(jobs)
+
+def job_worker_interval() -> float:
+    """Razmak između provjera reda u sekundama; 0 isključuje worker u ovom procesu"""
+    return float(os.getenv("JOB_WORKER_INTERVAL_SECONDS", "1"))
+
+async def job_worker_loop(engine, interval_seconds: Optional[float] = None, batch_size: Optional[int] = None) -> None:
+    """Pozadinski zadatak: prazni red poslova u threadpool-u, pa čeka interval"""
+    interval = interval_seconds or job_worker_interval()
+    size = batch_size or int(os.getenv("JOB_WORKER_BATCH_SIZE", "50"))
+
+    def run_once():
+        with Session(engine) as session:
+            return process_jobs(session, size)
+
+    while True:
+        try:
+            # Puna serija znači da u redu vjerovatno ima još poslova
+            while await asyncio.to_thread(run_once) >= size:
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Obrada reda poslova nije uspjela")
+        await asyncio.sleep(interval)
@@ -8,6 +8,7 @@ from repositories.dashboard_repository import (
     get_contractor_assigned_issues,
     get_contractor_recent_activities
 )
+from dashboard_cache import get_or_compute
 from schemas.dashboard_schema import (
     TenantDashboardResponse,
     TenantStats,
@@ -20,22 +21,10 @@ from schemas.dashboard_schema import (
     ContractorIssue,
     ContractorActivity
 )
-from fastapi import HTTPException
-from models import User, Role
 
 def get_tenant_dashboard_data(session: Session, user_id: int) -> TenantDashboardResponse:
     """Dohvaća sve podatke za tenant dashboard"""
     
-    # Provjera da li korisnik postoji
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    # Provjera da li je korisnik tenant ili izvođač (jer izvođač može biti i stanar)
-    role = session.get(Role, user.role_id)
-    if not role or ("stanar" not in role.name.lower() and "izvođač" not in role.name.lower()):
-        raise HTTPException(status_code=403, detail="Samo stanari i izvođači mogu pristupiti tenant dashboard-u.")
-    
     # Dohvati statistike
     stats_data = get_tenant_dashboard_stats(session, user_id)
     stats = TenantStats(**stats_data)
@@ -49,25 +38,15 @@ def get_tenant_dashboard_data(session: Session, user_id: int) -> TenantDashboard
         recent_issues=recent_issues
     )
 
-def get_manager_dashboard_data(session: Session, user_id: int) -> ManagerDashboardResponse:
+def get_manager_dashboard_data(session: Session, user_id: int, recent_limit: int = 4) -> ManagerDashboardResponse:
     """Dohvaća sve podatke za manager dashboard"""
     
-    # Provjera da li korisnik postoji
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    # Provjera da li je korisnik manager
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo upravnici mogu pristupiti manager dashboard-u.")
-    
-    # Dohvati statistike
-    stats_data = get_manager_dashboard_stats(session, user_id)
+    # Statistike su globalne, pa ih svi upravnici dijele kroz keš
+    stats_data = get_or_compute("manager_stats", lambda: get_manager_dashboard_stats(session, user_id))
     stats = ManagerStats(**stats_data)
     
     # Dohvati nedavne prijave
-    recent_issues_data = get_manager_recent_issues(session)
+    recent_issues_data = get_manager_recent_issues(session, recent_limit)
     recent_issues = [ManagerIssue(**issue) for issue in recent_issues_data]
     
     return ManagerDashboardResponse(
@@ -78,16 +57,6 @@ def get_manager_dashboard_data(session: Session, user_id: int) -> ManagerDashboa
 def get_contractor_dashboard_data(session: Session, user_id: int) -> ContractorDashboardResponse:
     """Dohvaća sve podatke za contractor dashboard"""
     
-    # Provjera da li korisnik postoji
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    # Provjera da li je korisnik contractor
-    role = session.get(Role, user.role_id)
-    if not role or "izvođač" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo izvođači mogu pristupiti contractor dashboard-u.")
-    
     # Dohvati statistike
     stats_data = get_contractor_dashboard_stats(session, user_id)
     stats = ContractorStats(**stats_data)
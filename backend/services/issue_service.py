@@ -1,48 +1,133 @@
 from sqlmodel import Session
-from models import Issue, IssueImage, IssueCategory, User, Role
+from models import Issue, IssueCategory, User
 from models.admin_note_model import AdminNote
 from models.assignment_model import Assignment
 from repositories.issue_repository import (
-    create_issue, add_issue_image, get_issue_categories, get_issues_for_user, update_issue_status, update_issue as repo_update_issue, delete_issue as repo_delete_issue,
+    add_issue_images, get_issue_categories, get_issues_for_user, update_issue as repo_update_issue, delete_issue as repo_delete_issue,
     get_user_issue_history as repo_get_user_issue_history,
     get_user_issue_history_stats as repo_get_user_issue_history_stats,
-    get_issues_for_manager, get_issues_for_manager_simple, get_issues_for_manager_complete
+    get_issues_for_manager, get_issues_for_manager_simple, get_issues_for_manager_complete,
+    encode_manager_cursor
 )
 from fastapi import HTTPException, status, UploadFile
-from typing import List
+from typing import List, Optional
 import os
 import shutil
+import tempfile
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
-from services import notification_service
-from services.assignment_notification_service import create_new_assignment_notification
+from services.background_job_service import enqueue_notification, enqueue_assignment_notification
 from schemas.notification_schema import NotificationCreate
 from schemas.assignment_notification_schema import AssignmentNotificationCreate
+from repositories.comment_repository import count_comments_for_issues
+from repositories.rating_repository import get_ratings_for_issues
+from repositories.issue_status_history_repository import record_status_change
+from repositories.assignment_repository import get_contractors_with_active_counts
+from repositories.issue_status_counter_repository import adjust_status_counters
+from auth import get_role_name
+import logging
+
+logger = logging.getLogger(__name__)
+
+ISSUE_MEDIA_DIR = os.path.join("media", "issues")
+# Privremeni direktorij van /media (StaticFiles) mount-a, na istom filesystem-u
+UPLOAD_STAGING_DIR = ".upload_staging"
 
 def create_new_issue(session: Session, tenant_id: int, data, images: List[UploadFile]) -> Issue:
-    issue = Issue(
-        tenant_id=tenant_id,
-        category_id=data.category_id,
-        title=data.title,
-        description=data.description,
-        location=data.location,
-    )
-    issue = create_issue(session, issue)
-    # Save images
-    for img in images:
-        filename = save_issue_image(img, issue.id)
-        image_obj = IssueImage(issue_id=issue.id, image_url=filename)
-        add_issue_image(session, image_obj)
+    """Kreira prijavu sa slikama u jednoj transakciji.
+
+    Fajlovi se prvo upisuju u privremeni direktorij (bez baze), pa se prijava i sve
+    slike (jedan bulk INSERT) upisuju jednim commit-om. Ako bilo šta ne uspije, ne
+    ostaju ni redovi u bazi ni fajlovi koje je ovaj zahtjev upisao.
+    """
+    names = _image_names(images)
+    staging_dir = stage_issue_images(images, names)
+    moved_files: List[str] = []
+    try:
+        issue = Issue(
+            tenant_id=tenant_id,
+            category_id=data.category_id,
+            title=data.title,
+            description=data.description,
+            location=data.location,
+        )
+        session.add(issue)
+        # ID prijave je potreban za putanju slika
+        session.flush()
+        adjust_status_counters(session, tenant_id, [], None, issue.status)
+        if staging_dir:
+            issue_dir = os.path.join(ISSUE_MEDIA_DIR, str(issue.id))
+            moved_files = _move_staged_images(staging_dir, names, issue_dir)
+        add_issue_images(session, issue.id, moved_files)
+        session.commit()
+    except Exception:
+        session.rollback()
+        # Brišu se samo fajlovi ovog zahtjeva; direktorij prijave može već postojati
+        for path in moved_files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
+    finally:
+        if staging_dir:
+            shutil.rmtree(staging_dir, ignore_errors=True)
     session.refresh(issue)
     return issue
 
-def save_issue_image(upload_file: UploadFile, issue_id: int) -> str:
-    upload_dir = os.path.join("media", "issues", str(issue_id))
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, upload_file.filename)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
-    return file_path
+def _image_names(images: List[UploadFile]) -> List[str]:
+    """Imena fajlova bez putanje koju je poslao klijent; prazna i duplirana imena se odbijaju"""
+    names = []
+    for img in images:
+        name = os.path.basename(img.filename or "")
+        if not name or name in (".", ".."):
+            raise HTTPException(status_code=400, detail="Slika mora imati ime fajla.")
+        if name in names:
+            raise HTTPException(status_code=400, detail=f"Slika '{name}' je poslana više puta.")
+        names.append(name)
+    return names
+
+def stage_issue_images(images: List[UploadFile], names: List[str]) -> Optional[str]:
+    """Upisuje upload-ovane slike u privremeni direktorij (nije javno dostupan); None ako nema slika"""
+    if not images:
+        return None
+    os.makedirs(UPLOAD_STAGING_DIR, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix="issue-", dir=UPLOAD_STAGING_DIR)
+    try:
+        for img, name in zip(images, names):
+            with open(os.path.join(staging_dir, name), "wb") as buffer:
+                shutil.copyfileobj(img.file, buffer)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    return staging_dir
+
+def _move_staged_images(staging_dir: str, names: List[str], issue_dir: str) -> List[str]:
+    """Premješta slike jednu po jednu u direktorij prijave; vraća putanje premještenih fajlova.
+
+    Direktorij može već postojati (npr. ID ponovo iskorišten na novoj bazi), pa se
+    postojeći fajlovi nikad ne prepisuju - sudar imena dobija sufiks.
+    """
+    os.makedirs(issue_dir, exist_ok=True)
+    moved = []
+    try:
+        for name in names:
+            target = os.path.join(issue_dir, name)
+            stem, ext = os.path.splitext(name)
+            suffix = 1
+            while os.path.exists(target):
+                target = os.path.join(issue_dir, f"{stem}_{suffix}{ext}")
+                suffix += 1
+            os.replace(os.path.join(staging_dir, name), target)
+            moved.append(target)
+    except Exception:
+        for path in moved:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
+    return moved
 
 def get_categories(session: Session):
     return get_issue_categories(session)
@@ -55,16 +140,18 @@ def change_issue_status(session: Session, user_id: int, issue_id: int, new_statu
     if not issue or issue.tenant_id != user_id:
         raise HTTPException(status_code=404, detail="Prijava nije pronađena ili nemate dozvolu.")
     old_status = issue.status
-    updated_issue = update_issue_status(session, issue_id, new_status)
-    # Kreiraj notifikaciju za korisnika (stanara)
-    notification_service.create_new_notification(session, NotificationCreate(
+    record_status_change(session, issue, new_status, user_id)
+    # Notifikacija za korisnika (stanara) ide u red poslova, u istoj transakciji
+    enqueue_notification(session, NotificationCreate(
         user_id=issue.tenant_id,
         issue_id=issue.id,
         old_status=old_status,
         new_status=new_status,
         changed_by="Sistem"  # ili ime korisnika koji je promijenio status
     ))
-    return updated_issue
+    session.commit()
+    session.refresh(issue)
+    return issue
 
 def update_issue(session: Session, user_id: int, issue_id: int, data) -> Issue:
     issue = session.get(Issue, issue_id)
@@ -85,46 +172,16 @@ def delete_issue(session: Session, user_id: int, issue_id: int) -> None:
     return repo_delete_issue(session, issue)
 
 def get_user_issue_history(session: Session, user_id: int, filters: dict, page: int = 1, page_size: int = 10):
-    print(f"DEBUG SERVICE: Getting issue history for user {user_id}, page {page}, page_size {page_size}")
-    print(f"DEBUG SERVICE: Filters: {filters}")
-    
     issues, total = repo_get_user_issue_history(session, user_id, filters, page, page_size)
-    print(f"DEBUG SERVICE: Repository returned {len(issues)} issues, total {total}")
     
-    # For each issue, count comments and get rating for that user
-    from models import Comment, Rating
+    # Broj komentara i ocjene za cijelu stranicu dohvataju se sa dva upita (bez N+1)
+    issue_ids = [issue.id for issue in issues]
+    comments_counts = count_comments_for_issues(session, issue_ids, user_id)
+    ratings = get_ratings_for_issues(session, issue_ids, user_id)
     history_issues = []
     for issue in issues:
-        comments = session.exec(select(Comment).where(Comment.issue_id == issue.id, Comment.user_id == user_id)).all()
-        comments_count = len(comments)
-        try:
-            rating_obj = session.exec(select(Rating).where(Rating.issue_id == issue.id, Rating.tenant_id == user_id)).first()
-            print(f"DEBUG: Issue {issue.id} rating_obj: {rating_obj}, type: {type(rating_obj)}")
-            
-            # Handle both direct Rating object and Row tuple
-            if rating_obj:
-                if hasattr(rating_obj, 'score'):
-                    # Direct Rating object
-                    rating = rating_obj.score
-                elif hasattr(rating_obj, '__getitem__') and len(rating_obj) > 0:
-                    # Row tuple - extract the Rating object from the tuple
-                    rating_instance = rating_obj[0]
-                    if hasattr(rating_instance, 'score'):
-                        rating = rating_instance.score
-                    else:
-                        rating = None
-                else:
-                    rating = None
-            else:
-                rating = None
-                
-            print(f"DEBUG: Issue {issue.id} rating: {rating}")
-        except Exception as e:
-            print(f"DEBUG: Error getting rating for issue {issue.id}: {e}")
-            rating = None
-        
-        # Debug: print the created_at value
-        print(f"Issue {issue.id} created_at: {issue.created_at}, type: {type(issue.created_at)}")
+        comments_count = comments_counts.get(issue.id, 0)
+        rating = ratings.get(issue.id)
         
         # Dohvati assignedTo iz assignments relacije
         assigned_to = None
@@ -148,19 +205,16 @@ def get_user_issue_history(session: Session, user_id: int, filters: dict, page:
                 "name": issue.category.name
             } if issue.category else None,
             "createdAt": issue.created_at.isoformat() if issue.created_at else None,
-            "completedAt": None,
+            "completedAt": issue.completed_at.isoformat() if issue.completed_at else None,
             "assignedTo": assigned_to,
             "commentsCount": comments_count,
             "rating": rating,
         })
     
-    print(f"DEBUG SERVICE: Returning {len(history_issues)} processed issues")
-    
-    # Debug za "Završeno" issue-e
-    completed_processed = [issue for issue in history_issues if issue.get("status") == "Završeno"]
-    print(f"DEBUG SERVICE: Processed completed issues: {len(completed_processed)}")
-    for issue in completed_processed:
-        print(f"DEBUG SERVICE: Processed completed - ID: {issue['id']}, Title: {issue['title']}, Status: {issue['status']}")
+    logger.debug(
+        "Historija prijava pripremljena",
+        extra={"user_id": user_id, "filters": filters, "page": page, "page_size": page_size, "total": total, "returned": len(history_issues)}
+    )
     
     return history_issues, total
 
@@ -169,36 +223,29 @@ def get_user_issue_history_stats(session: Session, user_id: int):
 
 # Funkcije za upravnike
 def get_all_issues_for_manager(session: Session, user_id: int, filters: dict, page: int = 1, page_size: int = 10):
-    # Provjera da li je korisnik upravnik
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    # Debug: ispiši role_id korisnika
-    print(f"User {user.full_name} has role_id: {user.role_id}")
-    
-    # Provjeri da li je korisnik upravnik (možemo provjeriti po imenu role-a)
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Nemate dozvolu za pristup. Potrebna je uloga upravnika.")
-    
+    # Uloga upravnika se provjerava u kontroleru (auth.require_role)
     issues = get_issues_for_manager_simple(session, filters, page, page_size)
     
     return issues
 
-def get_all_issues_for_manager_dict(session: Session, user_id: int, filters: dict, page: int = 1, page_size: int = 10):
+def _manager_cursor_page(issues: list, result: List[dict], filters: dict, page_size: int, cursor: Optional[str]):
+    """U cursor modu vraća stranicu zajedno sa next_cursor, inače samo listu (staro ponašanje)"""
+    if cursor is None:
+        return result
+    next_cursor = None
+    if len(issues) == page_size and issues:
+        next_cursor = encode_manager_cursor(filters.get("sort_by", "created_at_desc"), issues[-1])
+    return {"issues": result, "next_cursor": next_cursor}
+
+def _get_manager_issues_page(getter, session: Session, filters: dict, page: int, page_size: int, cursor: Optional[str]):
+    try:
+        return getter(session, filters, page, page_size, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def get_all_issues_for_manager_dict(session: Session, user_id: int, filters: dict, page: int = 1, page_size: int = 10, cursor: Optional[str] = None):
     """Vraća podatke kao dictionary umjesto ORM objekata"""
-    # Provjera da li je korisnik upravnik
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    # Provjeri da li je korisnik upravnik (možemo provjeriti po imenu role-a)
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Nemate dozvolu za pristup. Potrebna je uloga upravnika.")
-    
-    issues = get_issues_for_manager_simple(session, filters, page, page_size)
+    issues = _get_manager_issues_page(get_issues_for_manager_simple, session, filters, page, page_size, cursor)
     
     # Konvertuj u dictionary format
     result = []
@@ -230,65 +277,45 @@ def get_all_issues_for_manager_dict(session: Session, user_id: int, filters: dic
         }
         result.append(issue_dict)
     
-    return result
+    return _manager_cursor_page(issues, result, filters, page_size, cursor)
 
-def get_available_contractors(session, user_id):
-    contractor_role = session.execute(
-        select(Role).where(Role.name.ilike("%izvođač%"))
-    ).first()
-    if contractor_role:
-        contractor_role = contractor_role[0]  # Pristupi Role objektu
-        contractors = session.execute(
-            select(User).where(User.role_id == contractor_role.id)
-        ).scalars().all()
-        # Pretvori svaki User u dict
-        contractor_dicts = []
-        for contractor in contractors:
-            # Provjeri koliko aktivnih zadataka ima izvođač
-            active_assignments = session.execute(
-                select(Assignment).where(
-                    Assignment.contractor_id == contractor.id,
-                    Assignment.status.in_(["Primljeno", "Na lokaciji", "Popravka u toku"])
-                )
-            ).scalars().all()
-            
-            contractor_dicts.append({
-                "id": contractor.id,
-                "full_name": contractor.full_name,
-                "email": contractor.email,
-                "phone": contractor.phone,
-                "address": contractor.address,
-                "role_id": contractor.role_id,
-                "created_at": contractor.created_at,
-                "active_assignments_count": len(active_assignments),
-                "is_available": len(active_assignments) < 5  # Izvođač je slobodan ako ima manje od 5 aktivnih zadataka
-            })
-        return contractor_dicts
-    return []
+# Izvođač je slobodan ako ima manje od ovoliko aktivnih zadataka
+MAX_ACTIVE_ASSIGNMENTS = 5
+
+def get_available_contractors(session, user_id, sort_by: Optional[str] = None):
+    # Izvođači i njihovo opterećenje dolaze iz jednog grupisanog upita
+    rows = get_contractors_with_active_counts(session, sort_by)
+    contractor_dicts = []
+    for contractor, active_count in rows:
+        contractor_dicts.append({
+            "id": contractor.id,
+            "full_name": contractor.full_name,
+            "email": contractor.email,
+            "phone": contractor.phone,
+            "address": contractor.address,
+            "role_id": contractor.role_id,
+            "created_at": contractor.created_at,
+            "active_assignments_count": active_count,
+            "is_available": active_count < MAX_ACTIVE_ASSIGNMENTS
+        })
+    return contractor_dicts
 
 def assign_contractor_to_issue(session: Session, user_id: int, issue_id: int, contractor_id: int):
-    print(f"DEBUG: assign_contractor_to_issue called with issue_id={issue_id}, contractor_id={contractor_id}")
-    
-    # Provjera da li je korisnik upravnik
+    # Uloga upravnika se provjerava u kontroleru; korisnik treba samo zbog imena u notifikaciji
     user = session.get(User, user_id)
     if not user:
-        print(f"DEBUG: User {user_id} not found")
         raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
     
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        print(f"DEBUG: User {user_id} is not manager, role: {role.name if role else 'None'}")
-        raise HTTPException(status_code=403, detail="Samo upravnici mogu dodijeliti izvođače.")
-    
     # Provjera da li issue postoji i da li je u statusu "Primljeno"
     issue = session.get(Issue, issue_id)
     if not issue:
-        print(f"DEBUG: Issue {issue_id} not found")
         raise HTTPException(status_code=404, detail="Prijava nije pronađena.")
     
-    print(f"DEBUG: Issue {issue_id} status: {issue.status}")
     if issue.status != "Primljeno":
-        print(f"DEBUG: Issue {issue_id} has wrong status: {issue.status}, expected: Primljeno")
+        logger.debug(
+            "Dodjela odbijena - pogrešan status prijave",
+            extra={"issue_id": issue_id, "contractor_id": contractor_id, "status": issue.status}
+        )
         raise HTTPException(status_code=400, detail="Samo prijave sa statusom 'Primljeno' mogu biti dodijeljene izvođaču.")
     
     # Provjera da li izvođač postoji
@@ -296,53 +323,63 @@ def assign_contractor_to_issue(session: Session, user_id: int, issue_id: int, co
     if not contractor:
         raise HTTPException(status_code=404, detail="Izvođač nije pronađen.")
     
-    contractor_role = session.get(Role, contractor.role_id)
-    if not contractor_role or "izvođač" not in contractor_role.name.lower():
+    if "izvođač" not in get_role_name(session, contractor.role_id).lower():
         raise HTTPException(status_code=400, detail="Odabrani korisnik nije izvođač.")
     
-    # Kreiraj assignment
+    assignment = create_assignment_for_issue(session, issue, contractor_id, assigned_by=user.full_name, changed_by_id=user_id)
+    
+    return {"message": "Izvođač je uspješno dodijeljen prijavi.", "assignment_id": assignment.id, "issue_id": issue_id, "contractor_id": contractor_id}
+
+def create_assignment_for_issue(
+    session: Session,
+    issue: Issue,
+    contractor_id: int,
+    assigned_by: str,
+    changed_by_id: Optional[int] = None,
+    changed_by_label: str = "Upravnik"
+) -> Assignment:
+    """Kreira assignment, prebacuje prijavu u 'Dodijeljeno izvođaču' i obavještava izvođača.
+
+    Koriste je ručna dodjela (upravnik) i automatska dodjela; provjere radi pozivalac.
+    Notifikacije se upisuju u red poslova u istoj transakciji kao i assignment.
+    """
+    # Status se mijenja prije dodavanja assignment-a; novi izvođač dobija brojač
+    # samo za novi status, u istom upsert-u kao i ostali brojači
+    record_status_change(session, issue, "Dodijeljeno izvođaču", changed_by_id, added_contractor_id=contractor_id)
     assignment = Assignment(
-        issue_id=issue_id, 
+        issue_id=issue.id, 
         contractor_id=contractor_id, 
         status="Dodijeljeno"
     )
     session.add(assignment)
-    issue.status = "Dodijeljeno izvođaču"
-    session.commit()
-    session.refresh(assignment)
-    session.refresh(issue)
+    # ID assignment-a je potreban za assignment notifikaciju
+    session.flush()
     
     # Kreiraj notifikaciju za izvođača
-    notification_service.create_new_notification(session, NotificationCreate(
+    enqueue_notification(session, NotificationCreate(
         user_id=contractor_id,
-        issue_id=issue_id,
+        issue_id=issue.id,
         old_status="Primljeno",
         new_status="Dodijeljeno izvođaču",
-        changed_by="Upravnik"
+        changed_by=changed_by_label
     ))
     
     # Kreiraj assignment notifikaciju za izvođača
-    create_new_assignment_notification(session, AssignmentNotificationCreate(
+    enqueue_assignment_notification(session, AssignmentNotificationCreate(
         contractor_id=contractor_id,
         assignment_id=assignment.id,
-        issue_id=issue_id,
+        issue_id=issue.id,
         notification_type="new_assignment",
-        assigned_by=user.full_name,
+        assigned_by=assigned_by,
         message=f"Dobili ste novi zadatak: {issue.title}"
     ))
+    session.commit()
+    session.refresh(assignment)
+    session.refresh(issue)
     
-    return {"message": "Izvođač je uspješno dodijeljen prijavi.", "assignment_id": assignment.id, "issue_id": issue_id, "contractor_id": contractor_id}
+    return assignment
 
 def update_issue_status_manager(session: Session, user_id: int, issue_id: int, new_status: str):
-    # Provjera da li je korisnik upravnik
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo upravnici mogu mijenjati status prijava.")
-    
     # Provjera da li issue postoji
     issue = session.get(Issue, issue_id)
     if not issue:
@@ -354,18 +391,18 @@ def update_issue_status_manager(session: Session, user_id: int, issue_id: int, n
         raise HTTPException(status_code=400, detail="Neispravan status.")
     
     old_status = issue.status
-    issue.status = new_status
-    session.commit()
-    session.refresh(issue)
+    record_status_change(session, issue, new_status, user_id)
     
     # Kreiraj notifikaciju za stanara
-    notification_service.create_new_notification(session, NotificationCreate(
+    enqueue_notification(session, NotificationCreate(
         user_id=issue.tenant_id,
         issue_id=issue_id,
         old_status=old_status,
         new_status=new_status,
         changed_by="Upravnik"
     ))
+    session.commit()
+    session.refresh(issue)
     
     return {
         "message": "Status prijave je uspješno promijenjen.",
@@ -375,15 +412,6 @@ def update_issue_status_manager(session: Session, user_id: int, issue_id: int, n
     }
 
 def get_all_issues_for_manager_complete(session: Session, user_id: int, filters: dict, page: int = 1, page_size: int = 10):
-    # Provjera da li je korisnik upravnik
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo upravnici mogu pristupiti ovim podacima.")
-    
     # Dohvati sve issue-e (bez filtriranja po statusu "Primljeno")
     issues = get_issues_for_manager_complete(session, filters, page, page_size)
     
@@ -419,15 +447,6 @@ def get_all_issues_for_manager_complete(session: Session, user_id: int, filters:
     return result
 
 def get_all_tenants_for_manager(session: Session, user_id: int):
-    # Provjera da li je korisnik upravnik
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo upravnici mogu pristupiti ovim podacima.")
-    
     # Dohvati sve korisnike koristeći select sa svim poljima
     statement = select(User.id, User.full_name, User.email, User.phone, User.address, User.role_id, User.created_at)
     user_rows = session.exec(statement).all()
@@ -448,25 +467,16 @@ def get_all_tenants_for_manager(session: Session, user_id: int):
     return result
 
 def create_admin_note(session: Session, user_id: int, tenant_id: int, note: str):
-    # Provjera da li je korisnik upravnik
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo upravnici mogu slati napomene.")
-    
     # Provjera da li stanar postoji
     tenant = session.get(User, tenant_id)
     if not tenant:
         raise HTTPException(status_code=404, detail="Stanar nije pronađen.")
     
-    tenant_role = session.get(Role, tenant.role_id)
-    if not tenant_role:
+    tenant_role_name = get_role_name(session, tenant.role_id)
+    if not tenant_role_name:
         raise HTTPException(status_code=400, detail="Stanar nema validnu ulogu.")
     
-    if "stanar" not in tenant_role.name.lower():
+    if "stanar" not in tenant_role_name.lower():
         raise HTTPException(status_code=400, detail="Odabrani korisnik nije stanar.")
     
     # Kreiraj napomenu
@@ -476,17 +486,17 @@ def create_admin_note(session: Session, user_id: int, tenant_id: int, note: str)
         note=note
     )
     session.add(admin_note)
-    session.commit()
-    session.refresh(admin_note)
     
     # Kreiraj notifikaciju za stanara
-    notification_service.create_new_notification(session, NotificationCreate(
+    enqueue_notification(session, NotificationCreate(
         user_id=tenant_id,
         issue_id=None,  # Nema vezane prijave
         old_status=None,
         new_status=None,
         changed_by="Upravnik"
     ))
+    session.commit()
+    session.refresh(admin_note)
     
     return {
         "message": "Napomena je uspješno poslana.",
@@ -496,15 +506,6 @@ def create_admin_note(session: Session, user_id: int, tenant_id: int, note: str)
     }
 
 def create_issue_note(session: Session, user_id: int, issue_id: int, note: str):
-    # Provjera da li je korisnik upravnik
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo upravnici mogu slati napomene.")
-    
     # Provjera da li issue postoji
     issue = session.get(Issue, issue_id)
     if not issue:
@@ -532,15 +533,6 @@ def create_issue_note(session: Session, user_id: int, issue_id: int, note: str):
 def get_issue_notes(session: Session, user_id: int, issue_id: int):
     """Dohvata sve napomene za određeni issue"""
     
-    # Provjera da li je korisnik upravnik
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo upravnici mogu pristupiti napomenama.")
-    
     # Provjera da li issue postoji
     issue = session.get(Issue, issue_id)
     if not issue:
@@ -615,15 +607,6 @@ def get_issue_notes_for_tenant(session: Session, user_id: int, issue_id: int):
 def create_issue_note(session: Session, user_id: int, issue_id: int, note: str):
     """Kreira novu napomenu za issue"""
     
-    # Provjera da li je korisnik upravnik
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo upravnici mogu slati napomene.")
-    
     # Provjera da li issue postoji
     issue = session.get(Issue, issue_id)
     if not issue:
@@ -649,20 +632,11 @@ def create_issue_note(session: Session, user_id: int, issue_id: int, note: str):
         "user_id": user_id
     }
 
-def get_other_issues_for_manager(session: Session, user_id: int, filters: dict, page: int = 1, page_size: int = 10):
+def get_other_issues_for_manager(session: Session, user_id: int, filters: dict, page: int = 1, page_size: int = 10, cursor: Optional[str] = None):
     """Dohvaća sve issue-e koji NISU 'Primljeno' za upravnike"""
     
-    # Provjera da li je korisnik upravnik
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or "upravnik" not in role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo upravnici mogu pristupiti ovim podacima.")
-    
     # Dohvati sve issue-e koji NISU 'Primljeno'
-    issues = get_issues_for_manager_complete(session, filters, page, page_size)
+    issues = _get_manager_issues_page(get_issues_for_manager_complete, session, filters, page, page_size, cursor)
 
     result = []
     for issue in issues:
@@ -693,7 +667,7 @@ def get_other_issues_for_manager(session: Session, user_id: int, filters: dict,
         }
         result.append(issue_dict)
 
-    return result
+    return _manager_cursor_page(issues, result, filters, page_size, cursor)
 
 def get_issue_completion_data_for_tenant(session: Session, user_id: int, issue_id: int):
     """Dohvati completion podatke za završeni issue (za stanare)"""
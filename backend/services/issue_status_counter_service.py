@@ -0,0 +1,40 @@
+from sqlmodel import Session
+from repositories.issue_status_counter_repository import rebuild_status_counters
+from typing import Optional
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Rekoncilijacija brojača (issue_status_counter): ispravlja odstupanja nastala
+# izmjenama mimo servisa (ručni SQL, import) i puni tabelu nakon prvog deploy-a.
+
+def reconcile_status_counters(session: Session) -> bool:
+    """Vraća False ako je rekoncilijacija preskočena jer već radi u drugom procesu"""
+    if not rebuild_status_counters(session):
+        logger.info("Rekoncilijacija brojača već radi u drugom procesu, preskočeno")
+        return False
+    logger.info("Brojači statusa prijava ponovo izračunati")
+    return True
+
+def status_counter_reconcile_interval() -> float:
+    """Razmak između rekoncilijacija u sekundama; 0 isključuje pozadinski zadatak u ovom procesu"""
+    return float(os.getenv("STATUS_COUNTER_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+async def status_counter_reconcile_loop(engine, interval_seconds: Optional[float] = None) -> None:
+    """Pozadinski zadatak: rekoncilijacija odmah pri pokretanju, zatim periodično"""
+    interval = interval_seconds or status_counter_reconcile_interval()
+
+    def run_once():
+        with Session(engine) as session:
+            reconcile_status_counters(session)
+
+    while True:
+        try:
+            await asyncio.to_thread(run_once)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Rekoncilijacija brojača nije uspjela")
+        await asyncio.sleep(interval)
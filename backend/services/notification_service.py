@@ -1,38 +1,68 @@
 from sqlmodel import Session
 from models import Notification, Issue
 from repositories.notification_repository import (
-    create_notification, get_notifications_for_user, mark_notification_as_read, mark_all_notifications_as_read
+    create_notification, get_notifications_for_user, mark_notification_as_read, mark_all_notifications_as_read,
+    count_unread_notifications
 )
 from fastapi import HTTPException, status
-from schemas.notification_schema import NotificationCreate, NotificationRead
+from schemas.notification_schema import NotificationCreate, NotificationRead, MarkAllReadResponse
+from typing import Optional
+from notification_broker import broker, user_channel
 
-def create_new_notification(session: Session, data: NotificationCreate) -> Notification:
-    notification = Notification(
+def _new_notification(data: NotificationCreate) -> Notification:
+    return Notification(
         user_id=data.user_id,
         issue_id=data.issue_id,
         old_status=data.old_status,
         new_status=data.new_status,
         changed_by=data.changed_by,
     )
-    return create_notification(session, notification)
-
-def get_user_notifications(session: Session, user_id: int):
-    notifications = get_notifications_for_user(session, user_id)
-    result = []
-    for n in notifications:
-        issue = session.get(Issue, n.issue_id) if n.issue_id else None
-        result.append(NotificationRead(
-            id=n.id,
-            user_id=n.user_id,
-            issue_id=n.issue_id,
-            old_status=n.old_status,
-            new_status=n.new_status,
-            changed_by=n.changed_by,
-            is_read=n.is_read,
-            created_at=n.created_at,
-            issue_title=issue.title if issue else None
-        ))
-    return result
+
+def create_new_notification(session: Session, data: NotificationCreate) -> Notification:
+    notification = create_notification(session, _new_notification(data))
+    publish_notification(session, notification)
+    return notification
+
+def stage_notification(session: Session, data: NotificationCreate) -> Notification:
+    """Dodaje notifikaciju u sesiju bez commit-a; publish_notification se zove nakon commit-a"""
+    notification = _new_notification(data)
+    session.add(notification)
+    session.flush()
+    return notification
+
+def publish_notification(session: Session, notification: Notification) -> None:
+    # Push otvorenim streamovima korisnika (nakon commit-a); issue je obično već u sesiji
+    issue = session.get(Issue, notification.issue_id) if notification.issue_id else None
+    broker.publish(user_channel(notification.user_id), {
+        "type": "notification",
+        "data": _to_notification_read(notification, issue.title if issue else None).model_dump(mode="json")
+    })
+
+def _to_notification_read(n: Notification, issue_title: Optional[str]) -> NotificationRead:
+    return NotificationRead(
+        id=n.id,
+        user_id=n.user_id,
+        issue_id=n.issue_id,
+        old_status=n.old_status,
+        new_status=n.new_status,
+        changed_by=n.changed_by,
+        is_read=n.is_read,
+        created_at=n.created_at,
+        issue_title=issue_title
+    )
+
+def get_user_notifications(
+    session: Session,
+    user_id: int,
+    limit: Optional[int] = None,
+    before_id: Optional[int] = None,
+    unread_only: bool = False
+):
+    rows = get_notifications_for_user(session, user_id, limit, before_id, unread_only)
+    return [_to_notification_read(n, issue_title) for n, issue_title in rows]
+
+def get_unread_count(session: Session, user_id: int) -> dict:
+    return {"unread_count": count_unread_notifications(session, user_id)}
 
 def mark_notification_read(session: Session, notification_id: int, user_id: int):
     notification = mark_notification_as_read(session, notification_id, user_id)
@@ -40,5 +70,6 @@ def mark_notification_read(session: Session, notification_id: int, user_id: int)
         raise HTTPException(status_code=404, detail="Notifikacija nije pronađena ili nemate dozvolu.")
     return notification
 
-def mark_all_read(session: Session, user_id: int):
-    return mark_all_notifications_as_read(session, user_id) 
\ No newline at end of file
+def mark_all_read(session: Session, user_id: int) -> MarkAllReadResponse:
+    ids = mark_all_notifications_as_read(session, user_id)
+    return MarkAllReadResponse(count=len(ids), ids=ids) 
\ No newline at end of file
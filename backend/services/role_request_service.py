@@ -87,15 +87,6 @@ def get_all_role_requests(session: Session, status: Optional[str] = None) -> Lis
     return result
 
 def update_role_request(session: Session, request_id: int, data: RoleRequestUpdate, admin_id: int) -> RoleRequestRead:
-    # Provjera da li je korisnik admin
-    admin_user = session.get(User, admin_id)
-    if not admin_user:
-        raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
-    
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu odobravati zahtjeve.")
-    
     # Provjera da li zahtjev postoji
     role_request = get_role_request_by_id(session, request_id)
     if not role_request:
@@ -7,23 +7,14 @@ from repositories.survey_repository import (
     get_survey_stats
 )
 from schemas.survey_schema import SurveyCreate, SurveyRead, SurveyResponse
-from models import User, Role, Survey
+from models import User, Survey
 from fastapi import HTTPException
-from typing import List
+from typing import List, Optional
+from datetime import date, datetime, time, timedelta
 
 def create_survey_service(session: Session, user_id: int, survey_data: SurveyCreate) -> SurveyResponse:
     """Kreira novu survey prijavu"""
     
-    # Provjera da li korisnik postoji
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    # Provjera da li je korisnik stanar ili izvođač
-    role = session.get(Role, user.role_id)
-    if not role or ("stanar" not in role.name.lower() and "izvođač" not in role.name.lower()):
-        raise HTTPException(status_code=403, detail="Samo stanari i izvođači mogu slati prijave nezadovoljstva.")
-    
     # Kreiranje survey objekta
     survey_dict = {
         "tenant_id": user_id,  # tenant_id se koristi za sve korisnike (stanari i izvođači)
@@ -69,15 +60,6 @@ def get_user_surveys_service(session: Session, user_id: int) -> List[SurveyRead]
 def get_all_surveys_service(session: Session, user_id: int) -> List[dict]:
     """Dohvaća sve survey prijave (samo za admin/manager)"""
     
-    # Provjera da li je korisnik admin ili manager
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
-    
-    role = session.get(Role, user.role_id)
-    if not role or ("admin" not in role.name.lower() and "upravnik" not in role.name.lower()):
-        raise HTTPException(status_code=403, detail="Nemate dozvolu za pristup ovim podacima.")
-    
     # Dohvati survey-e sa tenant podacima
     statement = select(Survey, User).join(User, Survey.tenant_id == User.id).order_by(Survey.created_at.desc())
     results = session.exec(statement).all()
@@ -104,23 +86,23 @@ def get_all_surveys_service(session: Session, user_id: int) -> List[dict]:
     
     return surveys_with_tenant
 
-def get_survey_stats_service(session: Session, user_id: int) -> dict:
-    """Dohvaća statistike survey prijava (samo za admin/manager)"""
-    
-    # Provjera da li je korisnik admin ili manager
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Korisnik nije pronađen.")
+def get_survey_stats_service(session: Session, user_id: int, date_from: Optional[date] = None, date_to: Optional[date] = None) -> dict:
+    """Dohvaća statistike survey prijava (samo za admin/manager), opciono za period [date_from, date_to]"""
     
-    role = session.get(Role, user.role_id)
-    if not role or ("admin" not in role.name.lower() and "upravnik" not in role.name.lower()):
-        raise HTTPException(status_code=403, detail="Nemate dozvolu za pristup ovim podacima.")
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="Početni datum mora biti prije krajnjeg.")
     
-    stats = get_survey_stats(session)
+    # date_to uključuje cijeli taj dan
+    stats = get_survey_stats(
+        session,
+        datetime.combine(date_from, time.min) if date_from else None,
+        datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None
+    )
     
     # Preimenuj satisfaction_stats u satisfaction_levels
     return {
         "total_surveys": stats["total_surveys"],
         "satisfaction_levels": stats["satisfaction_stats"],
-        "categories": stats["category_stats"]
+        "categories": stats["category_stats"],
+        "category_satisfaction": stats["category_satisfaction"]
     }
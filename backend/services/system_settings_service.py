@@ -2,7 +2,6 @@ from sqlmodel import Session
 from models.system_settings_model import SystemSettings
 from repositories.system_settings_repository import get_system_settings, create_system_settings, update_system_settings
 from schemas.system_settings_schema import SystemSettingsUpdate, SystemSettingsRead
-from fastapi import HTTPException
 from typing import Optional
 
 def get_settings(session: Session) -> SystemSettingsRead:
@@ -23,18 +22,6 @@ def get_settings(session: Session) -> SystemSettingsRead:
     )
 
 def update_settings(session: Session, data: SystemSettingsUpdate, admin_id: int) -> SystemSettingsRead:
-    # Provjera da li je korisnik admin
-    from models.user_model import User
-    from models.role_model import Role
-    
-    admin_user = session.get(User, admin_id)
-    if not admin_user:
-        raise HTTPException(status_code=404, detail="Admin korisnik nije pronađen.")
-    
-    admin_role = session.get(Role, admin_user.role_id)
-    if not admin_role or "admin" not in admin_role.name.lower():
-        raise HTTPException(status_code=403, detail="Samo administratori mogu mijenjati sistemske postavke.")
-    
     # Ažuriranje postavki
     updated_settings = update_system_settings(
         session,
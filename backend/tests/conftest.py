@@ -0,0 +1,139 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# Testovi rade nad SQLite fajlom (ili TEST_DATABASE_URL); varijable moraju biti
+# postavljene prije importa database.py / auth.py
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ["DATABASE_URL"] = os.getenv(
+    "TEST_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'fixtrack_test.db')}"
+)
+os.environ["SECRET_KEY"] = "test-secret"
+sys.path.insert(0, BACKEND_DIR)
+# main.py montira StaticFiles("media") relativno na backend/
+os.chdir(BACKEND_DIR)
+
+import jwt
+import pytest
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session
+
+import auth
+from dashboard_cache import invalidate_dashboard_cache
+from database import engine
+from models import Role, User, IssueCategory, Issue
+
+ROLE_NAMES = ["Stanar", "Upravnik", "Izvođač", "Admin"]
+
+@pytest.fixture(autouse=True)
+def db():
+    """Prazna baza za svaki test"""
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    auth.invalidate_role_cache()
+    invalidate_dashboard_cache()
+    yield engine
+
+@pytest.fixture
+def session(db):
+    with Session(engine) as session:
+        yield session
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+@pytest.fixture
+def count_queries():
+    """with count_queries() as counter: ... -> counter.count SQL naredbi nad engine-om"""
+    @contextmanager
+    def counting():
+        counter = QueryCounter()
+        event.listen(engine, "before_cursor_execute", counter)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, "before_cursor_execute", counter)
+    return counting
+
+@pytest.fixture
+def roles(session):
+    """Uloge sa istim ID-evima kao u produkciji: Stanar=1, Upravnik=2, Izvođač=3, Admin=4"""
+    created = {name: Role(name=name) for name in ROLE_NAMES}
+    session.add_all(created.values())
+    session.commit()
+    return {name: role.id for name, role in created.items()}
+
+@pytest.fixture
+def make_user(session, roles):
+    counter = {"n": 0}
+
+    def make(role: str = "Stanar", **fields) -> User:
+        counter["n"] += 1
+        user = User(
+            role_id=roles[role],
+            full_name=fields.pop("full_name", f"{role} {counter['n']}"),
+            email=fields.pop("email", f"user{counter['n']}@test.ba"),
+            password_hash="x",
+            **fields
+        )
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        return user
+    return make
+
+@pytest.fixture
+def category(session):
+    category = IssueCategory(name="Vodoinstalacije")
+    session.add(category)
+    session.commit()
+    session.refresh(category)
+    return category
+
+@pytest.fixture
+def make_issues(session, category):
+    def make(tenant: User, count: int, **fields) -> list:
+        base = datetime(2025, 1, 1)
+        issues = [
+            Issue(**{
+                "tenant_id": tenant.id,
+                "category_id": category.id,
+                "title": f"Kvar {i}",
+                "description": "Curi voda",
+                "location": "Stan 4",
+                "created_at": base + timedelta(hours=i),
+                **fields
+            })
+            for i in range(count)
+        ]
+        session.add_all(issues)
+        session.commit()
+        return issues
+    return make
+
+@pytest.fixture
+def auth_headers():
+    """auth_headers(user) -> Authorization header sa JWT-om kakav izdaje /auth/login"""
+    def headers(user: User) -> dict:
+        token = jwt.encode(
+            {"sub": str(user.id), "email": user.email, "role_id": user.role_id, "exp": datetime.utcnow() + timedelta(hours=1)},
+            auth.SECRET_KEY,
+            algorithm=auth.ALGORITHM
+        )
+        return {"Authorization": f"Bearer {token}"}
+    return headers
+
+@pytest.fixture
+def client():
+    # Bez "with" - lifespan (pozadinski zadaci) se ne pokreće u testovima
+    from fastapi.testclient import TestClient
+    from main import app
+    return TestClient(app)
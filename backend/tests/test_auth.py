@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta
+import jwt
+import pytest
+import auth
+
+# Endpoint-i koji su imali vlastitu kopiju dekodiranja tokena, sada Depends(get_current_user)
+PROTECTED = ["/auth/profile", "/api/surveys/my", "/api/role-requests/my", "/api/contractor/assignment-notifications"]
+
+@pytest.mark.parametrize("path", PROTECTED)
+def test_missing_token_is_rejected(client, path):
+    response = client.get(path)
+    assert (response.status_code, response.json()["detail"]) == (401, "Nedostaje token.")
+
+@pytest.mark.parametrize("path", PROTECTED)
+def test_expired_token_is_rejected(client, make_user, path):
+    user = make_user("Izvođač")
+    token = jwt.encode(
+        {"sub": str(user.id), "role_id": user.role_id, "exp": datetime.utcnow() - timedelta(minutes=1)},
+        auth.SECRET_KEY,
+        algorithm=auth.ALGORITHM
+    )
+    response = client.get(path, headers={"Authorization": f"Bearer {token}"})
+    assert (response.status_code, response.json()["detail"]) == (401, "Token je istekao.")
+
+@pytest.mark.parametrize("path", PROTECTED)
+def test_valid_token_is_accepted(client, make_user, auth_headers, path):
+    user = make_user("Izvođač")
+    assert client.get(path, headers=auth_headers(user)).status_code == 200
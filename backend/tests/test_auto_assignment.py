@@ -0,0 +1,96 @@
+import itertools
+import pytest
+from sqlmodel import select
+from models import Assignment, Issue, SystemSettings
+from services.auto_assignment_service import ContractorCandidate, pick_contractor, run_auto_assignment
+
+@pytest.fixture
+def auto_assignment(session):
+    settings = SystemSettings(auto_assignment=True)
+    session.add(settings)
+    session.commit()
+    return settings
+
+@pytest.fixture
+def tenant(make_user):
+    return make_user("Stanar")
+
+def _give(session, contractor, issues, status):
+    session.add_all([Assignment(issue_id=issue.id, contractor_id=contractor.id, status=status) for issue in issues])
+    session.commit()
+
+def _assignments(session, issue_ids):
+    statement = select(Assignment.issue_id, Assignment.contractor_id).where(Assignment.issue_id.in_(issue_ids))
+    return dict(session.exec(statement).all())
+
+def test_nothing_is_assigned_when_auto_assignment_is_off(session, make_user, make_issues, tenant):
+    make_user("Izvođač")
+    issues = make_issues(tenant, 2)
+
+    # Bez postavki i sa isključenom dodjelom
+    assert run_auto_assignment(session) == []
+    session.add(SystemSettings(auto_assignment=False))
+    session.commit()
+    assert run_auto_assignment(session) == []
+
+    assert _assignments(session, [issue.id for issue in issues]) == {}
+    assert {issue.status for issue in session.exec(select(Issue))} == {"Primljeno"}
+
+def test_lowest_active_load_wins(session, auto_assignment, make_user, make_issues, tenant):
+    busy = make_user("Izvođač")
+    free = make_user("Izvođač")
+    _give(session, busy, make_issues(tenant, 2, status="Dodijeljeno izvođaču"), "Popravka u toku")
+    issue = make_issues(tenant, 1)[0]
+
+    assert run_auto_assignment(session) == [(issue.id, free.id)]
+
+def test_category_history_breaks_ties(session, auto_assignment, make_user, make_issues, tenant):
+    newcomer = make_user("Izvođač")
+    experienced = make_user("Izvođač")
+    _give(session, experienced, make_issues(tenant, 2, status="Završeno"), "Završeno")
+    issue = make_issues(tenant, 1)[0]
+
+    assert newcomer.id < experienced.id
+    assert run_auto_assignment(session) == [(issue.id, experienced.id)]
+
+def test_location_tokens_break_ties(session, auto_assignment, make_user, make_issues, tenant):
+    make_user("Izvođač", address="Zmaja od Bosne 8, Sarajevo")
+    nearby = make_user("Izvođač", address="Titova 12, Sarajevo")
+    issue = make_issues(tenant, 1, location="Titova 5, ulaz B")[0]
+
+    assert run_auto_assignment(session) == [(issue.id, nearby.id)]
+
+def test_tie_order_is_stable(session, auto_assignment, make_user, make_issues, tenant):
+    first = make_user("Izvođač")
+    make_user("Izvođač")
+    make_user("Izvođač")
+    issue = make_issues(tenant, 1)[0]
+
+    # Isti izbor bez obzira na redoslijed kandidata
+    candidates = [ContractorCandidate(id=i, active_count=0, location_tokens=set()) for i in (3, 1, 2)]
+    picks = {pick_contractor(list(order), issue.category_id, set()).id for order in itertools.permutations(candidates)}
+    assert picks == {1}
+
+    assert run_auto_assignment(session) == [(issue.id, first.id)]
+
+def test_batch_size_is_honoured(session, auto_assignment, make_user, make_issues, tenant):
+    make_user("Izvođač")
+    make_user("Izvođač")
+    issues = make_issues(tenant, 5)
+
+    assigned = run_auto_assignment(session, batch_size=2)
+
+    # Najstarije prijave prve; opterećenje se ažurira unutar serije
+    assert [issue_id for issue_id, _ in assigned] == [issues[0].id, issues[1].id]
+    assert len({contractor_id for _, contractor_id in assigned}) == 2
+    assert set(_assignments(session, [issue.id for issue in issues])) == {issues[0].id, issues[1].id}
+
+def test_already_assigned_issues_are_left_alone(session, auto_assignment, make_user, make_issues, tenant):
+    manual = make_user("Izvođač")
+    other = make_user("Izvođač")
+    assigned_issue, pending_issue = make_issues(tenant, 2)
+    _give(session, manual, [assigned_issue], "Dodijeljeno")
+
+    assert run_auto_assignment(session) == [(pending_issue.id, other.id)]
+    assert _assignments(session, [assigned_issue.id]) == {assigned_issue.id: manual.id}
+    assert len(session.exec(select(Assignment).where(Assignment.issue_id == assigned_issue.id)).all()) == 1
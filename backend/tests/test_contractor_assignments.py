@@ -0,0 +1,42 @@
+from sqlmodel import Session
+from database import engine
+from models import Assignment, IssueImage
+from services.assignment_service import get_contractor_assignments
+
+def _assign(session, contractor, issues):
+    for issue in issues:
+        session.add(Assignment(issue_id=issue.id, contractor_id=contractor.id))
+        session.add(IssueImage(issue_id=issue.id, image_url=f"/media/issues/{issue.id}.jpg"))
+    session.commit()
+
+def _count_for(contractor_id, count_queries) -> int:
+    # Nova sesija, da identity map ne sakrije lazy load-ove
+    with Session(engine) as fresh, count_queries() as counter:
+        get_contractor_assignments(fresh, contractor_id)
+    return counter.count
+
+def test_contractor_assignments_query_count_is_constant(session, make_user, make_issues, count_queries):
+    small = make_user("Izvođač")
+    large = make_user("Izvođač")
+    _assign(session, small, make_issues(make_user("Stanar"), 5))
+    # Svaka prijava od drugog stanara, da i učitavanje stanara bude po svim redovima
+    _assign(session, large, [issue for _ in range(100) for issue in make_issues(make_user("Stanar"), 5)])
+    small_id, large_id = small.id, large.id
+
+    with Session(engine) as fresh:
+        assert len(get_contractor_assignments(fresh, large_id)) == 500
+    assert _count_for(large_id, count_queries) == _count_for(small_id, count_queries)
+
+def test_contractor_assignments_include_issue_details(session, make_user, make_issues):
+    contractor = make_user("Izvođač")
+    tenant = make_user("Stanar")
+    issues = make_issues(tenant, 3)
+    _assign(session, contractor, issues)
+
+    assignments = get_contractor_assignments(session, contractor.id)
+
+    assert {a["issue_id"] for a in assignments} == {issue.id for issue in issues}
+    for assignment in assignments:
+        assert assignment["issue"]["category"]["name"] == "Vodoinstalacije"
+        assert assignment["issue"]["tenant"]["id"] == tenant.id
+        assert len(assignment["issue"]["images"]) == 1
@@ -0,0 +1,47 @@
+from sqlmodel import Session
+from database import engine
+from dashboard_cache import get_or_compute, invalidate_dashboard_cache
+from repositories.issue_status_counter_repository import rebuild_status_counters
+from repositories.issue_status_history_repository import record_status_change
+from services.dashboard_service import get_manager_dashboard_data
+
+def _manager_stats(manager_id, count_queries):
+    with Session(engine) as fresh, count_queries() as counter:
+        stats = get_manager_dashboard_data(fresh, manager_id).stats
+    counter_reads = [statement for statement in counter.statements if "issue_status_counter" in statement]
+    return stats, len(counter_reads)
+
+def test_manager_stats_are_served_from_cache_until_a_status_change_commits(session, make_user, make_issues, count_queries):
+    manager = make_user("Upravnik")
+    issue = make_issues(make_user("Stanar"), 3)[0]
+    assert rebuild_status_counters(session)
+    manager_id = manager.id
+
+    stats, reads = _manager_stats(manager_id, count_queries)
+    assert (stats.pending_assignment, reads) == (3, 1)
+    stats, reads = _manager_stats(manager_id, count_queries)
+    assert (stats.pending_assignment, reads) == (3, 0)
+
+    # Promjena koja se poništi (rollback) ne dira keš
+    record_status_change(session, issue, "Popravka u toku")
+    session.rollback()
+    assert _manager_stats(manager_id, count_queries)[1] == 0
+
+    # Commit promjene statusa poništava keš
+    record_status_change(session, issue, "Popravka u toku")
+    session.commit()
+    stats, reads = _manager_stats(manager_id, count_queries)
+    assert (stats.pending_assignment, stats.in_progress, reads) == (2, 1, 1)
+
+def test_value_computed_during_invalidation_is_not_served():
+    calls = []
+
+    def compute_racing_with_commit():
+        calls.append(1)
+        # Commit druge transakcije završi dok se vrijednost još računa
+        invalidate_dashboard_cache()
+        return {"total": len(calls)}
+
+    assert get_or_compute("race", compute_racing_with_commit) == {"total": 1}
+    assert get_or_compute("race", lambda: {"total": 2}) == {"total": 2}
+    assert get_or_compute("race", lambda: {"total": 3}) == {"total": 2}
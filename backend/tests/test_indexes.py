@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event, insert, text
+from sqlmodel import select
+from database import engine
+from models import Issue, Assignment, Notification, AssignmentNotification
+from repositories.issue_repository import get_user_issue_history, get_issues_for_manager
+from repositories.notification_repository import get_notifications_for_user, count_unread_notifications
+from repositories.assignment_repository import get_assignments_for_contractor
+from repositories.assignment_notification_repository import get_assignment_notifications_for_contractor
+from repositories.dashboard_repository import (
+    get_tenant_dashboard_stats, get_manager_dashboard_stats, get_contractor_dashboard_stats
+)
+from repositories.issue_status_counter_repository import rebuild_status_counters
+
+FILTERS = {"search": None, "category": None, "status": None, "date_from": None, "date_to": None, "sort_by": "created_at_desc"}
+
+# Veličina seed-a: dovoljno redova da planer (nakon ANALYZE) bira indeks zbog selektivnosti
+TENANTS = 50
+ISSUES_PER_TENANT = 100
+CONTRACTORS = 20
+# Raspodjela statusa: "Primljeno" je manjina, kao u produkciji
+STATUSES = ["Završeno"] * 6 + ["Popravka u toku", "Dodijeljeno izvođaču", "Odbijeno", "Primljeno"]
+
+# Primarni ključ brojača (scope, scope_id, status) se zove različito po bazi
+COUNTER_PK = "issue_status_counter_pkey" if engine.dialect.name == "postgresql" else "sqlite_autoindex_issue_status_counter_1"
+
+@pytest.fixture
+def seeded(session, make_user, category):
+    """Baza sa ~5000 prijava, assignment-ima i notifikacijama, sa ažurnom statistikom planera"""
+    tenants = [make_user("Stanar") for _ in range(TENANTS)]
+    contractors = [make_user("Izvođač") for _ in range(CONTRACTORS)]
+    base = datetime(2024, 1, 1)
+    session.execute(insert(Issue), [
+        {
+            "tenant_id": tenant.id,
+            "category_id": category.id,
+            "title": f"Kvar {i}",
+            "status": STATUSES[i % len(STATUSES)],
+            "created_at": base + timedelta(hours=t * ISSUES_PER_TENANT + i),
+        }
+        for t, tenant in enumerate(tenants)
+        for i in range(ISSUES_PER_TENANT)
+    ])
+    issues = session.exec(select(Issue.id, Issue.tenant_id, Issue.status)).all()
+    assigned = [issue for issue in issues if issue.status != "Primljeno"]
+    session.execute(insert(Assignment), [
+        {"issue_id": issue.id, "contractor_id": contractors[n % CONTRACTORS].id, "status": "Završeno" if issue.status == "Završeno" else "Popravka u toku"}
+        for n, issue in enumerate(assigned)
+    ])
+    session.execute(insert(Notification), [
+        {"user_id": issue.tenant_id, "issue_id": issue.id, "changed_by": "Upravnik", "is_read": n % 5 != 0, "created_at": base + timedelta(minutes=n)}
+        for n, issue in enumerate(issues)
+    ])
+    assignment_ids = session.exec(select(Assignment.id, Assignment.issue_id, Assignment.contractor_id)).all()
+    session.execute(insert(AssignmentNotification), [
+        {
+            "contractor_id": row.contractor_id, "assignment_id": row.id, "issue_id": row.issue_id,
+            "notification_type": "new_assignment", "assigned_by": "Upravnik", "message": "Novi zadatak",
+            "created_at": base + timedelta(minutes=n)
+        }
+        for n, row in enumerate(assignment_ids)
+    ])
+    session.commit()
+    assert rebuild_status_counters(session)
+    session.execute(text("ANALYZE"))
+    session.commit()
+    return {"tenant_id": tenants[0].id, "contractor_id": contractors[0].id}
+
+def _explain(statement, parameters) -> str:
+    """Plan izvršavanja upita kao tekst (SQLite: EXPLAIN QUERY PLAN, PostgreSQL: EXPLAIN)"""
+    prefix = "EXPLAIN" if engine.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN"
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"{prefix} {statement}", parameters).fetchall()
+    return "\n".join(str(row[-1]) for row in rows)
+
+def _plans(call) -> str:
+    """Izvršava call() i vraća planove svih SELECT upita koje je poslao"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert captured
+    return "\n".join(_explain(statement, parameters) for statement, parameters in captured)
+
+@pytest.mark.parametrize("index_names, call", [
+    (["ix_issue_tenant_id_created_at"], lambda session, seed: get_user_issue_history(session, seed["tenant_id"], dict(FILTERS))),
+    (["ix_issue_status_created_at"], lambda session, seed: get_issues_for_manager(session, dict(FILTERS))),
+    (["ix_notification_user_id_created_at"], lambda session, seed: get_notifications_for_user(session, seed["tenant_id"], limit=20)),
+    (["ix_notification_user_id_unread"], lambda session, seed: count_unread_notifications(session, seed["tenant_id"])),
+    (["ix_assignment_contractor_id_status"], lambda session, seed: get_assignments_for_contractor(session, seed["contractor_id"], "Završeno")),
+    (["ix_assignmentnotification_contractor_id_created_at"], lambda session, seed: get_assignment_notifications_for_contractor(session, seed["contractor_id"])),
+    ([COUNTER_PK, "ix_issue_tenant_id_created_at"], lambda session, seed: get_tenant_dashboard_stats(session, seed["tenant_id"])),
+    ([COUNTER_PK], lambda session, seed: get_manager_dashboard_stats(session, seed["tenant_id"])),
+    ([COUNTER_PK], lambda session, seed: get_contractor_dashboard_stats(session, seed["contractor_id"])),
+], ids=[
+    "issue_history", "manager_queue", "notifications", "unread_count", "contractor_assignments",
+    "assignment_notifications", "tenant_dashboard_stats", "manager_dashboard_stats", "contractor_dashboard_stats",
+])
+def test_hot_path_queries_use_index_on_seeded_data(session, seeded, index_names, call):
+    plan = _plans(lambda: call(session, seeded))
+    for index_name in index_names:
+        assert index_name in plan, plan
@@ -0,0 +1,39 @@
+from sqlmodel import Session
+from database import engine
+from models import Comment, Rating
+from services.issue_service import get_user_issue_history
+
+FILTERS = {"search": None, "category": None, "status": None, "date_from": None, "date_to": None, "sort_by": "created_at_desc"}
+
+def _seed_history(session, make_user, make_issues, count):
+    tenant = make_user("Stanar")
+    issues = make_issues(tenant, count)
+    for i, issue in enumerate(issues):
+        session.add_all([Comment(issue_id=issue.id, user_id=tenant.id, content="komentar") for _ in range(i % 3)])
+        if i % 2 == 0:
+            session.add(Rating(issue_id=issue.id, tenant_id=tenant.id, score=4))
+    session.commit()
+    return tenant, issues
+
+def test_issue_history_query_count_does_not_grow_with_page_size(session, make_user, make_issues, count_queries):
+    tenant, _ = _seed_history(session, make_user, make_issues, 40)
+    tenant_id = tenant.id
+
+    # Svako mjerenje u novoj sesiji, da identity map ne sakrije lazy load-ove
+    with Session(engine) as fresh, count_queries() as small:
+        get_user_issue_history(fresh, tenant_id, dict(FILTERS), page=1, page_size=5)
+    with Session(engine) as fresh, count_queries() as large:
+        get_user_issue_history(fresh, tenant_id, dict(FILTERS), page=1, page_size=40)
+
+    assert large.count == small.count
+
+def test_issue_history_counts_comments_and_ratings_per_issue(session, make_user, make_issues):
+    tenant, issues = _seed_history(session, make_user, make_issues, 6)
+
+    history, total = get_user_issue_history(session, tenant.id, dict(FILTERS), page=1, page_size=10)
+
+    assert total == 6
+    by_id = {item["id"]: item for item in history}
+    for i, issue in enumerate(issues):
+        assert by_id[issue.id]["commentsCount"] == i % 3
+        assert by_id[issue.id]["rating"] == (4 if i % 2 == 0 else None)
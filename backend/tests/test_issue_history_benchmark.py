@@ -0,0 +1,74 @@
+import os
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert
+from sqlmodel import Session, select
+from database import engine
+from models import Issue, Assignment
+from repositories.issue_repository import get_user_issue_history
+
+# Benchmark historije za stanara sa puno prijava (HISTORY_BENCHMARK_ISSUES, min. 10k)
+HISTORY_BENCHMARK_ISSUES = max(int(os.getenv("HISTORY_BENCHMARK_ISSUES", "10000")), 10000)
+PAGE_SIZE = 20
+
+FILTERS = {"search": None, "category": None, "status": None, "date_from": None, "date_to": None, "sort_by": "created_at_desc"}
+
+def _seed_tenant(session, tenant, contractor, category):
+    base = datetime(2020, 1, 1)
+    session.execute(insert(Issue), [
+        {
+            "tenant_id": tenant.id,
+            "category_id": category.id,
+            "title": f"Kvar {i}",
+            "description": "Curi voda",
+            "location": "Stan 4",
+            "status": "Završeno" if i % 4 else "Primljeno",
+            "created_at": base + timedelta(minutes=i),
+        }
+        for i in range(HISTORY_BENCHMARK_ISSUES)
+    ])
+    issue_ids = session.exec(select(Issue.id).where(Issue.tenant_id == tenant.id)).all()
+    # Svaka druga prijava ima assignment, da eager load izvođača ima šta učitati
+    session.execute(insert(Assignment), [
+        {"issue_id": issue_id, "contractor_id": contractor.id, "status": "Završeno"}
+        for issue_id in issue_ids[::2]
+    ])
+    session.commit()
+
+def _measure_page(tenant_id: int, page: int, count_queries) -> dict:
+    loaded = []
+
+    def on_load(target, context):
+        loaded.append(target)
+
+    event.listen(Issue, "load", on_load)
+    try:
+        with Session(engine) as fresh, count_queries() as counter:
+            started = time.perf_counter()
+            issues, total = get_user_issue_history(fresh, tenant_id, dict(FILTERS), page=page, page_size=PAGE_SIZE)
+            elapsed = time.perf_counter() - started
+    finally:
+        event.remove(Issue, "load", on_load)
+    return {"issues": issues, "total": total, "loaded": len(loaded), "statements": counter.count, "elapsed": elapsed}
+
+def test_issue_history_page_cost_is_bounded_by_page_size(session, make_user, category, count_queries):
+    tenant = make_user("Stanar")
+    contractor = make_user("Izvođač")
+    _seed_tenant(session, tenant, contractor, category)
+    tenant_id = tenant.id
+    last_page = HISTORY_BENCHMARK_ISSUES // PAGE_SIZE
+
+    first = _measure_page(tenant_id, 1, count_queries)
+    deep = _measure_page(tenant_id, last_page, count_queries)
+
+    print(
+        f"\nHistorija, {HISTORY_BENCHMARK_ISSUES} prijava, page_size={PAGE_SIZE}: "
+        f"prva stranica {first['elapsed'] * 1000:.1f} ms, stranica {last_page} {deep['elapsed'] * 1000:.1f} ms"
+    )
+    for result in (first, deep):
+        assert result["total"] == HISTORY_BENCHMARK_ISSUES
+        assert len(result["issues"]) == PAGE_SIZE
+        # Iz baze se učitava samo tražena stranica, ne sve prijave stanara
+        assert result["loaded"] == PAGE_SIZE
+    # count + stranica + eager load-ovi; broj upita ne zavisi od stranice ni od broja prijava
+    assert first["statements"] == deep["statements"] <= 5
@@ -0,0 +1,47 @@
+import re
+from pathlib import Path
+import pytest
+from sqlalchemy.dialects import postgresql
+from database import engine
+from repositories.issue_search_repository import build_tsquery, search_text
+from services.issue_service import get_user_issue_history
+
+FILTERS = {"search": None, "category": None, "status": None, "date_from": None, "date_to": None, "sort_by": "created_at_desc"}
+
+MIGRATIONS = Path(__file__).resolve().parent.parent / "migrations"
+
+def _titles(session, tenant_id, search):
+    history, total = get_user_issue_history(session, tenant_id, {**FILTERS, "search": search}, page=1, page_size=10)
+    assert total == len(history)
+    return sorted(item["title"] for item in history)
+
+def _normalized(sql: str) -> str:
+    return re.sub(r"[\s()]|issue\.|::regconfig", "", sql)
+
+def test_build_tsquery_matches_word_prefixes():
+    assert build_tsquery("Kvar  VOD!") == "kvar:* & vod:*"
+    assert build_tsquery("  ,. ") is None
+
+def test_trigram_index_expression_matches_fallback_query():
+    migration = (MIGRATIONS / "007_issue_search_trgm.sql").read_text()
+    indexed = re.search(r"gin \(\s*\((.*)\) gin_trgm_ops", migration, re.S).group(1)
+    assert _normalized(indexed) == _normalized(str(search_text().compile(dialect=postgresql.dialect())))
+
+def test_search_finds_word_prefix_and_substring(session, make_user, make_issues):
+    tenant = make_user("Stanar")
+    make_issues(tenant, 1, title="Nestala struja")
+    make_issues(tenant, 1, title="Curi voda", location="Stan 12B")
+
+    assert _titles(session, tenant.id, "stru") == ["Nestala struja"]
+    # Podniz usred riječi: na PostgreSQL-u preko ILIKE fallback-a (prefiks ne nađe ništa)
+    assert _titles(session, tenant.id, "ruja") == ["Nestala struja"]
+    assert _titles(session, tenant.id, "2b") == ["Curi voda"]
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="full-text pretraga postoji samo na PostgreSQL-u")
+def test_substring_matches_are_dropped_when_a_word_prefix_matches(session, make_user, make_issues):
+    tenant = make_user("Stanar")
+    make_issues(tenant, 1, title="Voda u kupatilu")
+    make_issues(tenant, 1, title="Podvodni kabl")
+
+    # "voda" je početak riječi samo u prvoj prijavi; ILIKE bi vratio obje
+    assert _titles(session, tenant.id, "vod") == ["Voda u kupatilu"]
@@ -0,0 +1,55 @@
+from sqlmodel import Session, select
+from database import engine
+from models import Issue, IssueStatusCounter
+from schemas.issue_schema import IssueCreate
+from repositories.dashboard_repository import get_tenant_dashboard_stats
+from repositories.issue_status_counter_repository import get_status_counts, rebuild_status_counters, TENANT_SCOPE
+from repositories.issue_status_history_repository import record_status_change
+from services.issue_service import create_new_issue, create_assignment_for_issue
+
+def _all_counters(session):
+    return {
+        (row.scope, row.scope_id, row.status): row.count
+        for row in session.exec(select(IssueStatusCounter))
+        if row.count
+    }
+
+def test_counters_follow_status_changes_and_match_rebuild(session, make_user, category):
+    tenant = make_user("Stanar")
+    other = make_user("Stanar")
+    contractor = make_user("Izvođač")
+    first, second, third = [
+        create_new_issue(session, user.id, IssueCreate(title="Kvar", category_id=category.id), [])
+        for user in (tenant, tenant, other)
+    ]
+    create_assignment_for_issue(session, first, contractor.id, assigned_by="Upravnik")
+    record_status_change(session, first, "Završeno")
+    record_status_change(session, third, "Odbijeno")
+    session.commit()
+
+    tenant_counts = get_status_counts(session, TENANT_SCOPE, tenant.id)
+    assert {status: count for status, count in tenant_counts.items() if count} == {"Primljeno": 1, "Završeno": 1}
+    incremental = _all_counters(session)
+    assert rebuild_status_counters(session)
+    assert _all_counters(session) == incremental
+
+def test_tenant_dashboard_reads_counts_from_counters(session, make_user, make_issues, count_queries):
+    tenant = make_user("Stanar")
+    make_issues(tenant, 3)
+    make_issues(tenant, 2, status="Završeno")
+    make_issues(tenant, 1, status="Odbijeno")
+    assert rebuild_status_counters(session)
+    tenant_id = tenant.id
+
+    with Session(engine) as fresh, count_queries() as counter:
+        stats = get_tenant_dashboard_stats(fresh, tenant_id)
+
+    assert (stats["total_issues"], stats["in_progress"], stats["completed"]) == (6, 3, 2)
+    # Lookup brojača + jedan agregat (mjesečni broj i prosjeci) nad završenim prijavama
+    assert counter.count == 2
+
+    # Brojači su izvor ukupnog broja: prijava upisana mimo servisa se ne vidi do rekoncilijacije
+    session.add(Issue(tenant_id=tenant_id, category_id=1, title="Ručni import"))
+    session.commit()
+    with Session(engine) as fresh:
+        assert get_tenant_dashboard_stats(fresh, tenant_id)["total_issues"] == 6
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import os
+import time
+import httpx
+from database import get_async_engine
+
+# Load test async vs sync puta za isti servis (get_tenant_dashboard_data):
+#   /api/tenant/dashboard             - async def + AsyncSession.run_sync
+#   /api/contractor/tenant-dashboard  - def + Session (threadpool)
+# Po defaultu je mali da bi prošao u CI-ju; za stvarno mjerenje:
+#   TEST_DATABASE_URL=postgresql://... LOAD_TEST_REQUESTS=2000 LOAD_TEST_CONCURRENCY=100 \
+#   python -m pytest tests/test_load_async_endpoints.py -s
+LOAD_TEST_REQUESTS = int(os.getenv("LOAD_TEST_REQUESTS", "60"))
+LOAD_TEST_CONCURRENCY = int(os.getenv("LOAD_TEST_CONCURRENCY", "10"))
+
+# httpx loguje svaki zahtjev na INFO nivou
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+ASYNC_PATH = "/api/tenant/dashboard"
+SYNC_PATH = "/api/contractor/tenant-dashboard"
+
+async def _run_load(app, path: str, headers: dict) -> dict:
+    """Šalje LOAD_TEST_REQUESTS zahtjeva sa LOAD_TEST_CONCURRENCY istovremenih klijenata"""
+    statuses = []
+    remaining = iter(range(LOAD_TEST_REQUESTS))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        async def worker():
+            for _ in remaining:
+                response = await client.get(path, headers=headers)
+                statuses.append(response.status_code)
+
+        # Zagrijavanje (kreiranje engine-a i pool-a) se ne mjeri
+        await client.get(path, headers=headers)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(LOAD_TEST_CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+
+    return {"statuses": statuses, "elapsed": elapsed, "rps": len(statuses) / elapsed}
+
+def test_tenant_dashboard_throughput_async_vs_sync(client, make_user, make_issues, auth_headers):
+    contractor = make_user("Izvođač")
+    make_issues(contractor, 30)
+    headers = auth_headers(contractor)
+
+    async def compare():
+        try:
+            return await _run_load(client.app, ASYNC_PATH, headers), await _run_load(client.app, SYNC_PATH, headers)
+        finally:
+            # Async engine je vezan za ovaj event loop
+            await get_async_engine().dispose()
+
+    async_result, sync_result = asyncio.run(compare())
+
+    print(
+        f"\n{LOAD_TEST_REQUESTS} zahtjeva, {LOAD_TEST_CONCURRENCY} istovremeno: "
+        f"async {async_result['rps']:.1f} req/s, sync {sync_result['rps']:.1f} req/s"
+    )
+    assert async_result["statuses"] == [200] * LOAD_TEST_REQUESTS
+    assert sync_result["statuses"] == [200] * LOAD_TEST_REQUESTS